@@ -0,0 +1,46 @@
+"""
+Compares serializing reverse geocoding payloads from a list of point tuples
+and from a NumPy array.
+
+Run with::
+
+    python benchmarks/bench_arrays.py
+
+Requires the `numpy` extra.
+"""
+
+import json
+import time
+
+import numpy
+
+from geocodio.arrays import point_strs
+from geocodio.client import json_points
+
+POINTS = 1_000_000
+
+
+def timed(func, *args):
+    started = time.perf_counter()
+    payload = func(*args)
+    return time.perf_counter() - started, payload
+
+
+def main():
+    rng = numpy.random.default_rng(0)
+    points = numpy.column_stack(
+        [rng.uniform(25, 49, POINTS), rng.uniform(-124, -67, POINTS)]
+    ).round(6)
+    tuples = [tuple(point) for point in points.tolist()]
+
+    list_time, list_payload = timed(json_points, tuples)
+    array_time, array_payload = timed(lambda p: json.dumps(point_strs(p)), points)
+    assert list_payload == array_payload
+
+    print("{0:,} points".format(POINTS))
+    print("list of tuples  {0:6.2f}s".format(list_time))
+    print("numpy array     {0:6.2f}s".format(array_time))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+"""
+Compares computing the distances from geocoded results to a set of depots
+with a Python loop over `.coords` and with `geocodio.distance`.
+
+Run with::
+
+    python benchmarks/bench_distance.py
+
+Requires the `numpy` extra.
+"""
+
+import math
+import time
+
+import numpy
+
+from geocodio.data import LocationCollection
+from geocodio.distance import distance_matrix, nearest
+
+RESULTS = 20_000
+DEPOTS = 50
+
+
+def collection(points):
+    return LocationCollection(
+        [
+            {"query": str(i), "response": {"results": [{"location": point}]}}
+            for i, point in enumerate(points)
+        ]
+    )
+
+
+def haversine(origin, destination):
+    lat1, lng1, lat2, lng2 = map(math.radians, origin + destination)
+    a = (
+        math.sin((lat2 - lat1) / 2) ** 2
+        + math.cos(lat1) * math.cos(lat2) * math.sin((lng2 - lng1) / 2) ** 2
+    )
+    return 2 * 6371.0088 * math.asin(math.sqrt(a))
+
+
+def loop(locations, depots):
+    return [[haversine(c, depot) for depot in depots] for c in locations.coords]
+
+
+def timed(func, *args, **kwargs):
+    started = time.perf_counter()
+    result = func(*args, **kwargs)
+    return time.perf_counter() - started, result
+
+
+def main():
+    rng = numpy.random.default_rng(0)
+    points = [
+        {"lat": lat, "lng": lng}
+        for lat, lng in zip(
+            rng.uniform(25, 49, RESULTS).tolist(),
+            rng.uniform(-124, -67, RESULTS).tolist(),
+        )
+    ]
+    locations = collection(points)
+    depots = [
+        tuple(p)
+        for p in numpy.column_stack(
+            [rng.uniform(25, 49, DEPOTS), rng.uniform(-124, -67, DEPOTS)]
+        ).tolist()
+    ]
+
+    loop_time, expected = timed(loop, locations, depots)
+    matrix_time, matrix = timed(distance_matrix, locations, depots)
+    blocked_time, blocked = timed(distance_matrix, locations, depots, block_size=1024)
+    nearest_time, _ = timed(nearest, locations, depots)
+    numpy.testing.assert_allclose(matrix, expected)
+    numpy.testing.assert_allclose(blocked, expected)
+
+    print("{0:,} results x {1} depots".format(RESULTS, DEPOTS))
+    print("python loop       {0:6.3f}s".format(loop_time))
+    print("distance_matrix   {0:6.3f}s".format(matrix_time))
+    print("blocked (1024)    {0:6.3f}s".format(blocked_time))
+    print("nearest (1024)    {0:6.3f}s".format(nearest_time))
+
+
+if __name__ == "__main__":
+    main()
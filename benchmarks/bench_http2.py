@@ -0,0 +1,58 @@
+"""
+Compares concurrent single lookups over HTTP/1.1 and HTTP/2 against local
+fake servers.
+
+Run with::
+
+    python benchmarks/bench_http2.py
+
+Requires the `http2` extra. Both servers add the same delay to each
+request; the HTTP/1.1 client opens a connection per request in flight (up
+to its pool size) while the HTTP/2 client multiplexes them.
+"""
+
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+
+from geocodio.client import GeocodioClient  # noqa: E402
+from tests.h2_server import FakeHttp2Server  # noqa: E402
+from tests.server import FakeGeocodioServer  # noqa: E402
+
+LOOKUPS = 2000
+THREADS = 100
+DELAY = 0.01
+
+
+def run(server_class, http2):
+    addresses = ["{0} Main St".format(i) for i in range(LOOKUPS)]
+    with server_class(delay=DELAY) as server:
+        client = GeocodioClient("key", custom_base_domain=server.url, http2=http2)
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=THREADS) as executor:
+            list(executor.map(client.geocode_address, addresses))
+        elapsed = time.perf_counter() - started
+        client.close()
+        return elapsed, server.connections, server.max_in_flight
+
+
+if __name__ == "__main__":
+    row = "{0:<10}{1:>12}{2:>14}{3:>14}{4:>12}"
+    print(row.format("", "seconds", "lookups/s", "connections", "in flight"))
+    for name, server_class, http2 in (
+        ("HTTP/1.1", FakeGeocodioServer, False),
+        ("HTTP/2", FakeHttp2Server, True),
+    ):
+        elapsed, connections, in_flight = run(server_class, http2)
+        print(
+            row.format(
+                name,
+                "{0:.2f}".format(elapsed),
+                "{0:.0f}".format(LOOKUPS / elapsed),
+                connections,
+                in_flight,
+            )
+        )
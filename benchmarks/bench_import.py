@@ -0,0 +1,48 @@
+"""
+Measures the time to import geocodio and to construct a client.
+
+Run with::
+
+    python benchmarks/bench_import.py
+
+Import time is measured in fresh interpreters so that modules cached by
+earlier runs do not skew the result.
+"""
+
+import statistics
+import subprocess
+import sys
+import timeit
+
+RUNS = 20
+
+IMPORT_CODE = """
+import time
+started = time.perf_counter()
+import geocodio
+print(time.perf_counter() - started)
+"""
+
+
+def import_time():
+    samples = [
+        float(subprocess.check_output([sys.executable, "-c", IMPORT_CODE]))
+        for _ in range(RUNS)
+    ]
+    return statistics.median(samples)
+
+
+def construction_time(number=10000):
+    from geocodio import GeocodioClient
+
+    seconds = timeit.timeit(
+        lambda: GeocodioClient("key", auto_load_api_version=True), number=number
+    )
+    return seconds / number
+
+
+if __name__ == "__main__":
+    print(
+        "import geocodio: {0:.2f} ms (median of {1})".format(import_time() * 1000, RUNS)
+    )
+    print("GeocodioClient(): {0:.2f} us".format(construction_time() * 1e6))
@@ -0,0 +1,125 @@
+"""
+Compares the memory held by a batch collection with and without a
+projection.
+
+Run with::
+
+    python benchmarks/bench_projection.py
+
+Each response in the batch has several results with address components
+and appended fields, as returned for `fields=["cd", "census2020"]`. The
+projection keeps the best match's coordinates, accuracy and `cd` data.
+"""
+
+import gc
+import json
+import tracemalloc
+
+from geocodio.data import LocationCollection
+from geocodio.projection import Projection, project_results
+
+LOOKUPS = 5000
+RESULTS = 3
+
+
+def result(index):
+    return {
+        "address_components": {
+            "number": str(index),
+            "predirectional": "W",
+            "street": "Broad",
+            "suffix": "St",
+            "formatted_street": "W Broad St",
+            "city": "Richmond",
+            "county": "Richmond City",
+            "state": "VA",
+            "zip": "23220",
+            "country": "US",
+        },
+        "formatted_address": "{0} W Broad St, Richmond, VA 23220".format(index),
+        "location": {"lat": 37.554895 + index * 1e-6, "lng": -77.457561},
+        "accuracy": 1,
+        "accuracy_type": "rooftop",
+        "source": "City of Richmond",
+        "fields": {
+            "congressional_districts": [
+                {
+                    "name": "Congressional District 4",
+                    "district_number": 4,
+                    "congress_number": "118th",
+                    "congress_years": "2023-2025",
+                    "proportion": 1,
+                }
+            ],
+            "census": {
+                "2020": {
+                    "census_year": 2020,
+                    "state_fips": "51",
+                    "county_fips": "51760",
+                    "tract_code": "040200",
+                    "block_code": "1014",
+                    "block_group": "1",
+                    "full_fips": "517600402001014",
+                    "place": {"name": "Richmond", "fips": "5167000"},
+                    "metro_micro_statistical_area": {
+                        "name": "Richmond, VA",
+                        "area_code": "40060",
+                        "type": "metropolitan",
+                    },
+                    "source": "US Census Bureau",
+                }
+            },
+        },
+    }
+
+
+def payload():
+    return json.dumps(
+        {
+            "results": [
+                {
+                    "query": "{0} W Broad St, Richmond VA".format(i),
+                    "response": {
+                        "input": {"formatted_address": "{0} W Broad St".format(i)},
+                        "results": [result(i * RESULTS + r) for r in range(RESULTS)],
+                    },
+                }
+                for i in range(LOOKUPS)
+            ]
+        }
+    )
+
+
+def held(body, projection):
+    gc.collect()
+    tracemalloc.start()
+    results = json.loads(body)["results"]
+    if projection is not None:
+        project_results(projection, results)
+    collection = LocationCollection(results)
+    del results
+    gc.collect()
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    assert len(collection) == LOOKUPS
+    return size
+
+
+def main():
+    body = payload()
+    projection = Projection(
+        best_match=True, keys=["location", "accuracy"], fields=["cd"], input=False
+    )
+    full = held(body, None)
+    projected = held(body, projection)
+    print("{0:,} lookups, {1} results each".format(LOOKUPS, RESULTS))
+    print("full responses  {0:8.1f} MB".format(full / 1e6))
+    print(
+        "projected       {0:8.1f} MB  ({1:.0f}x smaller)".format(
+            projected / 1e6, full / projected
+        )
+    )
+
+
+if __name__ == "__main__":
+    main()
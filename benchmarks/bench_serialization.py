@@ -0,0 +1,78 @@
+"""
+Compares the size and speed of binary serialization with JSON for the
+result objects built from the test fixtures.
+
+Run with::
+
+    python benchmarks/bench_serialization.py
+
+The JSON round trip serializes the raw results and rebuilds the collection
+through its constructor, as a cache storing JSON would.
+"""
+
+import json
+import os
+import timeit
+
+from geocodio.data import Location, LocationCollection, LocationCollectionDict
+from geocodio.serialization import dumps, loads
+
+FIXTURES = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), os.pardir, "tests", "response"
+)
+# Each fixture is repeated to approximate a large batch
+REPEAT = 500
+
+
+def fixture(name):
+    with open(os.path.join(FIXTURES, name)) as f:
+        return json.load(f)
+
+
+def cases():
+    single = fixture("single.json")
+    yield "Location", Location(single), single, Location
+
+    results = fixture("batch.json")["results"] * REPEAT
+    results = [
+        {"query": "{0} {1}".format(i, r["query"]), "response": r["response"]}
+        for i, r in enumerate(results)
+    ]
+    yield "LocationCollection", LocationCollection(results), results, LocationCollection
+
+    results = {
+        "{0}-{1}".format(i, k): v
+        for i in range(REPEAT)
+        for k, v in fixture("batch_dict.json")["results"].items()
+    }
+    yield (
+        "LocationCollectionDict",
+        LocationCollectionDict(results),
+        results,
+        LocationCollectionDict,
+    )
+
+
+def bench(number=20):
+    row = "{0:<24}{1:>12}{2:>12}{3:>14}{4:>14}"
+    print(row.format("", "json bytes", "msgpack", "json ms", "msgpack ms"))
+    for name, obj, raw, build in cases():
+        encoded = json.dumps(raw)
+        packed = dumps(obj)
+        json_time = timeit.timeit(
+            lambda: build(json.loads(json.dumps(raw))), number=number
+        )
+        binary_time = timeit.timeit(lambda: loads(dumps(obj)), number=number)
+        print(
+            row.format(
+                name,
+                len(encoded),
+                len(packed),
+                "{0:.3f}".format(json_time / number * 1000),
+                "{0:.3f}".format(binary_time / number * 1000),
+            )
+        )
+
+
+if __name__ == "__main__":
+    bench()
@@ -0,0 +1,65 @@
+"""
+Compares the per request overhead of the client's transports.
+
+Run with::
+
+    python benchmarks/bench_transport.py
+
+`RequestsTransport` and `PoolTransport` make sequential single lookups
+against a local fake server. The in-process transport answers without any
+I/O, so its timing is the client's own overhead per lookup.
+"""
+
+import json
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+
+from geocodio.client import GeocodioClient  # noqa: E402
+from geocodio.transport import (  # noqa: E402
+    PoolTransport,
+    RequestsTransport,
+    Response,
+    Transport,
+)
+from tests.server import FakeGeocodioServer  # noqa: E402
+
+LOOKUPS = 5000
+BODY = json.dumps({"input": {}, "results": []}).encode()
+
+
+class CannedTransport(Transport):
+    def request(self, method, url, params=None, headers=None, data=None, timeout=None):
+        return Response(200, BODY)
+
+
+def run(url, transport):
+    client = GeocodioClient("key", custom_base_domain=url, transport=transport)
+    client.geocode_address("warm up")
+    started = time.perf_counter()
+    for i in range(LOOKUPS):
+        client.geocode_address("{0} Main St".format(i))
+    elapsed = time.perf_counter() - started
+    transport.close()
+    return elapsed
+
+
+def main():
+    with FakeGeocodioServer() as server:
+        timings = [
+            ("requests", run(server.url, RequestsTransport())),
+            ("urllib3 pool", run(server.url, PoolTransport())),
+        ]
+    timings.append(("in-process", run("http://localhost", CannedTransport())))
+    for name, elapsed in timings:
+        print(
+            "{0:<14} {1:6.2f}s  {2:7.1f} us/lookup".format(
+                name, elapsed, elapsed / LOOKUPS * 1e6
+            )
+        )
+
+
+if __name__ == "__main__":
+    main()
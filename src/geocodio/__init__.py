@@ -5,16 +5,32 @@ __email__ = "ben@benlopatin.com"
 __version__ = "2.0.1"
 
 
-from geocodio.client import GeocodioClient  # noqa
-from geocodio.data import Address  # noqa
-from geocodio.data import Location  # noqa
-from geocodio.data import LocationCollection  # noqa
-from geocodio.data import LocationCollectionDict  # noqa
-
-__all__ = [
-    GeocodioClient,
-    Address,
-    Location,
-    LocationCollection,
-    LocationCollectionDict,
-]
+# The public classes are imported on first access so that importing the
+# package does not import requests and its dependencies.
+_exports = {
+    "GeocodioClient": "geocodio.client",
+    "Address": "geocodio.data",
+    "Location": "geocodio.data",
+    "LocationCollection": "geocodio.data",
+    "LocationCollectionDict": "geocodio.data",
+    "AddressView": "geocodio.data",
+    "LocationView": "geocodio.data",
+    "AddressCollection": "geocodio.data",
+    "AddressCollectionDict": "geocodio.data",
+}
+
+__all__ = list(_exports)
+
+
+def __getattr__(name):
+    if name in _exports:
+        import importlib
+
+        value = getattr(importlib.import_module(_exports[name]), name)
+        globals()[name] = value
+        return value
+    raise AttributeError("module {0!r} has no attribute {1!r}".format(__name__, name))
+
+
+def __dir__():
+    return sorted(list(globals()) + __all__)
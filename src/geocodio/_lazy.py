@@ -0,0 +1,26 @@
+"""
+Deferred module imports.
+"""
+
+import importlib
+
+
+class LazyModule(object):
+    """
+    Stand-in for a module which is imported on first attribute access.
+
+    >>> requests = LazyModule("requests")
+    >>> requests.get  # imports requests
+    """
+
+    def __init__(self, name):
+        self._name = name
+        self._module = None
+
+    def _load(self):
+        if self._module is None:
+            self._module = importlib.import_module(self._name)
+        return self._module
+
+    def __getattr__(self, attr):
+        return getattr(self._load(), attr)
@@ -0,0 +1,132 @@
+"""
+Reverse geocoding input from NumPy arrays.
+
+`point_strs` formats an `(N, 2)` array of coordinates, or a pair of
+coordinate arrays, as the "lat,lng" query strings of a batch reverse
+request. The formatting is done by NumPy over whole arrays rather than
+point by point. Coordinates are rounded to six decimal places and always
+written as decimals, so the strings can differ from those `point_str`
+writes for the same points as tuples: `[[1, 2]]` is "1.0,2.0" where
+`point_str((1, 2))` is "1,2", and 40.7127753 is "40.712775". Array and list
+input therefore only share cache entries when their strings match.
+
+This requires the optional `numpy` package::
+
+    pip install pygeocodio[numpy]
+"""
+
+
+def _numpy():
+    try:
+        import numpy
+    except ImportError as e:
+        raise ImportError(
+            "Array input requires numpy: pip install pygeocodio[numpy]"
+        ) from e
+    return numpy
+
+
+def is_points_array(points):
+    """
+    Returns whether `points` is an array of points or a tuple of two
+    coordinate arrays, rather than a list or dict of point tuples or a
+    single point, which may be a tuple of NumPy scalars or a one
+    dimensional array.
+    """
+    if isinstance(points, tuple):
+        return len(points) == 2 and all(_ndim(p) >= 1 for p in points)
+    return _ndim(points) >= 2
+
+
+def _ndim(value):
+    """
+    Returns the number of dimensions of an array-like value, or 0 for any
+    other value.
+    """
+    if not hasattr(value, "__array__"):
+        return 0
+    ndim = getattr(value, "ndim", None)
+    return _numpy().ndim(value) if ndim is None else ndim
+
+
+def coordinates(points, order="lat"):
+    """
+    Returns one dimensional latitude and longitude arrays for an `(N, 2)`
+    array or a tuple of two arrays, with coordinates in `order`.
+    """
+    numpy = _numpy()
+    if isinstance(points, tuple):
+        first, second = (numpy.asarray(a) for a in points)
+        if first.ndim != 1 or first.shape != second.shape:
+            raise ValueError(
+                "Coordinate arrays must be one dimensional and of equal length"
+            )
+    else:
+        points = numpy.asarray(points)
+        if points.ndim != 2 or points.shape[1] != 2:
+            raise ValueError("Points array must have shape (N, 2)")
+        first, second = points[:, 0], points[:, 1]
+    lat, lng = (first, second) if order == "lat" else (second, first)
+    if not (numpy.isfinite(lat).all() and numpy.isfinite(lng).all()):
+        raise ValueError("Points must have finite coordinates")
+    return lat, lng
+
+
+def _format(values, precision):
+    """
+    Returns the columns of ASCII codes for `values` formatted with
+    `precision` decimal places, dropping trailing zeros of the fraction.
+    Characters to be removed are spaces.
+    """
+    numpy = _numpy()
+    unit = 10**precision
+    scaled = numpy.rint(numpy.abs(values) * unit).astype(numpy.int64)
+    whole, fraction = numpy.divmod(scaled, unit)
+    width = len(str(int(whole.max())))
+    space, zero = ord(" "), ord("0")
+
+    columns = numpy.empty((len(values), width + precision + 2), dtype=numpy.uint8)
+    columns[:, 0] = numpy.where((values < 0) & (scaled > 0), ord("-"), space)
+    for column, place in enumerate(range(width - 1, -1, -1), 1):
+        digit = (whole // 10**place) % 10 + zero
+        columns[:, column] = (
+            numpy.where(whole < 10**place, space, digit) if place else digit
+        )
+    columns[:, width + 1] = ord(".")
+    for column, place in enumerate(range(precision - 1, -1, -1), width + 2):
+        digit = (fraction // 10**place) % 10 + zero
+        if column > width + 2:
+            # Blank zeros with only zeros after them, keeping one digit
+            digit = numpy.where(fraction % 10 ** (place + 1) == 0, space, digit)
+        columns[:, column] = digit
+    return columns
+
+
+def point_strs(points, order="lat", precision=6):
+    """
+    Returns a list of "lat,lng" query strings for an array of points, with
+    coordinates rounded to `precision` decimal places (six places is about
+    a tenth of a meter).
+
+    Points are formatted as rows of characters built with array
+    arithmetic, so there is no Python call per point.
+
+    >>> point_strs(numpy.array([[1.5, 2], [40.71277, -74.00597]]))
+    ['1.5,2.0', '40.71277,-74.00597']
+    >>> point_strs((numpy.array([2, 4]), numpy.array([1, 3])), order="lng")
+    ['1.0,2.0', '3.0,4.0']
+    """
+    numpy = _numpy()
+    if precision < 1:
+        raise ValueError("Precision must be at least one decimal place")
+    lat, lng = coordinates(points, order)
+    if not len(lat):
+        return []
+    lat, lng = _format(lat, precision), _format(lng, precision)
+    rows = numpy.empty((len(lat), lat.shape[1] + lng.shape[1] + 2), dtype=numpy.uint8)
+    rows[:, : lat.shape[1]] = lat
+    rows[:, lat.shape[1]] = ord(",")
+    rows[:, lat.shape[1] + 1 : -1] = lng
+    rows[:, -1] = ord("\n")
+    text = rows.tobytes().decode("ascii").replace(" ", "")
+    return text.split("\n")[:-1]
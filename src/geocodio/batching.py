@@ -0,0 +1,243 @@
+"""
+Chunk sizing for batch geocoding and reverse geocoding requests.
+
+Geocodio accepts up to 10,000 queries per batch request. Large batches can be
+split into smaller chunks, either of a fixed size or of a size which adapts to
+the observed latency and response size of previous chunks.
+"""
+
+import collections
+import numbers
+
+MAX_BATCH_SIZE = 10000
+
+
+class FixedBatchSizer(object):
+    """
+    Chunk sizer which always returns the same chunk size.
+    """
+
+    def __init__(self, size):
+        if not 0 < size <= MAX_BATCH_SIZE:
+            raise ValueError(
+                "Chunk size must be between 1 and {0}".format(MAX_BATCH_SIZE)
+            )
+        self.size = size
+        self.min_size = size
+
+    def next_size(self):
+        return self.size
+
+    def record(self, size, latency, nbytes=0, error=False):
+        pass
+
+
+class AdaptiveBatchSizer(object):
+    """
+    Chunk sizer which adjusts the chunk size to hit a target latency per
+    request.
+
+    After each chunk the per-item latency (and optionally the per-item
+    response size) is folded into an exponentially weighted moving average,
+    and the next chunk is sized so that it should take about
+    `target_latency` seconds. Growth is capped at `max_growth` times the
+    previous chunk so that a few fast responses cannot jump straight to the
+    API maximum. Failed chunks halve the chunk size.
+    """
+
+    def __init__(
+        self,
+        target_latency=5.0,
+        initial_size=100,
+        min_size=1,
+        max_size=MAX_BATCH_SIZE,
+        max_bytes=None,
+        smoothing=0.5,
+        max_growth=2.0,
+    ):
+        """
+        Args:
+            target_latency: desired seconds per batch request
+            initial_size: size of the first chunk
+            min_size: smallest chunk size; a failing chunk of this size
+                    is not retried
+            max_size: largest chunk size, at most the API maximum
+            max_bytes: optional cap on the expected response size in bytes
+            smoothing: weight of the most recent observation, 0 < smoothing <= 1
+            max_growth: largest factor by which the chunk size may grow
+                    between two requests
+        """
+        if not 0 < min_size <= max_size <= MAX_BATCH_SIZE:
+            raise ValueError(
+                "Chunk sizes must satisfy 0 < min_size <= max_size <= {0}".format(
+                    MAX_BATCH_SIZE
+                )
+            )
+        if not 0 < smoothing <= 1:
+            raise ValueError("Smoothing must be greater than 0 and at most 1")
+        self.target_latency = target_latency
+        self.min_size = min_size
+        self.max_size = max_size
+        self.max_bytes = max_bytes
+        self.smoothing = smoothing
+        self.max_growth = max_growth
+        self.size = self._clamp(initial_size)
+        self.item_latency = None
+        self.item_bytes = None
+        self.requests = 0
+        self.errors = 0
+
+    def _clamp(self, size):
+        return int(max(self.min_size, min(self.max_size, size)))
+
+    def _smooth(self, previous, value):
+        if previous is None:
+            return value
+        return self.smoothing * value + (1 - self.smoothing) * previous
+
+    @property
+    def error_rate(self):
+        """
+        Returns the fraction of chunk requests which failed.
+        """
+        return self.errors / self.requests if self.requests else 0.0
+
+    def next_size(self):
+        return self.size
+
+    def record(self, size, latency, nbytes=0, error=False):
+        """
+        Records the outcome of a chunk request and updates the chunk size.
+
+        Args:
+            size: number of items in the chunk
+            latency: seconds taken by the request
+            nbytes: size of the response body in bytes
+            error: whether the request failed (timeout or server error)
+        """
+        self.requests += 1
+        if error:
+            self.errors += 1
+            self.size = self._clamp(size // 2)
+            return
+
+        self.item_latency = self._smooth(self.item_latency, latency / size)
+        target = self.target_latency / max(self.item_latency, 1e-6)
+        if self.max_bytes and nbytes:
+            self.item_bytes = self._smooth(self.item_bytes, nbytes / size)
+            target = min(target, self.max_bytes / self.item_bytes)
+        self.size = self._clamp(min(target, size * self.max_growth))
+
+
+def get_sizer(chunk_size):
+    """
+    Returns a chunk sizer for the `chunk_size` argument of the batch methods.
+
+    `chunk_size` may be None, for no chunking, a positive integer, the
+    string "adaptive", or an object implementing `next_size` and `record`
+    (e.g. a configured `AdaptiveBatchSizer`). Raises `ValueError` for
+    anything else.
+    """
+    if chunk_size is None:
+        return None
+    if isinstance(chunk_size, str):
+        if chunk_size == "adaptive":
+            return AdaptiveBatchSizer()
+    elif isinstance(chunk_size, numbers.Integral):
+        if not isinstance(chunk_size, bool):
+            return FixedBatchSizer(int(chunk_size))
+    elif hasattr(chunk_size, "next_size") and hasattr(chunk_size, "record"):
+        return chunk_size
+    raise ValueError(
+        'Chunk size must be None, a positive integer, "adaptive" or a chunk '
+        "sizer, not {0!r}".format(chunk_size)
+    )
+
+
+class ChunkQueue(object):
+    """
+    The chunks of a batch still to be sent, and the results of those
+    completed. Each chunk is cut from the input when it is taken, at the
+    sizer's next size, and failed chunks queued for retry are taken first.
+    """
+
+    def __init__(self, data, sizer):
+        """
+        Args:
+            data: the batch's list, or dict, of queries
+            sizer: the chunk sizer
+        """
+        self.keyed = isinstance(data, dict)
+        self.items = list(data.items()) if self.keyed else list(data)
+        self.sizer = sizer
+        self.offset = 0
+        self.retries = collections.deque()
+        # Times each chunk was rate limited, by input position
+        self.rate_limited = {}
+        # Completed chunks' raw results by input position
+        self.results = {}
+
+    def __bool__(self):
+        return self.offset < len(self.items) or bool(self.retries)
+
+    def pop(self):
+        """
+        Returns the next chunk's input position and list of items.
+        """
+        if self.retries:
+            return self.retries.popleft()
+        start = self.offset
+        chunk = self.items[start : start + self.sizer.next_size()]
+        self.offset += len(chunk)
+        return start, chunk
+
+    def payload(self, chunk):
+        """
+        Returns a chunk's items as the list or dict to send.
+        """
+        return dict(chunk) if self.keyed else chunk
+
+    def retry(self, start, chunk):
+        """
+        Queues a failed chunk to be sent again, split at the sizer's next
+        size.
+        """
+        size = self.sizer.next_size()
+        self.retries.extendleft(
+            reversed(
+                [(start + i, chunk[i : i + size]) for i in range(0, len(chunk), size)]
+            )
+        )
+
+    def requeue(self, start, chunk):
+        """
+        Queues a rate limited chunk to be sent again whole, next.
+        """
+        self.rate_limited[start] = self.rate_limited.get(start, 0) + 1
+        self.retries.appendleft((start, chunk))
+
+    def partial(self):
+        """
+        Returns the completed chunks' results as a dict keyed by input
+        position, or by key for keyed input.
+        """
+        partial = {}
+        for start, results in self.results.items():
+            if self.keyed:
+                partial.update(results)
+            else:
+                partial.update(enumerate(results, start))
+        return partial
+
+    def combined(self):
+        """
+        Returns the completed chunks' results combined, in input order, as
+        a list or dict.
+        """
+        combined = {} if self.keyed else []
+        for start in sorted(self.results):
+            if self.keyed:
+                combined.update(self.results[start])
+            else:
+                combined.extend(self.results[start])
+        return combined
@@ -0,0 +1,161 @@
+"""
+Circuit breaking for API requests.
+"""
+
+import collections
+import threading
+import time
+
+from geocodio import exceptions
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitBreaker(object):
+    """
+    Stops requests being sent while the API is failing.
+
+    The breaker opens after `failure_threshold` consecutive failures, or
+    once the failure rate over the last `window` requests reaches
+    `failure_rate`. Failures are server errors (HTTP 5xx) and timeouts.
+    While open, requests fail fast with `GeocodioCircuitOpenError`. After
+    `reset_timeout` seconds up to `half_open_requests` trial requests are
+    let through; if they all succeed the breaker closes again, and if any
+    fails it opens for another `reset_timeout`.
+
+    The breaker is thread safe and can be shared by several clients.
+    """
+
+    def __init__(
+        self,
+        failure_threshold=5,
+        failure_rate=0.5,
+        window=20,
+        min_requests=10,
+        reset_timeout=30.0,
+        half_open_requests=1,
+        history_size=100,
+    ):
+        """
+        Args:
+            failure_threshold: consecutive failures which open the breaker
+            failure_rate: failure rate over the window which opens the
+                    breaker, once at least `min_requests` are recorded
+            window: number of recent request outcomes considered
+            min_requests: outcomes required before the failure rate applies
+            reset_timeout: seconds the breaker stays open before trial
+                    requests are allowed
+            half_open_requests: number of trial requests which must
+                    succeed to close the breaker
+            history_size: number of state changes kept in `history`
+        """
+        self.failure_threshold = failure_threshold
+        self.failure_rate = failure_rate
+        self.min_requests = min_requests
+        self.reset_timeout = reset_timeout
+        self.half_open_requests = half_open_requests
+        self.history = collections.deque(maxlen=history_size)
+
+        self.state = CLOSED
+        self.successes = 0
+        self.failures = 0
+        self.rejected = 0
+        self._outcomes = collections.deque(maxlen=window)
+        self._consecutive_failures = 0
+        self._opened_at = None
+        self._trials = 0
+        self._trial_successes = 0
+        self._lock = threading.Lock()
+
+    def _transition(self, state):
+        self.history.append((time.time(), self.state, state))
+        self.state = state
+        if state == OPEN:
+            self._opened_at = time.monotonic()
+        elif state == HALF_OPEN:
+            self._trials = 0
+            self._trial_successes = 0
+        elif state == CLOSED:
+            self._outcomes.clear()
+            self._consecutive_failures = 0
+
+    def allow(self):
+        """
+        Raises `GeocodioCircuitOpenError` unless a request may be sent now.
+        """
+        with self._lock:
+            if self.state == OPEN:
+                remaining = self._opened_at + self.reset_timeout - time.monotonic()
+                if remaining > 0:
+                    self.rejected += 1
+                    raise exceptions.GeocodioCircuitOpenError(
+                        "Circuit open, retry in {0:.1f}s".format(remaining)
+                    )
+                self._transition(HALF_OPEN)
+            if self.state == HALF_OPEN:
+                if self._trials >= self.half_open_requests:
+                    self.rejected += 1
+                    raise exceptions.GeocodioCircuitOpenError(
+                        "Circuit half open, trial requests in flight"
+                    )
+                self._trials += 1
+
+    def record(self, failure=False, neutral=False):
+        """
+        Records the outcome of a request allowed by `allow`.
+
+        Args:
+            failure: whether the request failed with a server error or
+                    timeout
+            neutral: whether the outcome says nothing about the API's
+                    health, e.g. a connection error raised by the client
+        """
+        with self._lock:
+            if self.state == HALF_OPEN:
+                if neutral:
+                    self._trials -= 1
+                elif failure:
+                    self.failures += 1
+                    self._transition(OPEN)
+                else:
+                    self.successes += 1
+                    self._trial_successes += 1
+                    if self._trial_successes >= self.half_open_requests:
+                        self._transition(CLOSED)
+                return
+
+            if neutral:
+                return
+            self._outcomes.append(failure)
+            if not failure:
+                self.successes += 1
+                self._consecutive_failures = 0
+                return
+
+            self.failures += 1
+            self._consecutive_failures += 1
+            if self.state == CLOSED and (
+                self._consecutive_failures >= self.failure_threshold
+                or (
+                    len(self._outcomes) >= self.min_requests
+                    and sum(self._outcomes) / len(self._outcomes) >= self.failure_rate
+                )
+            ):
+                self._transition(OPEN)
+
+    def metrics(self):
+        """
+        Returns a dictionary snapshot of the breaker's state and counters.
+        """
+        with self._lock:
+            outcomes = len(self._outcomes)
+            return {
+                "state": self.state,
+                "successes": self.successes,
+                "failures": self.failures,
+                "rejected": self.rejected,
+                "consecutive_failures": self._consecutive_failures,
+                "failure_rate": sum(self._outcomes) / outcomes if outcomes else 0.0,
+            }
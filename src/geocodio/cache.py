@@ -0,0 +1,357 @@
+"""
+Result caching for geocoding and reverse geocoding lookups.
+
+Responses are cached per query, with the appended `fields` data split out
+and cached per requested field. A request for `cd` can therefore be
+answered from a response cached for `cd,timezone`, and a request for
+`cd,census2020` after that only needs to fetch `census2020`.
+"""
+
+import collections
+import json
+import re
+import threading
+import time
+
+# Maps requested field names to the key path of their data in a result's
+# `fields` dictionary. Names not listed here are resolved by `field_path`.
+FIELD_PATHS = {
+    "cd": ("congressional_districts",),
+    "stateleg": ("state_legislative_districts",),
+    "school": ("school_districts",),
+    "timezone": ("timezone",),
+    "zip4": ("zip4",),
+}
+
+
+def field_path(field):
+    """
+    Returns the key path of a requested field within a result's `fields`
+    dictionary, or None if it is not known.
+
+    >>> field_path("cd118")
+    ('congressional_districts',)
+    >>> field_path("census2020")
+    ('census', '2020')
+    >>> field_path("acs-economics")
+    ('acs', 'economics')
+    """
+    if field in FIELD_PATHS:
+        return FIELD_PATHS[field]
+    if re.match(r"cd\d+$", field):
+        return FIELD_PATHS["cd"]
+    match = re.match(r"census(\d{4})$", field)
+    if match:
+        return ("census", match.group(1))
+    if field.startswith("acs-"):
+        return ("acs", field[4:])
+    return None
+
+
+def merge_fields(target, source):
+    """
+    Recursively merges the `source` fields dictionary into `target`.
+    """
+    for key, value in source.items():
+        if isinstance(value, dict) and isinstance(target.get(key), dict):
+            merge_fields(target[key], value)
+        else:
+            target[key] = value
+    return target
+
+
+def merge_responses(target, source):
+    """
+    Merges the `fields` of each result in `source` into the result at the
+    same position in `target`.
+    """
+    for result, other in zip(target.get("results", []), source.get("results", [])):
+        if other.get("fields"):
+            merge_fields(result.setdefault("fields", {}), other["fields"])
+    return target
+
+
+def query_key(query):
+    """
+    Returns a string key for an address, components dictionary or point
+    string.
+    """
+    if isinstance(query, dict):
+        return json.dumps(query, sort_keys=True)
+    return str(query)
+
+
+def is_negative(response):
+    """
+    Returns whether a response is an error or has no results.
+    """
+    return "error" in response or not response.get("results")
+
+
+class MemoryCache(object):
+    """
+    Thread safe in-process cache backend with optional size bound (least
+    recently used entries are evicted first) and expiry.
+
+    Cache backends store string values and implement `get_many` and
+    `set_many`.
+    """
+
+    def __init__(self, maxsize=None, ttl=None):
+        """
+        Args:
+            maxsize: the maximum number of entries, unbounded if None
+            ttl: default seconds until entries expire, never if None
+        """
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data = collections.OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._data)
+
+    def get_many(self, keys):
+        """
+        Returns a dictionary of the cached values found for `keys`.
+        """
+        now = time.monotonic()
+        found = {}
+        with self._lock:
+            for key in keys:
+                entry = self._data.get(key)
+                if entry is None:
+                    continue
+                value, expires = entry
+                if expires is not None and expires <= now:
+                    del self._data[key]
+                    continue
+                self._data.move_to_end(key)
+                found[key] = value
+        return found
+
+    def set_many(self, mapping, ttl=None):
+        """
+        Stores every key and value in `mapping`.
+        """
+        ttl = self.ttl if ttl is None else ttl
+        expires = None if ttl is None else time.monotonic() + ttl
+        with self._lock:
+            for key, value in mapping.items():
+                self._data[key] = (value, expires)
+                self._data.move_to_end(key)
+            if self.maxsize is not None:
+                while len(self._data) > self.maxsize:
+                    self._data.popitem(last=False)
+
+    def scan(self, batch_size=1000):
+        """
+        Yields lists of up to `batch_size` `(key, value)` pairs for the
+        entries which have not expired.
+
+        Entries set or evicted during the scan may or may not be included.
+        """
+        with self._lock:
+            keys = list(self._data)
+        for start in range(0, len(keys), batch_size):
+            found = self.get_many(keys[start : start + batch_size])
+            if found:
+                yield list(found.items())
+
+    def get(self, key, default=None):
+        return self.get_many([key]).get(key, default)
+
+    def set(self, key, value, ttl=None):
+        self.set_many({key: value}, ttl=ttl)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+
+class LocationCache(object):
+    """
+    Fields aware cache of geocoding and reverse geocoding responses.
+
+    Each response is stored as a base entry, the response with the `fields`
+    of its results removed, and one entry per requested field holding that
+    field's data for each result. Field data is matched to results by
+    position.
+
+    Field data is attributed to requested field names using `field_path`.
+    When a request includes exactly one field with an unknown path, the
+    remaining data is attributed to it; otherwise unknown fields are not
+    cached and are fetched again on each request.
+
+    With a `negative_ttl`, lookups which fail (a 422 error, or an error in
+    a batch) or find no results are cached too, for that many seconds, so
+    unresolvable inputs are not looked up again each time they are seen.
+    A cached failure is returned as a response with its `error` message.
+    """
+
+    def __init__(self, backend=None, ttl=None, prefix="geocodio", negative_ttl=None):
+        """
+        Args:
+            backend: a cache backend, by default an unbounded `MemoryCache`
+            ttl: seconds until cached responses expire, the backend's
+                    default if None
+            prefix: prefix for every cache key
+            negative_ttl: seconds until cached failures and empty results
+                    expire. If None failures are not cached and empty
+                    results expire like other responses.
+        """
+        self.backend = MemoryCache() if backend is None else backend
+        self.ttl = ttl
+        self.prefix = prefix
+        self.negative_ttl = negative_ttl
+
+    def load(self, records, batch_size=1000):
+        """
+        Stores responses from an iterable of records, each a dictionary with
+        the `verb`, `query`, `fields`, `limit` and `response` of a lookup,
+        in batches of `batch_size`.
+
+        :return: the number of records read.
+        """
+        count = 0
+        groups = collections.defaultdict(list)
+        for record in records:
+            group = (record["verb"], tuple(record["fields"]), record["limit"])
+            groups[group].append(record)
+            count += 1
+            if len(groups[group]) >= batch_size:
+                self._load_group(group, groups.pop(group))
+        for group, batch in groups.items():
+            self._load_group(group, batch)
+        return count
+
+    def _load_group(self, group, records):
+        verb, fields, limit = group
+        self.store_many(
+            verb,
+            [record["query"] for record in records],
+            fields,
+            [record["response"] for record in records],
+            limit,
+        )
+
+    def entry_ttl(self, value):
+        """
+        Returns the TTL for a stored entry's value: the `negative_ttl` for
+        a cached failure or empty response, otherwise the `ttl`.
+        """
+        if self.negative_ttl is not None and value.startswith("{"):
+            if value.startswith('{"error"') or '"results": []' in value:
+                if is_negative(json.loads(value)):
+                    return self.negative_ttl
+        return self.ttl
+
+    def base_key(self, verb, query, limit=0):
+        return "{0}:{1}:{2}:{3}".format(self.prefix, verb, limit, query_key(query))
+
+    def field_key(self, verb, query, field, limit=0):
+        return "{0}:field:{1}".format(self.base_key(verb, query, limit), field)
+
+    def lookup_many(self, verb, queries, fields, limit=0):
+        """
+        Returns a list with a `(response, missing_fields)` tuple for each
+        query. `response` is the cached response with the cached requested
+        fields merged in, or None if the query is not cached.
+        """
+        keys = []
+        for query in queries:
+            keys.append(self.base_key(verb, query, limit))
+            keys.extend(self.field_key(verb, query, f, limit) for f in fields)
+        found = self.backend.get_many(keys)
+
+        entries = []
+        for query in queries:
+            base = found.get(self.base_key(verb, query, limit))
+            if base is None:
+                entries.append((None, list(fields)))
+                continue
+            response = json.loads(base)
+            if is_negative(response):
+                entries.append((response, []))
+                continue
+            missing = []
+            for field in fields:
+                cached = found.get(self.field_key(verb, query, field, limit))
+                if cached is None:
+                    missing.append(field)
+                    continue
+                merge_responses(
+                    response,
+                    {"results": [{"fields": f} for f in json.loads(cached)]},
+                )
+            entries.append((response, missing))
+        return entries
+
+    def lookup(self, verb, query, fields, limit=0):
+        return self.lookup_many(verb, [query], fields, limit)[0]
+
+    def _split_fields(self, fields, results):
+        paths = {f: field_path(f) for f in fields}
+        unknown = [f for f, path in paths.items() if path is None]
+        known_keys = {path[0] for path in paths.values() if path is not None}
+
+        split = {f: [] for f, path in paths.items() if path is not None}
+        if len(unknown) == 1:
+            split[unknown[0]] = []
+        for result in results:
+            result_fields = result.get("fields", {})
+            for field, values in split.items():
+                path = paths[field]
+                if path is None:
+                    values.append(
+                        {k: v for k, v in result_fields.items() if k not in known_keys}
+                    )
+                    continue
+                value = result_fields
+                for key in path:
+                    value = value.get(key) if isinstance(value, dict) else None
+                partial = {}
+                if value is not None:
+                    nested = partial
+                    for key in path[:-1]:
+                        nested = nested.setdefault(key, {})
+                    nested[path[-1]] = value
+                values.append(partial)
+        return split
+
+    def store_many(self, verb, queries, fields, responses, limit=0):
+        """
+        Caches each response, fetched with the given `fields`, for its
+        query. Error responses are only cached with a `negative_ttl`.
+        """
+        entries = {}
+        negative = {}
+        for query, response in zip(queries, responses):
+            if self.negative_ttl is not None and is_negative(response):
+                if "error" in response:
+                    response = {"error": response["error"]}
+                negative[self.base_key(verb, query, limit)] = json.dumps(response)
+                continue
+            if "error" in response or "results" not in response:
+                continue
+            results = response["results"]
+            base = dict(response)
+            base["results"] = [
+                {k: v for k, v in result.items() if k != "fields"} for result in results
+            ]
+            entries[self.base_key(verb, query, limit)] = json.dumps(base)
+            for field, values in self._split_fields(fields, results).items():
+                entries[self.field_key(verb, query, field, limit)] = json.dumps(values)
+        if entries:
+            self.backend.set_many(entries, ttl=self.ttl)
+        if negative:
+            self.backend.set_many(negative, ttl=self.negative_ttl)
+
+    def store(self, verb, query, fields, response, limit=0):
+        self.store_many(verb, [query], fields, [response], limit)
+
+    def store_error(self, verb, query, message, limit=0):
+        """
+        Caches a failed lookup's error message, with a `negative_ttl`.
+        """
+        self.store_many(verb, [query], [], [{"error": message}], limit)
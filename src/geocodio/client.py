@@ -1,16 +1,54 @@
+import collections
+import contextlib
+import copy
+import functools
+import itertools
 import json
 import logging
 import re
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
 
-import requests
-
-from geocodio.data import Address, Location, LocationCollection, LocationCollectionDict
+from geocodio._lazy import LazyModule
+from geocodio.arrays import is_points_array, point_strs
+from geocodio.batching import ChunkQueue, get_sizer
+from geocodio.cache import merge_fields, merge_responses, query_key
+from geocodio.deadline import Deadline
+from geocodio.data import (
+    Address,
+    AddressCollection,
+    AddressCollectionDict,
+    Location,
+    LocationCollection,
+    LocationCollectionDict,
+    LocationView,
+)
+from geocodio.normalize import normalize_query
+from geocodio.parser import DEFAULT_MIN_CONFIDENCE, parse_address
+from geocodio.projection import project_results
+from geocodio.transport import DEFAULT_POOL_SIZE, RequestsTransport
 from geocodio import exceptions
 
 logger = logging.getLogger(__name__)
 
+# Imported on first request to keep `import geocodio` fast
+requests = LazyModule("requests")
+
 DEFAULT_API_VERSION = "1.9"
 
+# Seconds to wait for the API description when auto loading the API version
+API_VERSION_TIMEOUT = 2.0
+
+# API versions discovered per base domain, shared by all clients
+_api_versions = {}
+_api_versions_lock = threading.Lock()
+
+# Times a chunk is sent again after being rate limited, and seconds to wait
+# before the first of them, doubled before each after
+RATE_LIMIT_RETRIES = 5
+RATE_LIMIT_BACKOFF = 0.1
+
 
 def error_response(response):
     """
@@ -25,12 +63,53 @@ def error_response(response):
     elif response.status_code == 422:
         raise exceptions.GeocodioDataError(response.json()["error"])
 
+    elif response.status_code == 429:
+        raise exceptions.GeocodioRateLimitError
+
     else:
         raise exceptions.GeocodioError(
             "Unknown service error (HTTP {0})".format(response.status_code)
         )
 
 
+def _expired(chunks, cause=None):
+    """
+    Returns a `GeocodioTimeoutError` with the results of a batch's completed
+    chunks as its `partial`.
+    """
+    error = exceptions.GeocodioTimeoutError(partial=chunks.partial())
+    error.__cause__ = cause
+    return error
+
+
+def _enrich_targets(locations, all_results=False):
+    """
+    Returns an ordered dictionary mapping the point string of each distinct
+    result location to the results at it, for the best match of each
+    location or for every result with `all_results`.
+    """
+    targets = collections.OrderedDict()
+    for location in locations:
+        results = location.get("results") or []
+        for result in results if all_results else results[:1]:
+            point = result.get("location") or {}
+            if "lat" in point and "lng" in point:
+                key = point_str((point["lat"], point["lng"]))
+                targets.setdefault(key, []).append(result)
+    return targets
+
+
+def point_str(point):
+    """
+    Returns a (lat, lng) point as the string used in reverse geocoding
+    queries.
+
+    >>> point_str((1, 2))
+    '1,2'
+    """
+    return "{0},{1}".format(point[0], point[1])
+
+
 def json_points(points):
     """
     Returns a list of points [(lat, lng)...] / dict of points {key: (lat, lng), ...} as a JSON formatted list/dict of
@@ -41,14 +120,10 @@ def json_points(points):
     >>> json_points({"a": (1, 2), "b": (3, 4)})
     '{"a": "1,2", "b": "3,4"}'
     """
-
-    def to_point_str(point):
-        return "{0},{1}".format(point[0], point[1])
-
     if isinstance(points, list):
-        point_strs = [to_point_str(point) for point in points]
+        point_strs = [point_str(point) for point in points]
     elif isinstance(points, dict):
-        point_strs = {k: to_point_str(point) for k, point in points.items()}
+        point_strs = {k: point_str(point) for k, point in points.items()}
     else:
         return None
     return json.dumps(point_strs)
@@ -68,6 +143,19 @@ class GeocodioClient(object):
         auto_load_api_version=False,
         timeout=None,
         custom_base_domain=None,
+        concurrency=None,
+        hedging=None,
+        cache=None,
+        normalize=False,
+        breaker=None,
+        usage=None,
+        views=False,
+        http2=False,
+        transport=None,
+        connect_timeout=None,
+        read_timeout=None,
+        deadline=None,
+        tracer=None,
     ):
         """Initialize and configure the client.
 
@@ -83,9 +171,48 @@ class GeocodioClient(object):
             auto_load_api_version: whether to automatically select the
                     latest API version from the Geocodio API. This *may*
                     result in errors, i.e. during a new API version
-                    rollout.
-            timeout: request timeout
+                    rollout. The version is loaded on the first request, not
+                    when the client is created, and is remembered for
+                    every client using the same API domain.
+            timeout: request timeout in seconds
             custom_base_domain: custom API domain
+            concurrency: an optional `AIMDLimiter` bounding the number of
+                    requests in flight, shared by every thread using the
+                    client. Chunked batches are sent in parallel up to its
+                    current limit.
+            hedging: an optional `Hedger` used to send a duplicate
+                    request when a single lookup (`geocode_address`,
+                    `reverse_point`, `parse`) is slow to answer
+            cache: an optional `LocationCache` used to answer geocoding
+                    and reverse geocoding lookups, including the appended
+                    `fields`, without a request where possible
+            normalize: whether to normalize addresses (case, whitespace,
+                    punctuation and USPS abbreviations) before geocoding
+                    them, so that variants of the same address share
+                    cache entries and batch lookups
+            breaker: an optional `CircuitBreaker`; while it is open
+                    requests fail fast with `GeocodioCircuitOpenError`
+            usage: an optional `UsageMeter` counting the billed lookups
+                    of the requests sent, and enforcing its budget
+            views: whether to return results as read only `LocationView`
+                    objects wrapping the decoded responses, rather than
+                    copying them into `Location` dictionaries
+            http2: whether to send requests over HTTP/2, multiplexing
+                    concurrent requests over shared connections. Requires
+                    the `http2` extra. Plain `http://` domains are sent
+                    HTTP/2 without negotiation
+            transport: an optional `Transport` used to send requests,
+                    by default a `RequestsTransport`
+            connect_timeout: seconds to wait to connect, overriding
+                    `timeout` for connecting
+            read_timeout: seconds to wait for the server to send data,
+                    overriding `timeout` for reading
+            deadline: default seconds allowed for each call, including
+                    every chunk, retry and version lookup it makes. Calls
+                    which run out of time raise `GeocodioTimeoutError`.
+                    Unbounded if None
+            tracer: an optional `Tracer` recording a timed span for each
+                    phase of every request and batch chunk
 
         """
         if custom_base_domain is None:
@@ -96,24 +223,84 @@ class GeocodioClient(object):
         else:
             self.BASE_DOMAIN = custom_base_domain
 
-        if version is None and auto_load_api_version:
-            version = self._parse_curr_api_version(self.BASE_DOMAIN)
-        # Fall back to manual default API version if couldn't be found or isn't overridden
-        self.version = version or DEFAULT_API_VERSION
-
-        self.BASE_URL = "{domain}/v{version}/{{verb}}".format(
-            domain=self.BASE_DOMAIN, version=self.version
-        )
+        self._version = version
+        self.auto_load_api_version = auto_load_api_version
         self.API_KEY = key
         if order not in ("lat", "lng"):
             raise ValueError("Order but be either `lat` or `lng`")
         self.order = order
+        if connect_timeout is not None or read_timeout is not None:
+            timeout = (
+                timeout if connect_timeout is None else connect_timeout,
+                timeout if read_timeout is None else read_timeout,
+            )
         self.timeout = timeout
+        self.deadline = deadline
+        self.concurrency = concurrency
+        self.hedging = hedging
+        self.cache = cache
+        self.normalize = normalize
+        self.breaker = breaker
+        self.usage = usage
+        self.views = views
+        self.http2 = http2
+        self.tracer = tracer
+        self._transport = transport
+        self._owns_transport = transport is None
+        self._transport_lock = threading.Lock()
+
+    @property
+    def version(self):
+        """
+        Returns the API version, loading the latest version from the API on
+        first access if the client auto loads the API version.
+        """
+        return self._resolve_version()
+
+    @version.setter
+    def version(self, value):
+        self._version = value
+
+    def _resolve_version(self, deadline=None):
+        if self._version is None:
+            version = None
+            if self.auto_load_api_version:
+                timeout = API_VERSION_TIMEOUT
+                if deadline is not None:
+                    timeout = deadline.timeout(timeout)
+                version = self._load_api_version(self.BASE_DOMAIN, timeout)
+            # Fall back to manual default API version if couldn't be found or isn't overridden
+            self._version = version or DEFAULT_API_VERSION
+        return self._version
+
+    @property
+    def BASE_URL(self):
+        return self._base_url()
+
+    def _base_url(self, deadline=None):
+        return "{domain}/v{version}/{{verb}}".format(
+            domain=self.BASE_DOMAIN, version=self._resolve_version(deadline)
+        )
+
+    @classmethod
+    def _load_api_version(cls, api_url, timeout=API_VERSION_TIMEOUT):
+        """
+        Returns the current API version for the domain, querying the API
+        only if no other client has already loaded it.
+        """
+        with _api_versions_lock:
+            if api_url in _api_versions:
+                return _api_versions[api_url]
+        version = cls._parse_curr_api_version(api_url, timeout=timeout)
+        if version is not None:
+            with _api_versions_lock:
+                _api_versions[api_url] = version
+        return version
 
     @staticmethod
-    def _parse_curr_api_version(api_url):
+    def _parse_curr_api_version(api_url, timeout=API_VERSION_TIMEOUT):
         try:
-            resp = requests.get(api_url)
+            resp = requests.get(api_url, timeout=timeout)
             result = resp.json()
             # Parses version from string: "... vX.Y.Z" -> "X.Y"
             match = re.search(r"(v\d+.\d+)", result["description"])
@@ -121,30 +308,242 @@ class GeocodioClient(object):
         except Exception:
             return None
 
-    def _req(self, method="get", verb=None, headers={}, params={}, data={}):
+    def _span(self, name, **args):
+        """
+        Returns a context manager recording a span with the client's tracer,
+        if it has one. Either way it gives the block the span's `args`.
+        """
+        if self.tracer is None:
+            return contextlib.nullcontext(args)
+        return self.tracer.span(name, **args)
+
+    def _deadline(self, seconds=None):
+        """
+        Returns a `Deadline` for a call, by default the client's.
+        """
+        return Deadline(self.deadline if seconds is None else seconds)
+
+    def _req(
+        self,
+        method="get",
+        verb=None,
+        headers={},
+        params={},
+        data={},
+        deadline=None,
+        lookups=1,
+        stream=False,
+    ):
         """
         Method to wrap all request building
 
+        No request is started once the `deadline` has expired, and the
+        request's timeouts are capped at the time remaining. `lookups` is
+        the number of queries sent, counted by the client's usage meter;
+        requests with no lookups, e.g. for lists, are not counted. With
+        `stream` the response body is left to be read with `iter_content`.
+
         :return: a Response object based on the specified method and request values.
         """
-        url = self.BASE_URL.format(verb=verb)
+        deadline = deadline or Deadline()
+        deadline.check()
+        if self.breaker is not None:
+            self.breaker.allow()
+        try:
+            with self._span("queue", verb=verb):
+                billed, token = self._reserve(verb, params, lookups, deadline)
+        except (exceptions.GeocodioBudgetError, exceptions.GeocodioTimeoutError):
+            self._release_trial()
+            raise
+        try:
+            with self._span("http", verb=verb, method=method, lookups=lookups) as span:
+                response = self._send(
+                    method, verb, headers, params, data, deadline, stream
+                )
+                span["status"] = response.status_code
+                if not stream:
+                    span["bytes"] = len(response.content)
+        except requests.exceptions.Timeout as e:
+            self._after_request(token, success=False, failed=True)
+            if deadline.expired:
+                raise exceptions.GeocodioTimeoutError() from e
+            raise
+        except Exception:
+            self._after_request(token, success=False, responded=False)
+            self._refund(billed)
+            raise
+        self._after_request(
+            token,
+            success=response.status_code == 200,
+            failed=response.status_code >= 500,
+            overloaded=response.status_code == 429,
+        )
+        if response.status_code != 200:
+            self._refund(billed)
+        return response
+
+    def _reserve(self, verb, params, lookups, deadline):
+        """
+        Counts a request's lookups with the usage meter and waits for a slot
+        from the concurrency limiter. Returns the billed lookups, to refund
+        if the request is not billed, and the limiter's token.
+        """
+        billed = None
+        if self.usage is not None and lookups:
+            fields = [f for f in params.get("fields", "").split(",") if f]
+            billed = (verb, lookups, fields)
+            self.usage.reserve(*billed)
+        if self.concurrency is None:
+            return billed, None
+        try:
+            return billed, self.concurrency.acquire(timeout=deadline.remaining())
+        except TimeoutError as e:
+            self._refund(billed)
+            raise exceptions.GeocodioTimeoutError() from e
+
+    def _release_trial(self):
+        """
+        Gives back a request allowed by the circuit breaker but never sent,
+        so a half open breaker's trial is not held forever.
+        """
+        if self.breaker is not None:
+            self.breaker.record(neutral=True)
+
+    def _refund(self, billed):
+        if billed is not None:
+            self.usage.refund(*billed)
+
+    def _after_request(
+        self, token, success=True, failed=False, overloaded=False, responded=True
+    ):
+        """
+        Reports the outcome of a request to the concurrency limiter and
+        circuit breaker. `failed` is a server error or timeout, and
+        `responded` is false if the request raised any other exception.
+        """
+        if self.concurrency is not None:
+            self.concurrency.release(
+                token, overloaded=failed or overloaded, success=success
+            )
+        if self.breaker is not None:
+            self.breaker.record(failure=failed, neutral=not responded)
+
+    @property
+    def transport(self):
+        """
+        Returns the client's `Transport`, created on first use: an
+        `Http2Transport` if the client uses HTTP/2 and otherwise a
+        `RequestsTransport`, which keeps a pool of connections open for
+        reuse across requests and threads.
+        """
+        if self._transport is None:
+            with self._transport_lock:
+                if self._transport is None and self.http2:
+                    from geocodio.http2 import Http2Transport
+
+                    self._transport = Http2Transport(
+                        cleartext=self.BASE_DOMAIN.startswith("http://")
+                    )
+                elif self._transport is None:
+                    self._transport = RequestsTransport()
+        return self._transport
+
+    @property
+    def lists(self):
+        """
+        Returns the client's interface to the list (spreadsheet) API, for
+        geocoding large files in the background.
+        """
+        from geocodio.lists import Lists
+
+        return Lists(self)
+
+    def close(self):
+        """
+        Closes the client's pooled connections. A transport created by the
+        client is replaced on the next request.
+        """
+        if self._transport is not None:
+            self._transport.close()
+            if self._owns_transport:
+                self._transport = None
+
+    def _send(self, method, verb, headers, params, data, deadline, stream=False):
+        url = self._base_url(deadline).format(verb=verb)
         request_headers = {"content-type": "application/json"}
         request_params = {"api_key": self.API_KEY}
         request_headers.update(headers)
         request_params.update(params)
-        return getattr(requests, method)(
+        # Only transports used for lists need to support streaming
+        options = {"stream": True} if stream else {}
+        return self.transport.request(
+            method.upper(),
             url,
             params=request_params,
             headers=request_headers,
             data=data,
-            timeout=self.timeout,
+            timeout=deadline.timeout(self.timeout),
+            **options,
         )
 
-    def parse(self, address):
+    def _lookup(self, verb, params, deadline=None):
+        """
+        Sends a single lookup GET request, hedged if the client is
+        configured to hedge requests.
+        """
+        if self.hedging is None:
+            return self._req(verb=verb, params=params, deadline=deadline)
+        return self.hedging.call(self._req, verb=verb, params=params, deadline=deadline)
+
+    def _single(
+        self, verb, query, params, fields, limit=0, deadline=None, projection=None
+    ):
+        """
+        Returns the raw response for a single geocoding or reverse geocoding
+        lookup, from the cache where possible. Only the fields missing from
+        the cache are requested, and a cached failure raises the same
+        `GeocodioDataError` as the request did.
+
+        The response is passed through `projection`, if given, after it has
+        been cached.
+        """
+        project = projection or (lambda response: response)
+        if self.cache is None:
+            cached, missing = None, fields
+        else:
+            cached, missing = self.cache.lookup(verb, query, fields, limit)
+            if cached is not None and "error" in cached:
+                raise exceptions.GeocodioDataError(cached["error"])
+            if cached is not None and not missing:
+                return project(cached)
+
+        response = self._lookup(verb, dict(params, fields=",".join(missing)), deadline)
+        if response.status_code == 422 and self.cache is not None:
+            self.cache.store_error(verb, query, response.json()["error"], limit)
+        if response.status_code != 200:
+            return error_response(response)
+        with self._span("decode", verb=verb):
+            data = response.json()
+        if self.cache is None:
+            return project(data)
+        self.cache.store(verb, query, missing, data, limit)
+        return project(data if cached is None else merge_responses(cached, data))
+
+    def parse(
+        self, address, local=False, min_confidence=DEFAULT_MIN_CONFIDENCE, deadline=None
+    ):
         """
         Returns an Address dictionary with the components of the queried
         address.
 
+        With `local=True` the address is first parsed offline, and the API
+        is only queried if the local parser's confidence is below
+        `min_confidence`. The returned Address's `source` attribute is
+        "local" or "api" to report which was used.
+
+        `deadline` is the seconds allowed for the call, by default the
+        client's.
+
         >>> client = GeocodioClient('some_api_key')
         >>> client.parse("1600 Pennsylvania Ave, Washington DC")
         {
@@ -158,35 +557,478 @@ class GeocodioClient(object):
             "formatted_address": "1600 Pennsylvania Ave, Washington DC"
         }
         """
-        response = self._req(verb="parse", params={"q": address})
+        if local:
+            parsed, confidence = parse_address(address)
+            if confidence >= min_confidence:
+                parsed.source = "local"
+                return parsed
+            logger.debug("Local parse confidence %.2f for %r", confidence, address)
+
+        response = self._lookup("parse", {"q": address}, self._deadline(deadline))
         if response.status_code != 200:
             return error_response(response)
 
-        return Address(response.json())
+        parsed = Address(response.json())
+        parsed.source = "api"
+        return parsed
+
+    def _parse_or_error(self, address, **kwargs):
+        try:
+            return self.parse(address, **kwargs)
+        except (
+            exceptions.GeocodioError,
+            requests.exceptions.RequestException,
+            # A malformed response body, e.g. not JSON or without its keys
+            ValueError,
+            KeyError,
+        ) as e:
+            return e
+
+    @staticmethod
+    def _address_collection(addresses, results):
+        if isinstance(addresses, dict):
+            return AddressCollectionDict(addresses, dict(zip(addresses, results)))
+        return AddressCollection(addresses, results)
+
+    def parse_many(self, addresses, max_workers=DEFAULT_POOL_SIZE, **kwargs):
+        """
+        Parses a list of addresses or a dict of addresses with arbitrary keys,
+        running up to `max_workers` requests at a time over the client's
+        pooled connections.
+
+        Returns an AddressCollection (or AddressCollectionDict) in the input
+        order (or with the input keys). Errors, including `ValueError` and
+        `KeyError` from malformed responses, are captured per address rather
+        than raised; see the collection's `errors`. Accepts the same keyword
+        arguments as `parse`.
+        """
+        values = list(addresses.values()) if isinstance(addresses, dict) else addresses
+        parse = functools.partial(self._parse_or_error, **kwargs)
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            results = list(executor.map(parse, values))
+        return self._address_collection(addresses, results)
+
+    async def parse_many_async(
+        self, addresses, max_workers=DEFAULT_POOL_SIZE, **kwargs
+    ):
+        """
+        Coroutine version of `parse_many`.
+
+        The requests run on a thread pool so that the event loop is not
+        blocked, with at most `max_workers` in flight.
+        """
+        import asyncio
+
+        values = list(addresses.values()) if isinstance(addresses, dict) else addresses
+        parse = functools.partial(self._parse_or_error, **kwargs)
+        loop = asyncio.get_running_loop()
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            results = await asyncio.gather(
+                *(loop.run_in_executor(executor, parse, value) for value in values)
+            )
+        return self._address_collection(addresses, results)
+
+    def _post_chunk(
+        self,
+        verb,
+        params,
+        serialize,
+        payload,
+        deadline=None,
+        projection=None,
+        submitted=None,
+    ):
+        """
+        Posts a single batch chunk, projecting its results with `projection`
+        as soon as they are decoded.
+
+        :return: a tuple of the raw results, the retryable exception raised
+            if any, the latency and the response size in bytes.
+        """
+        started = time.monotonic()
+        queued = 0 if submitted is None else started - submitted
+        with self._span(
+            "chunk", verb=verb, size=len(payload), queued_ms=queued * 1000
+        ) as span:
+            try:
+                response = self._req(
+                    "post",
+                    verb=verb,
+                    params=params,
+                    data=self._serialize(verb, serialize, payload),
+                    deadline=deadline,
+                    lookups=len(payload),
+                )
+                if response.status_code != 200:
+                    error_response(response)
+            except (
+                requests.exceptions.Timeout,
+                exceptions.GeocodioServerError,
+                exceptions.GeocodioRateLimitError,
+            ) as e:
+                span["error"] = type(e).__name__
+                return None, e, time.monotonic() - started, 0
+            results = self._decode_results(verb, response, projection)
+        return results, None, time.monotonic() - started, len(response.content)
+
+    def _serialize(self, verb, serialize, payload):
+        with self._span("serialize", verb=verb, size=len(payload)):
+            return serialize(payload)
+
+    def _decode_results(self, verb, response, projection=None):
+        """
+        Returns the raw `results` of a batch response, projected with
+        `projection` if given.
+        """
+        with self._span("decode", verb=verb, bytes=len(response.content)):
+            results = response.json()["results"]
+            if projection is not None:
+                project_results(projection, results)
+        return results
+
+    def _batch(
+        self,
+        verb,
+        data,
+        params,
+        serialize,
+        chunk_size=None,
+        deadline=None,
+        projection=None,
+    ):
+        """
+        Posts a batch request, optionally split into chunks, and returns the
+        raw combined `results` list or dict.
+
+        Chunks are sent one at a time unless the client has a concurrency
+        limiter, in which case up to the limiter's current limit are sent in
+        parallel. Chunks which fail with a timeout or server error are
+        retried at a smaller size if the chunk sizer allows it, and rate
+        limited chunks are retried whole after a backoff.
+
+        If the `deadline` expires, `GeocodioTimeoutError` is raised with the
+        raw results of the completed chunks as `partial`, a dict keyed by
+        input position (or key).
+        """
+        deadline = deadline or Deadline()
+        if chunk_size is None:
+            try:
+                response = self._req(
+                    "post",
+                    verb=verb,
+                    params=params,
+                    data=self._serialize(verb, serialize, data),
+                    deadline=deadline,
+                    lookups=len(data),
+                )
+            except exceptions.GeocodioTimeoutError as e:
+                e.partial = {}
+                raise
+            if response.status_code != 200:
+                return error_response(response)
+            return self._decode_results(verb, response, projection)
+
+        chunks = ChunkQueue(data, get_sizer(chunk_size))
+        in_flight = {}
+        max_workers = self.concurrency.max_limit if self.concurrency else 1
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            try:
+                while chunks or in_flight:
+                    if deadline.expired:
+                        raise _expired(chunks)
+                    self._submit_chunks(
+                        executor,
+                        in_flight,
+                        chunks,
+                        verb,
+                        params,
+                        serialize,
+                        deadline,
+                        projection,
+                    )
+                    done, _ = wait(
+                        in_flight,
+                        timeout=deadline.remaining(),
+                        return_when=FIRST_COMPLETED,
+                    )
+                    if not done:
+                        raise _expired(chunks)
+                    for future in done:
+                        start, chunk = in_flight.pop(future)
+                        self._chunk_done(verb, chunks, start, chunk, future, deadline)
+            finally:
+                for future in in_flight:
+                    future.cancel()
+        return chunks.combined()
+
+    def _chunk_done(self, verb, chunks, start, chunk, future, deadline):
+        """
+        Records a finished chunk's results, or queues it to be retried at a
+        smaller size if it failed and the sizer allows it.
+
+        Raises `GeocodioTimeoutError` with the partial results if the
+        deadline has expired, and the chunk's error if it cannot be retried.
+        """
+        try:
+            results, error, latency, nbytes = future.result()
+        except exceptions.GeocodioTimeoutError as e:
+            raise _expired(chunks, e.__cause__)
+        if isinstance(error, exceptions.GeocodioRateLimitError):
+            return self._chunk_rate_limited(verb, chunks, start, chunk, error, deadline)
+        chunks.sizer.record(len(chunk), latency, nbytes, error=bool(error))
+        if error is None:
+            chunks.results[start] = results
+            return
+        if deadline.expired:
+            raise _expired(chunks, error)
+        if len(chunk) <= chunks.sizer.min_size:
+            raise error
+        logger.debug("Retrying failed %s chunk of %d", verb, len(chunk))
+        chunks.retry(start, chunk)
+
+    def _chunk_rate_limited(self, verb, chunks, start, chunk, error, deadline):
+        """
+        Queues a rate limited chunk to be sent again whole, after a backoff
+        doubled each time the chunk is rate limited. The chunk's size is not
+        the cause, so the sizer does not record it.
+
+        Raises the chunk's error once it has been retried
+        `RATE_LIMIT_RETRIES` times, and `GeocodioTimeoutError` with the
+        partial results if the backoff would outlast the deadline.
+        """
+        attempts = chunks.rate_limited.get(start, 0)
+        if attempts >= RATE_LIMIT_RETRIES:
+            raise error
+        backoff = RATE_LIMIT_BACKOFF * 2**attempts
+        remaining = deadline.remaining()
+        if remaining is not None and backoff >= remaining:
+            raise _expired(chunks, error)
+        logger.debug("Retrying rate limited %s chunk of %d", verb, len(chunk))
+        time.sleep(backoff)
+        chunks.requeue(start, chunk)
+
+    def _submit_chunks(
+        self,
+        executor,
+        in_flight,
+        chunks,
+        verb,
+        params,
+        serialize,
+        deadline,
+        projection,
+    ):
+        """
+        Submits chunks from the queue to the executor until the number in
+        flight reaches the concurrency limiter's current limit, or one
+        without a limiter. `in_flight` maps each future to the position and
+        items of its chunk.
+        """
+        workers = self.concurrency.limit if self.concurrency else 1
+        while chunks and len(in_flight) < workers:
+            start, chunk = chunks.pop()
+            future = executor.submit(
+                self._post_chunk,
+                verb,
+                params,
+                serialize,
+                chunks.payload(chunk),
+                deadline,
+                projection,
+                time.monotonic(),
+            )
+            in_flight[future] = (start, chunk)
+
+    def _collection(self, results):
+        with self._span("collection"):
+            if isinstance(results, list):
+                return LocationCollection(results, view=self.views)
+            elif isinstance(results, dict):
+                return LocationCollectionDict(results, view=self.views)
+            else:
+                raise Exception("Error: Unknown API change")
+
+    def _location(self, response):
+        return LocationView(response) if self.views else Location(response)
+
+    def _batch_lookup(
+        self,
+        verb,
+        data,
+        params,
+        serialize,
+        fields,
+        chunk_size,
+        limit=0,
+        query=None,
+        deadline=None,
+        projection=None,
+    ):
+        """
+        Returns the raw combined `results` for a batch of lookups, answering
+        queries from the cache where possible. Uncached queries are grouped
+        by the fields they are missing and only those fields are requested.
+
+        `query` converts an input item to the query echoed by the API.
+        Responses are passed through `projection`, if given, once cached.
+        """
+        if self.cache is None:
+            params = dict(params, fields=",".join(fields))
+            return self._batch(
+                verb,
+                data,
+                params,
+                serialize,
+                chunk_size=chunk_size,
+                deadline=deadline,
+                projection=projection,
+            )
+
+        keyed = isinstance(data, dict)
+        values = list(data.values()) if keyed else list(data)
+        queries = [query(v) for v in values] if query else values
+        entries = self.cache.lookup_many(verb, queries, fields, limit)
+        responses = [cached for cached, _ in entries]
+        groups = collections.defaultdict(list)
+        for index, (cached, missing) in enumerate(entries):
+            if cached is None or missing:
+                groups[tuple(missing)].append(index)
+
+        complete = {i for i, (cached, missing) in enumerate(entries) if not missing}
+        complete.difference_update(*groups.values())
+        project = projection or (lambda response: response)
+        for index in complete:
+            responses[index] = project(responses[index])
+
+        def merge(indexes, missing, results):
+            fetched = [result["response"] for result in results]
+            self.cache.store_many(
+                verb, [queries[i] for i in indexes], missing, fetched, limit
+            )
+            for index, response in zip(indexes, fetched):
+                cached = entries[index][0]
+                responses[index] = project(
+                    response if cached is None else merge_responses(cached, response)
+                )
+            complete.update(indexes)
+
+        for missing, indexes in groups.items():
+            try:
+                results = self._batch(
+                    verb,
+                    [values[i] for i in indexes],
+                    dict(params, fields=",".join(missing)),
+                    serialize,
+                    chunk_size=chunk_size,
+                    deadline=deadline,
+                )
+            except exceptions.GeocodioTimeoutError as e:
+                positions = sorted(e.partial or {})
+                merge(
+                    [indexes[p] for p in positions],
+                    missing,
+                    [e.partial[p] for p in positions],
+                )
+                keys = list(data) if keyed else range(len(values))
+                e.partial = {
+                    keys[i]: {"query": queries[i], "response": responses[i]}
+                    for i in sorted(complete)
+                }
+                raise
+            merge(indexes, missing, results)
+
+        results = [{"query": q, "response": r} for q, r in zip(queries, responses)]
+        return dict(zip(data, results)) if keyed else results
 
     def batch_geocode(self, addresses, **kwargs):
         """
         Returns an Address dictionary with the components of the queried
         address. Accepts either a list or dictionary of addresses
+
+        Pass `chunk_size` to split the batch into several requests, either
+        as a fixed number of addresses per request or as "adaptive" to size
+        each request from the latency of the previous ones.
+
+        Pass `deadline` to bound the seconds spent on the whole batch, by
+        default the client's. If it expires `GeocodioTimeoutError` is
+        raised, with the completed results as its `partial`
+        LocationCollectionDict keyed by input position (or key).
+
+        Pass a `Projection` as `projection` to keep only part of each
+        response, applied as each chunk is decoded.
         """
-        fields = ",".join(kwargs.pop("fields", []))
+        fields = kwargs.pop("fields", [])
         limit = kwargs.pop("limit", 0)
-        response = self._req(
-            "post",
-            verb="geocode",
-            params={"fields": fields, "limit": limit},
-            data=json.dumps(addresses),
-        )
-        if response.status_code != 200:
-            return error_response(response)
+        chunk_size = kwargs.pop("chunk_size", None)
+        deadline = self._deadline(kwargs.pop("deadline", None))
+        projection = kwargs.pop("projection", None)
+        try:
+            if self.normalize:
+                results = self._normalized_batch(
+                    addresses, fields, limit, chunk_size, deadline, projection
+                )
+            else:
+                results = self._batch_lookup(
+                    "geocode",
+                    addresses,
+                    {"limit": limit},
+                    json.dumps,
+                    fields,
+                    chunk_size,
+                    limit=limit,
+                    deadline=deadline,
+                    projection=projection,
+                )
+        except exceptions.GeocodioTimeoutError as e:
+            e.partial = LocationCollectionDict(e.partial or {}, view=self.views)
+            raise
+        return self._collection(results)
 
-        results = response.json()["results"]
-        if isinstance(results, list):
-            return LocationCollection(results)
-        elif isinstance(results, dict):
-            return LocationCollectionDict(results)
-        else:
-            raise Exception("Error: Unknown API change")
+    def _normalized_batch(
+        self, addresses, fields, limit, chunk_size, deadline=None, projection=None
+    ):
+        """
+        Geocodes each distinct normalized address once and returns the raw
+        results with the original inputs as the queries.
+        """
+        keyed = isinstance(addresses, dict)
+        originals = list(addresses.values()) if keyed else list(addresses)
+        normalized = [normalize_query(address) for address in originals]
+        distinct = {}
+        for address in normalized:
+            distinct.setdefault(query_key(address), address)
+
+        keys = list(addresses) if keyed else range(len(originals))
+        try:
+            results = self._batch_lookup(
+                "geocode",
+                list(distinct.values()),
+                {"limit": limit},
+                json.dumps,
+                fields,
+                chunk_size,
+                limit=limit,
+                deadline=deadline,
+                projection=projection,
+            )
+        except exceptions.GeocodioTimeoutError as e:
+            distinct_keys = list(distinct)
+            responses = {
+                distinct_keys[i]: result["response"]
+                for i, result in (e.partial or {}).items()
+            }
+            e.partial = {
+                key: {"query": original, "response": responses[query_key(address)]}
+                for key, original, address in zip(keys, originals, normalized)
+                if query_key(address) in responses
+            }
+            raise
+        responses = {key: result["response"] for key, result in zip(distinct, results)}
+        results = [
+            {"query": original, "response": responses[query_key(address)]}
+            for original, address in zip(originals, normalized)
+        ]
+        return dict(zip(addresses, results)) if keyed else results
 
     def geocode_address(self, address=None, components=None, **kwargs):
         """
@@ -242,18 +1084,22 @@ class GeocodioClient(object):
             ]
         }
         """
-        fields = ",".join(kwargs.pop("fields", []))
+        fields = kwargs.pop("fields", [])
         limit = kwargs.pop("limit", 0)
-        params = {"fields": fields, "limit": limit}
+        deadline = self._deadline(kwargs.pop("deadline", None))
+        projection = kwargs.pop("projection", None)
+        params = {"limit": limit}
+        if self.normalize:
+            address = normalize_query(address)
+            components = normalize_query(components)
         if address is not None:
             params["q"] = address
         else:
             params.update(components)
-        response = self._req(verb="geocode", params=params)
-        if response.status_code != 200:
-            return error_response(response)
-
-        return Location(response.json())
+        query = address if address is not None else components
+        return self._location(
+            self._single("geocode", query, params, fields, limit, deadline, projection)
+        )
 
     def geocode(self, address_data=None, components_data=None, **kwargs):
         """
@@ -289,35 +1135,57 @@ class GeocodioClient(object):
         """
         Method for identifying an address from a geographic point
         """
-        fields = ",".join(kwargs.pop("fields", []))
-        point_param = "{0},{1}".format(latitude, longitude)
-        response = self._req(
-            verb="reverse", params={"q": point_param, "fields": fields}
+        fields = kwargs.pop("fields", [])
+        deadline = self._deadline(kwargs.pop("deadline", None))
+        projection = kwargs.pop("projection", None)
+        point_param = point_str((latitude, longitude))
+        return self._location(
+            self._single(
+                "reverse",
+                point_param,
+                {"q": point_param},
+                fields,
+                deadline=deadline,
+                projection=projection,
+            )
         )
-        if response.status_code != 200:
-            return error_response(response)
-
-        return Location(response.json())
 
     def batch_reverse(self, points, **kwargs):
         """
         Method for identifying the addresses from a list of lat/lng tuples
         or dict mapping of arbitrary keys to lat/lng tuples
-        """
-        fields = ",".join(kwargs.pop("fields", []))
-        response = self._req(
-            "post", verb="reverse", params={"fields": fields}, data=json_points(points)
-        )
-        if response.status_code != 200:
-            return error_response(response)
 
-        results = response.json()["results"]
-        if isinstance(results, list):
-            return LocationCollection(results)
-        elif isinstance(results, dict):
-            return LocationCollectionDict(results)
-        else:
-            raise Exception("Error: Unknown API change")
+        Points may also be given as a NumPy array of shape (N, 2), or as a
+        tuple of two coordinate arrays, with coordinates in the client's
+        `order`. The collection returned is indexed by array position.
+
+        Accepts the same `chunk_size`, `deadline` and `projection` arguments
+        as `batch_geocode`.
+        """
+        fields = kwargs.pop("fields", [])
+        chunk_size = kwargs.pop("chunk_size", None)
+        deadline = self._deadline(kwargs.pop("deadline", None))
+        projection = kwargs.pop("projection", None)
+        serialize, query = json_points, point_str
+        if is_points_array(points) or hasattr(points, "__array__"):
+            points = point_strs(points, self.order)
+            serialize, query = json.dumps, None
+        try:
+            results = self._batch_lookup(
+                "reverse",
+                points,
+                {},
+                serialize,
+                fields,
+                chunk_size,
+                query=query,
+                deadline=deadline,
+                projection=projection,
+            )
+        except exceptions.GeocodioTimeoutError as e:
+            e.partial = LocationCollectionDict(e.partial or {}, view=self.views)
+            raise
+        return self._collection(results)
 
     def reverse(self, points, **kwargs):
         """
@@ -330,9 +1198,14 @@ class GeocodioClient(object):
         >>> multiple_locations = reverse([(40, -19), (43, 112)])
         >>> keyed_multiple_locations = reverse({"a": (40, -19), "b": (43, 112)})
         >>> single_location = reverse((40, -19))
+        >>> array_locations = reverse(numpy.array([[40, -19], [43, 112]]))
 
         """
-        if isinstance(points, list) or isinstance(points, dict):
+        if (
+            isinstance(points, list)
+            or isinstance(points, dict)
+            or is_points_array(points)
+        ):
             return self.batch_reverse(points, **kwargs)
 
         if self.order == "lat":
@@ -340,3 +1213,147 @@ class GeocodioClient(object):
         else:
             y, x = points
         return self.reverse_point(x, y, **kwargs)
+
+    def _stream(self, lookup, inputs, batch_size, max_in_flight, ordered, kwargs):
+        """
+        Yields `(input, Location)` pairs for an iterable of inputs, looked up
+        in batches of `batch_size` with `lookup` on a pool of
+        `max_in_flight` threads.
+
+        Inputs are only read when a batch can be sent, so at most
+        `max_in_flight` batches are held at once however far the consumer
+        falls behind.
+        """
+        if batch_size < 1 or max_in_flight < 1:
+            raise ValueError("The batch size and requests in flight must be positive")
+        inputs = iter(inputs)
+        # Yields lists of up to `batch_size` inputs until they run out
+        batches = iter(lambda: list(itertools.islice(inputs, batch_size)), [])
+
+        def run(batch):
+            return batch, lookup(batch, **kwargs)
+
+        executor = ThreadPoolExecutor(
+            max_workers=max_in_flight, thread_name_prefix="geocodio-stream"
+        )
+        pending = collections.deque()
+        try:
+            while True:
+                for batch in itertools.islice(batches, max_in_flight - len(pending)):
+                    pending.append(executor.submit(run, batch))
+                if not pending:
+                    return
+                if ordered:
+                    done = [pending.popleft()]
+                else:
+                    done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        pending.remove(future)
+                for future in done:
+                    batch, locations = future.result()
+                    yield from zip(batch, locations)
+        finally:
+            for future in pending:
+                future.cancel()
+            executor.shutdown(wait=False)
+
+    def geocode_iter(
+        self, addresses, batch_size=100, max_in_flight=4, ordered=True, **kwargs
+    ):
+        """
+        Geocodes an iterable of addresses or components dictionaries, which
+        may be unbounded, yielding `(address, Location)` pairs.
+
+        The addresses are sent in batches of `batch_size` with up to
+        `max_in_flight` batch requests running at once. Pairs are yielded in
+        input order, or as each batch completes if `ordered` is false.
+        Addresses are not read ahead of the batches in flight, so a slow
+        consumer holds back the requests rather than buffering results.
+
+        Accepts the same keyword arguments as `batch_geocode`.
+
+        >>> for address, location in client.geocode_iter(stream):
+        ...     print(address, location.coords)
+        """
+        return self._stream(
+            self.batch_geocode, addresses, batch_size, max_in_flight, ordered, kwargs
+        )
+
+    def reverse_iter(
+        self, points, batch_size=100, max_in_flight=4, ordered=True, **kwargs
+    ):
+        """
+        Reverse geocodes an iterable of (lat, lng) points, which may be
+        unbounded, yielding `(point, Location)` pairs. Works like
+        `geocode_iter` and accepts the same keyword arguments as
+        `batch_reverse`.
+        """
+        return self._stream(
+            self.batch_reverse, points, batch_size, max_in_flight, ordered, kwargs
+        )
+
+    def enrich(self, locations, fields, all_results=False, **kwargs):
+        """
+        Adds `fields` to the results of an existing `LocationCollection` or
+        `LocationCollectionDict` in place, and returns it.
+
+        Only the new fields are requested, by reverse geocoding the
+        coordinates of each best match (or of every result with
+        `all_results`) in a batch. Results sharing coordinates are looked up
+        once, and results without coordinates, e.g. failed queries, are
+        left unchanged.
+
+        Accepts the same `chunk_size` and `deadline` arguments as
+        `batch_reverse`. If the deadline expires `GeocodioTimeoutError` is
+        raised with the partly enriched collection as its `partial`.
+
+        >>> locations = client.geocode(addresses, fields=["cd"])
+        >>> client.enrich(locations, ["census2020", "school"])
+        """
+        chunk_size = kwargs.pop("chunk_size", None)
+        deadline = self._deadline(kwargs.pop("deadline", None))
+        values = locations.values() if isinstance(locations, dict) else locations
+        targets = _enrich_targets(values, all_results)
+        points = list(targets)
+        if not points:
+            return locations
+
+        def merge(results):
+            for index, result in results:
+                response = result["response"]
+                if not response.get("results"):
+                    continue
+                fetched = response["results"][0].get("fields", {})
+                for target in targets[points[index]]:
+                    merge_fields(
+                        target.setdefault("fields", {}), copy.deepcopy(fetched)
+                    )
+
+        try:
+            results = self._batch_lookup(
+                "reverse",
+                points,
+                {},
+                json.dumps,
+                list(fields),
+                chunk_size,
+                deadline=deadline,
+            )
+        except exceptions.GeocodioTimeoutError as e:
+            merge((e.partial or {}).items())
+            self._refresh_best_matches(values)
+            e.partial = locations
+            raise
+        merge(enumerate(results))
+        self._refresh_best_matches(values)
+        return locations
+
+    @staticmethod
+    def _refresh_best_matches(locations):
+        # A Location's best match is a copy of its first result, which may
+        # not share a newly added `fields` dictionary
+        for location in locations:
+            if isinstance(location, Location) and location.get("results"):
+                location.best_match = Address(
+                    location["results"][0], order=location.order
+                )
@@ -0,0 +1,149 @@
+"""
+Adaptive concurrency limiting for parallel requests.
+"""
+
+import collections
+import threading
+import time
+
+
+class AIMDLimiter(object):
+    """
+    Limits the number of requests in flight using additive increase,
+    multiplicative decrease (AIMD).
+
+    The limit grows by `increase` once a full window of `limit` requests has
+    succeeded while latency holds steady, and is multiplied by `decrease`
+    when a request is rate limited (HTTP 429), fails on the server (HTTP 5xx)
+    or times out. Only one decrease is applied per window, so a burst of
+    failures from requests that were already in flight is not counted more
+    than once.
+
+    The limiter is thread safe and can be shared by several clients.
+    """
+
+    def __init__(
+        self,
+        initial_limit=4,
+        min_limit=1,
+        max_limit=64,
+        increase=1,
+        decrease=0.5,
+        latency_tolerance=2.0,
+        smoothing=0.2,
+        history_size=1000,
+    ):
+        """
+        Args:
+            initial_limit: starting number of requests allowed in flight
+            min_limit: the limit is never cut below this value
+            max_limit: the limit is never raised above this value
+            increase: amount added to the limit after a successful window
+            decrease: factor applied to the limit after an overload
+            latency_tolerance: the limit is held, not raised, while the
+                    smoothed latency exceeds this multiple of the best
+                    smoothed latency observed
+            smoothing: weight of the most recent latency in the moving average
+            history_size: number of limit changes kept in `history`
+        """
+        if not 0 < min_limit <= initial_limit <= max_limit:
+            raise ValueError(
+                "Limits must satisfy 0 < min_limit <= initial_limit <= max_limit"
+            )
+        if not 0 < decrease < 1:
+            raise ValueError("Decrease must be between 0 and 1")
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.increase = increase
+        self.decrease = decrease
+        self.latency_tolerance = latency_tolerance
+        self.smoothing = smoothing
+        self.history = collections.deque(maxlen=history_size)
+
+        self._limit = initial_limit
+        self._in_flight = 0
+        self._successes = 0
+        self._last_decrease = 0.0
+        self._latency = None
+        self._best_latency = None
+        self._condition = threading.Condition()
+        self._record(initial_limit, "initial")
+
+    @property
+    def limit(self):
+        """
+        Returns the current number of requests allowed in flight.
+        """
+        return int(self._limit)
+
+    @property
+    def in_flight(self):
+        return self._in_flight
+
+    def _record(self, limit, reason):
+        self.history.append((time.time(), int(limit), reason))
+
+    def acquire(self, timeout=None):
+        """
+        Blocks until a request slot is available and returns a token which
+        must be passed to `release`.
+
+        Raises `TimeoutError` if no slot is available within `timeout`
+        seconds.
+        """
+        with self._condition:
+            if not self._condition.wait_for(
+                lambda: self._in_flight < self.limit, timeout=timeout
+            ):
+                raise TimeoutError("No request slot available")
+            self._in_flight += 1
+            return time.monotonic()
+
+    def release(self, token, overloaded=False, success=True):
+        """
+        Releases a request slot and adjusts the limit.
+
+        Args:
+            token: the value returned by `acquire`
+            overloaded: whether the request was rate limited, failed on
+                    the server or timed out
+            success: whether the request succeeded; failed requests which
+                    were not caused by overload leave the limit unchanged
+        """
+        now = time.monotonic()
+        with self._condition:
+            self._in_flight -= 1
+            if overloaded:
+                self._on_overload(token, now)
+            elif success:
+                self._on_success(now - token)
+            self._condition.notify_all()
+
+    def _on_overload(self, started, now):
+        self._successes = 0
+        if started < self._last_decrease:
+            return
+        self._last_decrease = now
+        limit = max(self.min_limit, int(self._limit * self.decrease))
+        if limit != self._limit:
+            self._limit = limit
+            self._record(limit, "decrease")
+
+    def _on_success(self, latency):
+        if self._latency is None:
+            self._latency = latency
+        else:
+            self._latency = (
+                self.smoothing * latency + (1 - self.smoothing) * self._latency
+            )
+        if self._best_latency is None or self._latency < self._best_latency:
+            self._best_latency = self._latency
+        if self._latency > self.latency_tolerance * self._best_latency:
+            self._successes = 0
+            return
+
+        self._successes += 1
+        if self._successes >= self._limit and self._limit < self.max_limit:
+            self._successes = 0
+            self._limit = min(self.max_limit, self._limit + self.increase)
+            self._record(self._limit, "increase")
@@ -1,16 +1,13 @@
 import json
+import numbers
+from collections.abc import Mapping
 
 
-class Address(dict):
+class _AddressAccessors(object):
     """
-    Dictionary class that provides some convenience wrappers for accessing
-    commonly used data elements on an Address.
+    Convenience accessors shared by `Address` and `AddressView`.
     """
 
-    def __init__(self, address_dict, order="lat"):
-        super(Address, self).__init__(address_dict)
-        self.order = order
-
     @property
     def coords(self):
         """
@@ -41,24 +38,11 @@ class Address(dict):
         return self.get("formatted_address", "")
 
 
-class Location(dict):
+class _LocationAccessors(object):
     """
-    Dictionary class that provides some convenience accessors to commonly used
-    data elements.
+    Convenience accessors shared by `Location` and `LocationView`.
     """
 
-    def __init__(self, result_dict, order="lat"):
-        super().__init__(result_dict)
-        try:
-            self.best_match = Address(self["results"][0], order=order)
-        # A KeyError would be raised if an address could not be parsed or
-        # geocoded, i.e. from a batch address geocoding process. An index error
-        # would be raised under similar circumstances, e.g. the 'results' key
-        # just refers to an empty list.
-        except (KeyError, IndexError):
-            self.best_match = Address({})
-        self.order = order
-
     @property
     def coords(self):
         """
@@ -82,6 +66,87 @@ class Location(dict):
         return self.best_match.formatted_address
 
 
+class Address(_AddressAccessors, dict):
+    """
+    Dictionary class that provides some convenience wrappers for accessing
+    commonly used data elements on an Address.
+    """
+
+    def __init__(self, address_dict, order="lat"):
+        super(Address, self).__init__(address_dict)
+        self.order = order
+
+
+class Location(_LocationAccessors, dict):
+    """
+    Dictionary class that provides some convenience accessors to commonly used
+    data elements.
+    """
+
+    def __init__(self, result_dict, order="lat"):
+        super().__init__(result_dict)
+        try:
+            self.best_match = Address(self["results"][0], order=order)
+        # A KeyError would be raised if an address could not be parsed or
+        # geocoded, i.e. from a batch address geocoding process. An index error
+        # would be raised under similar circumstances, e.g. the 'results' key
+        # just refers to an empty list.
+        except (KeyError, IndexError):
+            self.best_match = Address({})
+        self.order = order
+
+
+class _View(Mapping):
+    """
+    Read only mapping over a decoded response dictionary, which is wrapped
+    rather than copied.
+    """
+
+    def __init__(self, data, order="lat"):
+        self._data = data
+        self.order = order
+
+    def __getitem__(self, key):
+        return self._data[key]
+
+    def __iter__(self):
+        return iter(self._data)
+
+    def __len__(self):
+        return len(self._data)
+
+    def __eq__(self, other):
+        if isinstance(other, _View):
+            other = other._data
+        return self._data == other
+
+    __hash__ = None
+
+    def __repr__(self):
+        return "{0}({1!r})".format(type(self).__name__, self._data)
+
+
+class AddressView(_AddressAccessors, _View):
+    """
+    Read only Address over a decoded result, without copying it.
+    """
+
+
+class LocationView(_LocationAccessors, _View):
+    """
+    Read only Location over a decoded response, without copying it or its
+    best match. Nested values are the decoded objects themselves and should
+    not be modified; use `Location` for results which will be changed.
+    """
+
+    @property
+    def best_match(self):
+        try:
+            return AddressView(self._data["results"][0], order=self.order)
+        except (KeyError, IndexError):
+            return AddressView({}, order=self.order)
+
+
 class LocationCollectionUtils:
     @classmethod
     def extract_coords_key(cls, item):
@@ -110,15 +175,17 @@ class LocationCollection(list):
     A list of Location objects, with dictionary lookup by address.
     """
 
-    def __init__(self, results_list, order="lat"):
+    def __init__(self, results_list, order="lat", view=False):
         """
         Loads the individual responses into an internal list and uses the query
-        values as lookup keys.
+        values as lookup keys. With `view=True` the responses are wrapped in
+        read only `LocationView` objects rather than copied.
         """
+        location = LocationView if view else Location
         results = []
         lookups = {}
         for index, result in enumerate(results_list):
-            results.append(Location(result["response"], order=order))
+            results.append(location(result["response"], order=order))
             orig_query = result["query"]
             lookup_key = (
                 json.dumps(orig_query) if isinstance(orig_query, dict) else orig_query
@@ -130,7 +197,7 @@ class LocationCollection(list):
         self.lookups = lookups
 
     def __getitem__(self, item):
-        if isinstance(item, int):
+        if isinstance(item, numbers.Integral):
             ind = item
         else:
             key = LocationCollectionUtils.get_lookup_key(item)
@@ -172,15 +239,17 @@ class LocationCollectionDict(dict):
     A dict of Location objects, with dictionary lookup by address.
     """
 
-    def __init__(self, results_list, order="lat"):
+    def __init__(self, results_list, order="lat", view=False):
         """
         Loads the individual responses into an internal list and uses the query
-        values as lookup keys.
+        values as lookup keys. With `view=True` the responses are wrapped in
+        read only `LocationView` objects rather than copied.
         """
+        location = LocationView if view else Location
         results = {}
         lookups = {}
         for key, result in results_list.items():
-            results[key] = Location(result["response"], order=order)
+            results[key] = location(result["response"], order=order)
             orig_query = result["query"]
             lookup_key = (
                 json.dumps(orig_query) if isinstance(orig_query, dict) else orig_query
@@ -225,3 +294,81 @@ class LocationCollectionDict(dict):
         Returns a dict of formatted addresses from the Location list
         """
         return {k: v.formatted_address for k, v in self.items()}
+
+
+class AddressCollection(list):
+    """
+    A list of parsed Address objects, with dictionary lookup by address.
+
+    Addresses which could not be parsed hold the exception raised for them
+    in place of an Address.
+    """
+
+    def __init__(self, queries, results):
+        super().__init__(results)
+        self.lookups = {query: index for index, query in enumerate(queries)}
+
+    def get(self, key, default=None):
+        """
+        Returns an individual Address (or exception) by the queried address.
+        """
+        try:
+            return self[self.lookups[key]]
+        except KeyError:
+            return default
+
+    @property
+    def errors(self):
+        """
+        Returns a dict of the exceptions raised, by list index.
+        """
+        return {i: item for i, item in enumerate(self) if isinstance(item, Exception)}
+
+    @property
+    def formatted_addresses(self):
+        """
+        Returns a list of formatted addresses, None for failed items.
+        """
+        return [
+            None if isinstance(item, Exception) else item.formatted_address
+            for item in self
+        ]
+
+
+class AddressCollectionDict(dict):
+    """
+    A dict of parsed Address objects, with dictionary lookup by address.
+
+    Addresses which could not be parsed hold the exception raised for them
+    in place of an Address.
+    """
+
+    def __init__(self, queries, results):
+        super().__init__(results)
+        self.lookups = {query: key for key, query in queries.items()}
+
+    def get(self, key, default=None):
+        """
+        Returns an individual Address (or exception) by key or by the
+        queried address.
+        """
+        if key in self.lookups:
+            key = self.lookups[key]
+        return super().get(key, default)
+
+    @property
+    def errors(self):
+        """
+        Returns a dict of the exceptions raised, by key.
+        """
+        return {k: v for k, v in self.items() if isinstance(v, Exception)}
+
+    @property
+    def formatted_addresses(self):
+        """
+        Returns a dict of formatted addresses, None for failed items.
+        """
+        return {
+            k: None if isinstance(v, Exception) else v.formatted_address
+            for k, v in self.items()
+        }
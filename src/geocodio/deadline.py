@@ -0,0 +1,55 @@
+"""
+Time budgets for calls made up of several requests.
+"""
+
+import time
+
+from geocodio import exceptions
+
+
+class Deadline(object):
+    """
+    The time remaining for a logical operation, such as a chunked batch, and
+    every request it makes.
+
+    A deadline of None seconds never expires.
+    """
+
+    def __init__(self, seconds=None):
+        self.expires = None if seconds is None else time.monotonic() + seconds
+
+    def remaining(self):
+        """
+        Returns the seconds remaining, or None if the deadline is unbounded.
+        """
+        if self.expires is None:
+            return None
+        return max(0.0, self.expires - time.monotonic())
+
+    @property
+    def expired(self):
+        return self.expires is not None and time.monotonic() >= self.expires
+
+    def check(self, partial=None):
+        """
+        Raises `GeocodioTimeoutError` if the deadline has expired.
+        """
+        if self.expired:
+            raise exceptions.GeocodioTimeoutError(partial=partial)
+
+    def timeout(self, timeout=None):
+        """
+        Returns a request timeout, either seconds or a (connect, read)
+        tuple, capped at the time remaining.
+
+        >>> Deadline(None).timeout((1, 5))
+        (1, 5)
+        """
+        remaining = self.remaining()
+        if remaining is None:
+            return timeout
+        if timeout is None:
+            return remaining
+        if isinstance(timeout, tuple):
+            return tuple(remaining if t is None else min(t, remaining) for t in timeout)
+        return min(timeout, remaining)
@@ -0,0 +1,179 @@
+"""
+Great-circle distances between geocoded results.
+
+Points may be given as a `LocationCollection` or `LocationCollectionDict`, a
+`Location` or `Address`, an `(N, 2)` array, a tuple of two coordinate
+arrays, a list of point tuples or a single point tuple. Results and
+collections are read in their own `order`, other points in the `order`
+argument's. Results without coordinates, such as failed lookups, have NaN
+distances.
+
+Distances are computed with the haversine formula over whole arrays, in
+kilometers, meters ("m") or miles ("mi")::
+
+    >>> depots = [(37.5407, -77.4360), (38.8951, -77.0364)]
+    >>> distance_matrix(locations, depots, unit="mi")
+    >>> indexes, miles = nearest(locations, depots, unit="mi")
+
+This requires the optional `numpy` package::
+
+    pip install pygeocodio[numpy]
+"""
+
+from geocodio.arrays import _numpy
+from geocodio.data import (
+    LocationCollection,
+    LocationCollectionDict,
+    _AddressAccessors,
+    _LocationAccessors,
+)
+
+# Mean radius of the Earth in each unit
+EARTH_RADIUS = {"km": 6371.0088, "m": 6371008.8, "mi": 3958.7613}
+
+BLOCK_SIZE = 1024
+
+
+def _lat_lng(result):
+    coords = result.coords
+    if coords is None:
+        return float("nan"), float("nan")
+    return coords if result.order == "lat" else coords[::-1]
+
+
+def radians(points, order="lat"):
+    """
+    Returns an `(N, 2)` array of the (lat, lng) coordinates of `points` in
+    radians.
+    """
+    numpy = _numpy()
+    if isinstance(points, (LocationCollection, LocationCollectionDict)):
+        results = points.values() if isinstance(points, dict) else points
+        array = numpy.array([_lat_lng(result) for result in results], dtype=float)
+        return numpy.radians(array.reshape(-1, 2))
+    if isinstance(points, (_LocationAccessors, _AddressAccessors)):
+        return numpy.radians(numpy.array([_lat_lng(points)], dtype=float))
+
+    if isinstance(points, tuple) and all(hasattr(p, "__array__") for p in points):
+        if len(points) != 2 or numpy.shape(points[0]) != numpy.shape(points[1]):
+            raise ValueError("Coordinate arrays must be of equal shape")
+        array = numpy.column_stack([numpy.asarray(p, dtype=float) for p in points])
+    else:
+        array = numpy.asarray(points, dtype=float)
+        if array.shape == (2,):
+            array = array.reshape(1, 2)
+        elif array.size == 0:
+            array = array.reshape(0, 2)
+        if array.ndim != 2 or array.shape[1] != 2:
+            raise ValueError("Points must be a point or an array of shape (N, 2)")
+    if order != "lat":
+        array = array[:, ::-1]
+    return numpy.radians(array)
+
+
+def _radius(unit):
+    try:
+        return EARTH_RADIUS[unit]
+    except KeyError:
+        raise ValueError(
+            "Unit must be one of {0}".format(", ".join(sorted(EARTH_RADIUS)))
+        )
+
+
+def _haversine(lat1, cos1, lng1, lat2, cos2, lng2):
+    """
+    Returns the central angles between points given as broadcastable arrays
+    of latitudes, their cosines and longitudes, all in radians.
+    """
+    numpy = _numpy()
+    a = numpy.sin((lat2 - lat1) / 2) ** 2
+    a += cos1 * cos2 * numpy.sin((lng2 - lng1) / 2) ** 2
+    return 2 * numpy.arcsin(numpy.sqrt(numpy.minimum(a, 1.0)))
+
+
+def _blocks(sources, targets, radius, block_size):
+    if block_size < 1:
+        raise ValueError("The block size must be positive")
+    return _iter_blocks(sources, targets, radius, block_size)
+
+
+def _iter_blocks(sources, targets, radius, block_size):
+    numpy = _numpy()
+    lat2, lng2 = targets[:, 0], targets[:, 1]
+    cos2 = numpy.cos(lat2)
+    for start in range(0, len(sources), block_size):
+        block = sources[start : start + block_size]
+        lat1, lng1 = block[:, :1], block[:, 1:]
+        yield (
+            start,
+            radius * _haversine(lat1, numpy.cos(lat1), lng1, lat2, cos2, lng2),
+        )
+
+
+def distances(origin, destinations, unit="km", order="lat"):
+    """
+    Returns an array of the distances from a single `origin` point to each
+    of `destinations`.
+    """
+    source = radians(origin, order)
+    if len(source) != 1:
+        raise ValueError("The origin must be a single point")
+    ((_, row),) = _blocks(source, radians(destinations, order), _radius(unit), 1)
+    return row[0]
+
+
+def distance_blocks(
+    origins, destinations, unit="km", order="lat", block_size=BLOCK_SIZE
+):
+    """
+    Yields `(start, block)` pairs covering the distance matrix from
+    `origins` to `destinations`, where `block` holds the rows for up to
+    `block_size` origins from index `start`.
+
+    Only one block is computed at a time, so a matrix too large for memory
+    can be reduced block by block.
+    """
+    return _blocks(
+        radians(origins, order), radians(destinations, order), _radius(unit), block_size
+    )
+
+
+def distance_matrix(origins, destinations, unit="km", order="lat", block_size=None):
+    """
+    Returns an array of shape (len(origins), len(destinations)) of the
+    distances between every origin and destination.
+
+    With a `block_size` the matrix is filled that many origins at a time,
+    bounding the intermediate arrays to a few blocks rather than a few
+    times the size of the matrix.
+    """
+    numpy = _numpy()
+    sources, targets = radians(origins, order), radians(destinations, order)
+    matrix = numpy.empty((len(sources), len(targets)))
+    if block_size is None:
+        block_size = max(len(sources), 1)
+    for start, block in _blocks(sources, targets, _radius(unit), block_size):
+        matrix[start : start + len(block)] = block
+    return matrix
+
+
+def nearest(origins, destinations, unit="km", order="lat", block_size=BLOCK_SIZE):
+    """
+    Returns an array of the index of the nearest destination to each origin
+    and an array of the distances to them, computed a block of origins at a
+    time.
+
+    Origins with no destination distance, such as results without
+    coordinates, have an index of -1 and a NaN distance.
+    """
+    numpy = _numpy()
+    sources, targets = radians(origins, order), radians(destinations, order)
+    indexes = numpy.full(len(sources), -1, dtype=numpy.intp)
+    found = numpy.full(len(sources), numpy.nan)
+    for start, block in _blocks(sources, targets, _radius(unit), block_size):
+        rows = numpy.flatnonzero(~numpy.isnan(block).all(axis=1))
+        if len(rows):
+            best = numpy.nanargmin(block[rows], axis=1)
+            indexes[start + rows] = best
+            found[start + rows] = block[rows, best]
+    return indexes, found
@@ -20,3 +20,44 @@ class GeocodioServerError(GeocodioError):
     """HTTP 500 Server Error, remote server failure"""
 
     pass
+
+
+class GeocodioRateLimitError(GeocodioError):
+    """HTTP 429 Too Many Requests, rate limit exceeded"""
+
+    pass
+
+
+class GeocodioCircuitOpenError(GeocodioError):
+    """Request not sent because the client's circuit breaker is open"""
+
+    pass
+
+
+class GeocodioTimeoutError(GeocodioError):
+    """Deadline for a call expired before it completed
+
+    Results completed before the deadline, if any, are available as
+    `partial`.
+    """
+
+    def __init__(self, message="Deadline exceeded", partial=None):
+        super(GeocodioTimeoutError, self).__init__(message)
+        self.partial = partial
+
+
+class GeocodioBudgetError(GeocodioError):
+    """Request would exceed the usage meter's budget"""
+
+    pass
+
+
+class GeocodioListError(GeocodioError):
+    """List job failed to process
+
+    The list's last status is available as `status`.
+    """
+
+    def __init__(self, message="List processing failed", status=None):
+        super(GeocodioListError, self).__init__(message)
+        self.status = status
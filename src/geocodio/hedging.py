@@ -0,0 +1,131 @@
+"""
+Request hedging for latency sensitive single lookups.
+"""
+
+import collections
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+
+class Hedger(object):
+    """
+    Sends a duplicate request when the first has not answered within a delay
+    and returns whichever answers first.
+
+    The delay is either fixed or taken from a percentile of the latencies of
+    recent first requests, recorded whenever they finish so that those
+    beaten by their duplicate still count. The number of duplicate requests is capped at `max_ratio` of
+    all requests, so hedging cannot more than marginally increase the number
+    of billed lookups.
+
+    Requests made with the `requests` library cannot be interrupted once
+    sent, so the slower request is abandoned rather than cancelled: it runs
+    to completion on a worker thread and its response is discarded.
+    """
+
+    def __init__(
+        self,
+        delay=None,
+        percentile=95,
+        max_ratio=0.05,
+        window=1000,
+        min_samples=20,
+        initial_delay=1.0,
+        max_workers=16,
+    ):
+        """
+        Args:
+            delay: fixed hedging delay in seconds. If `None` the delay is
+                    the `percentile` of the last `window` latencies
+            percentile: latency percentile used as the delay
+            max_ratio: largest fraction of requests which may be hedged
+            window: number of recent latencies kept
+            min_samples: number of latencies required before the
+                    percentile is used instead of `initial_delay`
+            initial_delay: delay used until enough latencies are observed
+            max_workers: size of the thread pool used for requests
+        """
+        if not 0 <= max_ratio <= 1:
+            raise ValueError("The hedging ratio must be between 0 and 1")
+        self.fixed_delay = delay
+        self.percentile = percentile
+        self.max_ratio = max_ratio
+        self.min_samples = min_samples
+        self.initial_delay = initial_delay
+        self.latencies = collections.deque(maxlen=window)
+        self.requests = 0
+        self.hedged = 0
+        self.hedge_wins = 0
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="geocodio-hedge"
+        )
+
+    @property
+    def delay(self):
+        """
+        Returns the current hedging delay in seconds.
+        """
+        if self.fixed_delay is not None:
+            return self.fixed_delay
+        with self._lock:
+            latencies = sorted(self.latencies)
+        if len(latencies) < self.min_samples:
+            return self.initial_delay
+        index = min(len(latencies) - 1, int(len(latencies) * self.percentile / 100))
+        return latencies[index]
+
+    def _may_hedge(self):
+        with self._lock:
+            if self.hedged + 1 > self.max_ratio * self.requests:
+                return False
+            self.hedged += 1
+            return True
+
+    def _record_latency(self, future):
+        if future.cancelled() or future.exception() is not None:
+            return
+        with self._lock:
+            self.latencies.append(future.result()[1])
+
+    def _timed(self, func, args, kwargs):
+        started = time.monotonic()
+        result = func(*args, **kwargs)
+        return result, time.monotonic() - started
+
+    def call(self, func, *args, **kwargs):
+        """
+        Calls `func(*args, **kwargs)`, hedging it with a second call if the
+        first has not returned within the current delay.
+
+        Returns the first successful result. If every call raises, the
+        first exception is raised.
+        """
+        with self._lock:
+            self.requests += 1
+        delay = self.delay
+        primary = self._executor.submit(self._timed, func, args, kwargs)
+        primary.add_done_callback(self._record_latency)
+        pending = {primary}
+        done, pending = wait(pending, timeout=delay)
+        if not done and self._may_hedge():
+            pending.add(self._executor.submit(self._timed, func, args, kwargs))
+
+        error = None
+        while True:
+            for future in done:
+                try:
+                    result, _ = future.result()
+                except Exception as e:
+                    error = error or e
+                    continue
+                if future is not primary:
+                    with self._lock:
+                        self.hedge_wins += 1
+                for other in pending:
+                    other.cancel()
+                return result
+            if not pending:
+                raise error
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
@@ -0,0 +1,131 @@
+"""
+An HTTP/2 transport for the client, using the optional `httpx` package.
+
+With HTTP/2 concurrent requests from every thread share a few multiplexed
+connections instead of one socket (and TLS session) per request in flight.
+Requires ``pip install pygeocodio[http2]``.
+"""
+
+import threading
+
+from geocodio._lazy import LazyModule
+from geocodio.transport import Response, Transport
+
+requests = LazyModule("requests")
+
+
+def _httpx():
+    try:
+        import httpx
+    except ImportError as e:
+        raise ImportError("HTTP/2 requires httpx: pip install pygeocodio[http2]") from e
+    return httpx
+
+
+class Http2Transport(Transport):
+    """
+    Sends requests over HTTP/2.
+
+    Timeouts and connection errors are raised as the matching `requests`
+    exceptions, so callers see the same results and errors as with the
+    default transport.
+
+    HTTPS connections negotiate HTTP/2, falling back to HTTP/1.1 if the
+    server does not support it. Plain HTTP connections, e.g. to a local
+    test server, use HTTP/2 without negotiation.
+
+    Requests from every thread are run on one event loop thread, with an
+    `httpx.AsyncClient`, as the synchronous `httpx` client can open
+    multiplexed streams out of order when used from several threads.
+    Response bodies are read in full on that thread, including those
+    requested with `stream=True`.
+    """
+
+    def __init__(self, max_connections=None, cleartext=False):
+        """
+        Args:
+            max_connections: the most connections kept open, unbounded if
+                    None
+            cleartext: whether plain HTTP connections use HTTP/2 (prior
+                    knowledge) rather than HTTP/1.1
+        """
+        import asyncio
+
+        httpx = _httpx()
+        self._asyncio = asyncio
+        self.loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(
+            target=self.loop.run_forever, name="geocodio-http2", daemon=True
+        )
+        self._thread.start()
+
+        async def create():
+            return httpx.AsyncClient(
+                http2=True,
+                http1=not cleartext,
+                limits=httpx.Limits(max_connections=max_connections),
+            )
+
+        self.client = self._run(create())
+
+    def _run(self, coroutine):
+        return self._asyncio.run_coroutine_threadsafe(coroutine, self.loop).result()
+
+    @staticmethod
+    def _timeout(timeout):
+        httpx = _httpx()
+        if isinstance(timeout, tuple):
+            connect, read = timeout
+            return httpx.Timeout(read, connect=connect)
+        return httpx.Timeout(timeout)
+
+    async def arequest(
+        self, method, url, params=None, headers=None, data=None, timeout=None
+    ):
+        """
+        Coroutine sending a request, which must run on the transport's
+        `loop`.
+        """
+        httpx = _httpx()
+        content = data or None
+        if hasattr(content, "read"):
+            content = _chunks(content)
+        try:
+            return await self.client.request(
+                method,
+                url,
+                params=params,
+                headers=headers,
+                content=content,
+                timeout=self._timeout(timeout),
+            )
+        except httpx.ConnectTimeout as e:
+            raise requests.exceptions.ConnectTimeout(str(e)) from e
+        except httpx.TimeoutException as e:
+            raise requests.exceptions.ReadTimeout(str(e)) from e
+        except httpx.TransportError as e:
+            raise requests.exceptions.ConnectionError(str(e)) from e
+
+    def request(self, method, url, stream=False, **kwargs):
+        response = self._run(self.arequest(method, url, **kwargs))
+        return Response(response.status_code, response.content, response.headers)
+
+    def close(self):
+        """
+        Closes the connections and stops the event loop thread.
+        """
+        self._run(self.client.aclose())
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self._thread.join()
+        self.loop.close()
+
+
+async def _chunks(fileobj, chunk_size=65536):
+    """
+    Yields a file-like request body in chunks, for streaming uploads.
+    """
+    while True:
+        chunk = fileobj.read(chunk_size)
+        if not chunk:
+            return
+        yield chunk
@@ -0,0 +1,268 @@
+"""
+Geocodio's list (spreadsheet) API.
+
+A list is a CSV file uploaded to Geocodio and geocoded on its servers in the
+background, which for millions of rows is far cheaper than synchronous
+lookups. The client's `lists` attribute uploads a file, polls the list's
+status until it has been processed and downloads the results::
+
+    >>> job = client.lists.upload("customers.csv", "{{B}}, {{C}}, {{D}} {{E}}")
+    >>> client.lists.wait(job["id"])
+    >>> client.lists.download(job["id"], "customers-geocoded.csv")
+
+Files are uploaded and results downloaded in chunks, so neither is held in
+memory; `rows` yields the results as dictionaries, one CSV row at a time.
+"""
+
+import codecs
+import csv
+import io
+import os
+import time
+import uuid
+
+from geocodio import exceptions
+from geocodio.deadline import Deadline
+
+COMPLETED = "COMPLETED"
+FAILED = "FAILED"
+
+CHUNK_SIZE = 65536
+
+
+class MultipartBody(object):
+    """
+    A file-like `multipart/form-data` request body which reads the uploaded
+    file as it is sent, with a known length.
+    """
+
+    def __init__(self, fields, name, filename, fileobj, content_type="text/csv"):
+        """
+        Args:
+            fields: a dictionary of form field names and string values
+            name: the form field name of the file
+            filename: the file name sent for the file
+            fileobj: a binary file object positioned at the start of the
+                    data to send
+            content_type: the content type of the file
+        """
+        self.boundary = uuid.uuid4().hex
+        head = io.BytesIO()
+        for key, value in fields.items():
+            head.write(self._part_header('name="{0}"'.format(key)))
+            head.write(value.encode("utf-8") + b"\r\n")
+        head.write(
+            self._part_header(
+                'name="{0}"; filename="{1}"'.format(name, filename), content_type
+            )
+        )
+        tail = "\r\n--{0}--\r\n".format(self.boundary).encode("ascii")
+
+        position = fileobj.tell()
+        size = fileobj.seek(0, os.SEEK_END) - position
+        fileobj.seek(position)
+        self._length = len(head.getvalue()) + size + len(tail)
+        head.seek(0)
+        self._parts = [head, fileobj, io.BytesIO(tail)]
+
+    def _part_header(self, disposition, content_type=None):
+        header = "--{0}\r\nContent-Disposition: form-data; {1}\r\n".format(
+            self.boundary, disposition
+        )
+        if content_type is not None:
+            header += "Content-Type: {0}\r\n".format(content_type)
+        return (header + "\r\n").encode("utf-8")
+
+    @property
+    def content_type(self):
+        return "multipart/form-data; boundary={0}".format(self.boundary)
+
+    def __len__(self):
+        return self._length
+
+    def read(self, size=-1):
+        chunks = []
+        while self._parts and (size < 0 or size > 0):
+            chunk = self._parts[0].read(size)
+            if not chunk:
+                self._parts.pop(0)
+                continue
+            chunks.append(chunk)
+            if size > 0:
+                size -= len(chunk)
+        return b"".join(chunks)
+
+    def __iter__(self):
+        while True:
+            chunk = self.read(CHUNK_SIZE)
+            if not chunk:
+                return
+            yield chunk
+
+
+def _lines(chunks, encoding="utf-8"):
+    """
+    Yields the lines, with their line endings, of a stream of encoded
+    chunks.
+    """
+    decoder = codecs.getincrementaldecoder(encoding)()
+    pending = ""
+    for chunk in chunks:
+        # Only "\n" ends a line for the csv module, and the last line may
+        # continue in the next chunk
+        *lines, pending = (pending + decoder.decode(chunk)).split("\n")
+        for line in lines:
+            yield line + "\n"
+    pending += decoder.decode(b"", final=True)
+    if pending:
+        yield pending
+
+
+class Lists(object):
+    """
+    Uploads, monitors and downloads lists with a client's settings.
+    """
+
+    def __init__(self, client):
+        self.client = client
+
+    def _request(self, method, verb, deadline=None, **kwargs):
+        from geocodio.client import error_response
+
+        response = self.client._req(
+            method, verb=verb, deadline=deadline, lookups=0, **kwargs
+        )
+        if response.status_code != 200:
+            try:
+                return error_response(response)
+            finally:
+                if hasattr(response, "close"):
+                    response.close()
+        return response
+
+    def upload(
+        self,
+        file,
+        format,
+        direction="forward",
+        callback=None,
+        filename=None,
+        fields=None,
+    ):
+        """
+        Uploads a CSV file for geocoding and returns the new list's details,
+        including its `id`.
+
+        Args:
+            file: a path or a binary file object
+            format: the template for each row's query, with columns given
+                    by letter, e.g. "{{A}} {{B}}, {{C}}"
+            direction: "forward" to geocode addresses or "reverse" for
+                    points
+            callback: a URL the API calls when the list has been processed
+            filename: the file name sent, by default the path's
+            fields: fields to append to the results
+        """
+        form = {"direction": direction, "format": format}
+        if callback is not None:
+            form["callback"] = callback
+        if fields:
+            form["fields"] = ",".join(fields)
+        if isinstance(file, (str, os.PathLike)):
+            with open(file, "rb") as fileobj:
+                return self._upload(form, fileobj, filename or os.path.basename(file))
+        name = filename or os.path.basename(getattr(file, "name", "") or "list.csv")
+        return self._upload(form, file, name)
+
+    def _upload(self, form, fileobj, filename):
+        body = MultipartBody(form, "file", filename, fileobj)
+        response = self._request(
+            "post",
+            "lists",
+            headers={
+                "content-type": body.content_type,
+                "content-length": str(len(body)),
+            },
+            data=body,
+        )
+        return response.json()
+
+    def status(self, list_id, deadline=None):
+        """
+        Returns the details of a list, with its processing `status`.
+        """
+        return self._request(
+            "get", "lists/{0}".format(list_id), deadline=deadline
+        ).json()
+
+    def all(self, page=1):
+        """
+        Returns a page of the account's lists.
+        """
+        return self._request("get", "lists", params={"page": page}).json()
+
+    def delete(self, list_id):
+        """
+        Deletes a list and its results.
+        """
+        return self._request("delete", "lists/{0}".format(list_id)).json()
+
+    def wait(self, list_id, timeout=None, interval=1.0, max_interval=30.0, backoff=2.0):
+        """
+        Polls a list's status until it has been processed and returns its
+        details.
+
+        The wait between polls starts at `interval` seconds and grows by
+        `backoff` times up to `max_interval`. Raises `GeocodioListError` if
+        processing fails, and `GeocodioTimeoutError`, with the last details
+        as its `partial`, if `timeout` seconds pass first.
+        """
+        deadline = Deadline(timeout)
+        while True:
+            details = self.status(list_id, deadline=deadline)
+            state = details.get("status", {}).get("state")
+            if state == COMPLETED:
+                return details
+            if state == FAILED:
+                raise exceptions.GeocodioListError(
+                    details["status"].get("message") or "List processing failed",
+                    status=details,
+                )
+            remaining = deadline.remaining()
+            if remaining is not None and interval >= remaining:
+                raise exceptions.GeocodioTimeoutError(partial=details)
+            time.sleep(interval)
+            interval = min(interval * backoff, max_interval)
+
+    def _download(self, list_id):
+        return self._request("get", "lists/{0}/download".format(list_id), stream=True)
+
+    def download(self, list_id, destination, chunk_size=CHUNK_SIZE):
+        """
+        Writes a processed list's results to a path or binary file object,
+        in chunks of `chunk_size` bytes, and returns the number of bytes
+        written.
+        """
+        if isinstance(destination, (str, os.PathLike)):
+            with open(destination, "wb") as fileobj:
+                return self.download(list_id, fileobj, chunk_size)
+        response = self._download(list_id)
+        written = 0
+        try:
+            for chunk in response.iter_content(chunk_size):
+                destination.write(chunk)
+                written += len(chunk)
+        finally:
+            response.close()
+        return written
+
+    def rows(self, list_id, chunk_size=CHUNK_SIZE):
+        """
+        Yields a processed list's results as dictionaries keyed by the
+        header row, reading the results as they are consumed.
+        """
+        response = self._download(list_id)
+        try:
+            yield from csv.DictReader(_lines(response.iter_content(chunk_size)))
+        finally:
+            response.close()
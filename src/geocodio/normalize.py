@@ -0,0 +1,313 @@
+"""
+Offline normalization of free text addresses.
+
+Normalizing addresses before they are geocoded lets spelling variants of the
+same address, e.g. "123 Main St." and "123 MAIN STREET", share a cache entry
+and a single lookup in a batch. Normalization folds case, whitespace and
+punctuation and applies the USPS Publication 28 abbreviations for street
+suffixes, directionals and secondary unit designators. It is deterministic
+and uses no network or data files.
+"""
+
+import re
+
+# USPS standard suffix abbreviations, keyed by the common spellings
+STREET_SUFFIXES = {
+    "ALLEY": "ALY",
+    "ALLEE": "ALY",
+    "ALLY": "ALY",
+    "ANNEX": "ANX",
+    "ARCADE": "ARC",
+    "AVENUE": "AVE",
+    "AV": "AVE",
+    "AVEN": "AVE",
+    "AVENU": "AVE",
+    "AVN": "AVE",
+    "AVNUE": "AVE",
+    "BAYOU": "BYU",
+    "BEACH": "BCH",
+    "BEND": "BND",
+    "BLUFF": "BLF",
+    "BOTTOM": "BTM",
+    "BOULEVARD": "BLVD",
+    "BOUL": "BLVD",
+    "BOULV": "BLVD",
+    "BRANCH": "BR",
+    "BRIDGE": "BRG",
+    "BROOK": "BRK",
+    "BYPASS": "BYP",
+    "CAUSEWAY": "CSWY",
+    "CENTER": "CTR",
+    "CENTRE": "CTR",
+    "CIRCLE": "CIR",
+    "CIRC": "CIR",
+    "CIRCL": "CIR",
+    "CRCL": "CIR",
+    "CLIFF": "CLF",
+    "CLUB": "CLB",
+    "COMMON": "CMN",
+    "CORNER": "COR",
+    "COURSE": "CRSE",
+    "COURT": "CT",
+    "COVE": "CV",
+    "CREEK": "CRK",
+    "CRESCENT": "CRES",
+    "CROSSING": "XING",
+    "CRSSNG": "XING",
+    "DALE": "DL",
+    "DAM": "DM",
+    "DRIVE": "DR",
+    "DRIV": "DR",
+    "DRV": "DR",
+    "ESTATE": "EST",
+    "ESTATES": "ESTS",
+    "EXPRESSWAY": "EXPY",
+    "EXPRESS": "EXPY",
+    "EXTENSION": "EXT",
+    "FALLS": "FLS",
+    "FERRY": "FRY",
+    "FIELD": "FLD",
+    "FIELDS": "FLDS",
+    "FLAT": "FLT",
+    "FORD": "FRD",
+    "FOREST": "FRST",
+    "FORGE": "FRG",
+    "FORK": "FRK",
+    "FORT": "FT",
+    "FREEWAY": "FWY",
+    "FREEWY": "FWY",
+    "GARDEN": "GDN",
+    "GARDENS": "GDNS",
+    "GATEWAY": "GTWY",
+    "GLEN": "GLN",
+    "GREEN": "GRN",
+    "GROVE": "GRV",
+    "HARBOR": "HBR",
+    "HAVEN": "HVN",
+    "HEIGHTS": "HTS",
+    "HIGHWAY": "HWY",
+    "HIGHWY": "HWY",
+    "HIWAY": "HWY",
+    "HILL": "HL",
+    "HILLS": "HLS",
+    "HOLLOW": "HOLW",
+    "ISLAND": "IS",
+    "JUNCTION": "JCT",
+    "KNOLL": "KNL",
+    "LAKE": "LK",
+    "LAKES": "LKS",
+    "LANDING": "LNDG",
+    "LANE": "LN",
+    "LOOP": "LOOP",
+    "MALL": "MALL",
+    "MANOR": "MNR",
+    "MEADOW": "MDW",
+    "MEADOWS": "MDWS",
+    "MILL": "ML",
+    "MOTORWAY": "MTWY",
+    "MOUNT": "MT",
+    "MOUNTAIN": "MTN",
+    "ORCHARD": "ORCH",
+    "OVAL": "OVAL",
+    "PARK": "PARK",
+    "PARKWAY": "PKWY",
+    "PARKWY": "PKWY",
+    "PKWAY": "PKWY",
+    "PASS": "PASS",
+    "PATH": "PATH",
+    "PIKE": "PIKE",
+    "PINE": "PNE",
+    "PINES": "PNES",
+    "PLACE": "PL",
+    "PLAIN": "PLN",
+    "PLAINS": "PLNS",
+    "PLAZA": "PLZ",
+    "POINT": "PT",
+    "POINTS": "PTS",
+    "PORT": "PRT",
+    "PRAIRIE": "PR",
+    "RANCH": "RNCH",
+    "RIDGE": "RDG",
+    "RIVER": "RIV",
+    "ROAD": "RD",
+    "ROUTE": "RTE",
+    "ROW": "ROW",
+    "RUN": "RUN",
+    "SHORE": "SHR",
+    "SPRING": "SPG",
+    "SPRINGS": "SPGS",
+    "SQUARE": "SQ",
+    "STATION": "STA",
+    "STREET": "ST",
+    "STR": "ST",
+    "STRT": "ST",
+    "SUMMIT": "SMT",
+    "TERRACE": "TER",
+    "TERR": "TER",
+    "TRACE": "TRCE",
+    "TRAIL": "TRL",
+    "TRAILS": "TRL",
+    "TUNNEL": "TUNL",
+    "TURNPIKE": "TPKE",
+    "UNION": "UN",
+    "VALLEY": "VLY",
+    "VIADUCT": "VIA",
+    "VIEW": "VW",
+    "VILLAGE": "VLG",
+    "VILLE": "VL",
+    "VISTA": "VIS",
+    "WALK": "WALK",
+    "WAY": "WAY",
+    "WELLS": "WLS",
+}
+STREET_SUFFIXES.update({abbr: abbr for abbr in set(STREET_SUFFIXES.values())})
+
+DIRECTIONALS = {
+    "NORTH": "N",
+    "SOUTH": "S",
+    "EAST": "E",
+    "WEST": "W",
+    "NORTHEAST": "NE",
+    "NORTHWEST": "NW",
+    "SOUTHEAST": "SE",
+    "SOUTHWEST": "SW",
+}
+DIRECTIONALS.update({abbr: abbr for abbr in set(DIRECTIONALS.values())})
+
+UNIT_DESIGNATORS = {
+    "APARTMENT": "APT",
+    "BASEMENT": "BSMT",
+    "BUILDING": "BLDG",
+    "DEPARTMENT": "DEPT",
+    "FLOOR": "FL",
+    "FRONT": "FRNT",
+    "HANGAR": "HNGR",
+    "LOBBY": "LBBY",
+    "LOWER": "LOWR",
+    "OFFICE": "OFC",
+    "PENTHOUSE": "PH",
+    "ROOM": "RM",
+    "SPACE": "SPC",
+    "SUITE": "STE",
+    "TRAILER": "TRLR",
+    "UNIT": "UNIT",
+    "UPPER": "UPPR",
+    "#": "#",
+}
+UNIT_DESIGNATORS.update({abbr: abbr for abbr in set(UNIT_DESIGNATORS.values())})
+
+_PERIODS = re.compile(r"\.")
+# Apostrophes are kept, as in "O'Neil", and typographic ones straightened
+_APOSTROPHES = re.compile(r"[\u2018\u2019]")
+_PUNCTUATION = re.compile(r"[^\w\s,#&/'-]")
+_HASH = re.compile(r"#\s*")
+_SEGMENTS = re.compile(r"\s*,[\s,]*")
+
+
+def _is_unit(tokens, position):
+    """
+    Returns whether the token at `position` is a unit designator followed by
+    a unit number or letter, e.g. "SUITE 100" or "APT B".
+    """
+    if tokens[position] not in UNIT_DESIGNATORS or position + 1 >= len(tokens):
+        return False
+    unit = tokens[position + 1]
+    return unit == "#" or len(unit) == 1 or any(c.isdigit() for c in unit)
+
+
+def _normalize_street(tokens):
+    """
+    Abbreviates the directionals, suffix and unit designator of a street
+    line given as a list of upper case tokens.
+    """
+    index = 1 if tokens and tokens[0][:1].isdigit() else 0
+    if (
+        len(tokens) > index + 1
+        and tokens[index] in DIRECTIONALS
+        and tokens[index + 1] not in STREET_SUFFIXES
+    ):
+        tokens[index] = DIRECTIONALS[tokens[index]]
+        index += 1
+
+    # The suffix is the first suffix word after the first word of the name
+    for position in range(index + 1, len(tokens)):
+        token = tokens[position]
+        if _is_unit(tokens, position):
+            break
+        if token in STREET_SUFFIXES:
+            tokens[position] = STREET_SUFFIXES[token]
+            following = position + 1
+            if following < len(tokens) and tokens[following] in DIRECTIONALS:
+                tokens[following] = DIRECTIONALS[tokens[following]]
+            break
+
+    return _normalize_units(tokens, index + 1)
+
+
+def _normalize_units(tokens, start=0):
+    """
+    Abbreviates secondary unit designators which are followed by a unit,
+    dropping a "#" which follows another designator.
+    """
+    normalized = tokens[:start]
+    for position in range(start, len(tokens)):
+        token = tokens[position]
+        if _is_unit(tokens, position):
+            if token == "#" and normalized and normalized[-1] in UNIT_DESIGNATORS:
+                continue
+            token = UNIT_DESIGNATORS[token]
+        normalized.append(token)
+    return normalized
+
+
+def normalize_address(address):
+    """
+    Returns a normalized form of a free text address.
+
+    >>> normalize_address("123 north Main Street., Apartment #4, Springfield,IL")
+    '123 N MAIN ST, APT 4, SPRINGFIELD, IL'
+    """
+    address = _PERIODS.sub("", address.upper())
+    address = _PUNCTUATION.sub(" ", _APOSTROPHES.sub("'", address))
+    address = _HASH.sub("# ", address)
+    segments = [s.split() for s in _SEGMENTS.split(address.strip())]
+    segments = [s for s in segments if s]
+    if not segments:
+        return ""
+    segments[0] = _normalize_street(segments[0])
+    segments[1:] = [_normalize_units(tokens) for tokens in segments[1:]]
+    return ", ".join(" ".join(tokens) for tokens in segments)
+
+
+def normalize_components(components):
+    """
+    Returns a normalized copy of an address components dictionary.
+
+    >>> normalize_components({"street": "1109 North Highland Street", "city": "arlington"})
+    {'street': '1109 N HIGHLAND ST', 'city': 'ARLINGTON'}
+    """
+    normalized = {}
+    for key, value in components.items():
+        if not isinstance(value, str):
+            normalized[key] = value
+        elif key == "street":
+            normalized[key] = " ".join(_normalize_street(_fold(value).split()))
+        else:
+            normalized[key] = _fold(value)
+    return normalized
+
+
+def _fold(value):
+    value = _APOSTROPHES.sub("'", _PERIODS.sub("", value.upper()))
+    return " ".join(_PUNCTUATION.sub(" ", value).replace(",", " ").split())
+
+
+def normalize_query(query):
+    """
+    Normalizes an address string or components dictionary.
+    """
+    if isinstance(query, dict):
+        return normalize_components(query)
+    if isinstance(query, str):
+        return normalize_address(query)
+    return query
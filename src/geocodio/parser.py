@@ -0,0 +1,263 @@
+"""
+Offline parsing of well formed US addresses.
+
+`parse_address` splits an address into the same `address_components` and
+`formatted_address` structure returned by the Geocodio `parse` endpoint,
+along with a confidence score. It handles the common
+"number [predirectional] street suffix [postdirectional] [unit], city, state
+zip" layout; anything it cannot account for lowers the confidence so that
+the caller can fall back to the API.
+"""
+
+import re
+
+from geocodio.data import Address
+from geocodio.normalize import (
+    DIRECTIONALS,
+    STREET_SUFFIXES,
+    UNIT_DESIGNATORS,
+    _is_unit,
+    normalize_address,
+)
+
+STATES = {
+    "ALABAMA": "AL",
+    "ALASKA": "AK",
+    "ARIZONA": "AZ",
+    "ARKANSAS": "AR",
+    "CALIFORNIA": "CA",
+    "COLORADO": "CO",
+    "CONNECTICUT": "CT",
+    "DELAWARE": "DE",
+    "DISTRICT OF COLUMBIA": "DC",
+    "FLORIDA": "FL",
+    "GEORGIA": "GA",
+    "HAWAII": "HI",
+    "IDAHO": "ID",
+    "ILLINOIS": "IL",
+    "INDIANA": "IN",
+    "IOWA": "IA",
+    "KANSAS": "KS",
+    "KENTUCKY": "KY",
+    "LOUISIANA": "LA",
+    "MAINE": "ME",
+    "MARYLAND": "MD",
+    "MASSACHUSETTS": "MA",
+    "MICHIGAN": "MI",
+    "MINNESOTA": "MN",
+    "MISSISSIPPI": "MS",
+    "MISSOURI": "MO",
+    "MONTANA": "MT",
+    "NEBRASKA": "NE",
+    "NEVADA": "NV",
+    "NEW HAMPSHIRE": "NH",
+    "NEW JERSEY": "NJ",
+    "NEW MEXICO": "NM",
+    "NEW YORK": "NY",
+    "NORTH CAROLINA": "NC",
+    "NORTH DAKOTA": "ND",
+    "OHIO": "OH",
+    "OKLAHOMA": "OK",
+    "OREGON": "OR",
+    "PENNSYLVANIA": "PA",
+    "PUERTO RICO": "PR",
+    "RHODE ISLAND": "RI",
+    "SOUTH CAROLINA": "SC",
+    "SOUTH DAKOTA": "SD",
+    "TENNESSEE": "TN",
+    "TEXAS": "TX",
+    "UTAH": "UT",
+    "VERMONT": "VT",
+    "VIRGINIA": "VA",
+    "WASHINGTON": "WA",
+    "WEST VIRGINIA": "WV",
+    "WISCONSIN": "WI",
+    "WYOMING": "WY",
+}
+STATE_CODES = set(STATES.values())
+
+# Confidence at or above which `GeocodioClient.parse` uses the local result
+DEFAULT_MIN_CONFIDENCE = 0.8
+
+_ZIP = re.compile(r"^\d{5}(-\d{4})?$")
+_NUMBER = re.compile(r"^\d+[A-Z]?(-\d+[A-Z]?)?$")
+
+
+def _take_state(tokens):
+    """
+    Removes a trailing state code or name from `tokens` and returns its
+    code, or None.
+    """
+    if tokens and tokens[-1] in STATE_CODES:
+        return tokens.pop()
+    for length in (3, 2, 1):
+        name = " ".join(tokens[-length:])
+        if len(tokens) >= length and name in STATES:
+            del tokens[-length:]
+            return STATES[name]
+    return None
+
+
+def _title(tokens):
+    """
+    Returns upper case tokens joined in title case, keeping ordinals and
+    other tokens starting with a digit in lower case, e.g. "W 42nd".
+    """
+    return " ".join(t.lower() if t[:1].isdigit() else t.title() for t in tokens)
+
+
+def _find_suffix(tokens, start):
+    """
+    Returns the position of the street suffix after the first word of the
+    street name starting at `start`, or None, and the position of the end
+    of the street line: its unit designator or the end of `tokens`.
+    """
+    for index in range(start + 1, len(tokens)):
+        if _is_unit(tokens, index):
+            return None, index
+        if tokens[index] in STREET_SUFFIXES:
+            return index, len(tokens)
+    return None, len(tokens)
+
+
+def _take_unit(tokens, position, components):
+    """
+    Parses a unit designator and number at `position` into `components`,
+    and returns the position after them.
+    """
+    if position >= len(tokens) or not _is_unit(tokens, position):
+        return position
+    unit = UNIT_DESIGNATORS[tokens[position]]
+    components["secondaryunit"] = unit.title() if unit != "#" else unit
+    components["secondarynumber"] = tokens[position + 1]
+    return position + 2
+
+
+def _parse_street(tokens, components):
+    """
+    Parses the street line from the front of `tokens` into `components`
+    and returns the number of tokens used and a confidence penalty.
+    """
+    penalty = 0.0
+    position = 0
+    if tokens and _NUMBER.match(tokens[0]):
+        components["number"] = tokens[0]
+        position = 1
+    else:
+        penalty += 0.3
+
+    if (
+        len(tokens) > position + 1
+        and tokens[position] in DIRECTIONALS
+        and tokens[position + 1] not in STREET_SUFFIXES
+    ):
+        components["predirectional"] = tokens[position]
+        position += 1
+
+    suffix_at, end = _find_suffix(tokens, position)
+    if suffix_at is None:
+        # Without a suffix the end of the street name is only known if the
+        # street line is on its own, e.g. "350 Broadway, New York NY"
+        components["street"] = _title(tokens[position:end])
+        position = end
+        penalty += 0.1
+    else:
+        components["street"] = _title(tokens[position:suffix_at])
+        components["suffix"] = tokens[suffix_at].title()
+        position = suffix_at + 1
+        if position < len(tokens) and tokens[position] in DIRECTIONALS:
+            components["postdirectional"] = tokens[position]
+            position += 1
+
+    if not components["street"]:
+        penalty += 0.5
+    return _take_unit(tokens, position, components), penalty
+
+
+def format_address(components):
+    """
+    Returns the formatted address for a components dictionary, in the
+    style of the Geocodio API.
+
+    >>> format_address({"number": "1600", "street": "Pennsylvania", "suffix": "Ave",
+    ...     "postdirectional": "NW", "city": "Washington", "state": "DC", "zip": "20500"})
+    '1600 Pennsylvania Ave NW, Washington, DC 20500'
+    """
+    street = " ".join(
+        components[key]
+        for key in (
+            "number",
+            "predirectional",
+            "street",
+            "suffix",
+            "postdirectional",
+            "secondaryunit",
+            "secondarynumber",
+        )
+        if components.get(key)
+    )
+    region = " ".join(components[k] for k in ("state", "zip") if components.get(k))
+    return ", ".join(
+        part for part in (street, components.get("city", ""), region) if part
+    )
+
+
+def parse_address(address, order="lat"):
+    """
+    Parses a US address without a network request.
+
+    :return: a tuple of an `Address`, with the same `address_components`
+        and `formatted_address` keys as the API response, and a confidence
+        score between 0 and 1.
+    """
+    normalized = normalize_address(address)
+    segments = [segment.split() for segment in normalized.split(", ")]
+    penalty = 0.0
+
+    tail = segments[-1]
+    zip_code = tail.pop() if tail and _ZIP.match(tail[-1]) else None
+    state = _take_state(tail)
+    if not tail and len(segments) > 1:
+        segments.pop()
+
+    street_tokens = segments[0]
+    for segment in segments[1:-1]:
+        # Only a unit, e.g. "Apt 4", is expected between street and city
+        if _is_unit(segment, 0):
+            street_tokens = street_tokens + segment
+        else:
+            penalty += 0.3
+
+    components = {}
+    used, street_penalty = _parse_street(street_tokens, components)
+    penalty += street_penalty
+    if len(segments) > 1:
+        city_tokens = segments[-1]
+        if used < len(street_tokens):
+            penalty += 0.3
+    else:
+        city_tokens = street_tokens[used:]
+        if "suffix" not in components:
+            # Without a suffix or commas the street name swallows the city
+            penalty += 0.4
+
+    if city_tokens:
+        components["city"] = _title(city_tokens)
+    else:
+        penalty += 0.3
+    if state is not None:
+        components["state"] = state
+    else:
+        penalty += 0.4
+    if zip_code is not None:
+        components["zip"] = zip_code
+    components["country"] = "US"
+
+    result = Address(
+        {
+            "address_components": components,
+            "formatted_address": format_address(components),
+        },
+        order=order,
+    )
+    return result, max(0.0, 1.0 - penalty)
@@ -0,0 +1,94 @@
+"""
+Projection of responses to the parts a caller needs.
+
+A `Projection` keeps only the selected parts of each geocoding or reverse
+geocoding response, e.g. the best match's coordinates and accuracy and one
+appended field. Clients apply it to each response, or each batch chunk, as
+soon as it is decoded, so the rest of the response is not held by the
+returned `Location` objects::
+
+    >>> projection = Projection(best_match=True, keys=["location", "accuracy"],
+    ...     fields=["cd"])
+    >>> locations = client.geocode(addresses, fields=["cd"], projection=projection)
+
+Any callable which takes and returns a response dictionary can be used in
+place of a `Projection`.
+"""
+
+from geocodio.cache import field_path
+
+
+class Projection(object):
+    """
+    Selects the results, result keys and appended fields to keep from a
+    response. Error responses are kept as they are.
+    """
+
+    def __init__(self, best_match=False, keys=None, fields=None, input=True):
+        """
+        Args:
+            best_match: keep only the first result
+            keys: the keys of each result to keep, e.g. "location",
+                    "accuracy" or "formatted_address", all if None
+            fields: the requested field names whose data is kept in each
+                    result's `fields`, all if None
+            input: keep the response's parsed `input`
+        """
+        self.best_match = best_match
+        self.keys = None if keys is None else tuple(keys)
+        self.fields = None if fields is None else tuple(fields)
+        self.input = input
+
+    def __repr__(self):
+        return "Projection(best_match={0!r}, keys={1!r}, fields={2!r}, input={3!r})".format(
+            self.best_match, self.keys, self.fields, self.input
+        )
+
+    def __call__(self, response):
+        if "results" not in response:
+            return response
+        projected = {
+            key: value
+            for key, value in response.items()
+            if key != "results" and (self.input or key != "input")
+        }
+        results = response["results"]
+        if self.best_match:
+            results = results[:1]
+        projected["results"] = [self._result(result) for result in results]
+        return projected
+
+    def _result(self, result):
+        if self.keys is None:
+            projected = dict(result)
+        else:
+            projected = {k: result[k] for k in self.keys if k in result}
+        if self.fields is not None and "fields" in result:
+            projected["fields"] = self._fields(result["fields"])
+        return projected
+
+    def _fields(self, fields):
+        selected = {}
+        for name in self.fields:
+            path = field_path(name) or (name,)
+            value = fields
+            for key in path:
+                value = value.get(key) if isinstance(value, dict) else None
+            if value is None:
+                continue
+            nested = selected
+            for key in path[:-1]:
+                nested = nested.setdefault(key, {})
+            nested[path[-1]] = value
+        return selected
+
+
+def project_results(projection, results):
+    """
+    Applies `projection` to the response of each item of a raw batch
+    `results` list or dict, in place.
+    """
+    items = results.values() if isinstance(results, dict) else results
+    for item in items:
+        item["response"] = projection(item["response"])
+    return results
@@ -0,0 +1,287 @@
+"""
+A cache backend shared over the network, using the Redis protocol.
+
+`RedisCache` talks to Redis, or any server speaking its protocol, with a
+small built in client, so no Redis library is needed. Batch reads are one
+`MGET` and batch writes one pipelined round trip, so a whole
+`batch_geocode` costs a single round trip to the cache for its lookups and
+one for storing what was fetched.
+"""
+
+import logging
+import queue
+import socket
+import zlib
+
+logger = logging.getLogger(__name__)
+
+# Leading byte of stored values, recording how they are encoded
+_RAW = b"\x00"
+_COMPRESSED = b"\x01"
+
+
+class RedisError(Exception):
+    """Error reply from the server"""
+
+    pass
+
+
+def encode_command(*args):
+    """
+    Returns a command encoded in the Redis protocol.
+
+    >>> encode_command("GET", "key")
+    b'*2\\r\\n$3\\r\\nGET\\r\\n$3\\r\\nkey\\r\\n'
+    """
+    parts = [b"*%d\r\n" % len(args)]
+    for arg in args:
+        if isinstance(arg, str):
+            arg = arg.encode("utf-8")
+        elif isinstance(arg, int):
+            arg = str(arg).encode("ascii")
+        parts.append(b"$%d\r\n%s\r\n" % (len(arg), arg))
+    return b"".join(parts)
+
+
+class _Connection(object):
+    def __init__(self, host, port, timeout):
+        self.sock = socket.create_connection((host, port), timeout=timeout)
+        self.sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        self.reader = self.sock.makefile("rb")
+
+    def close(self):
+        self.reader.close()
+        self.sock.close()
+
+    def execute(self, *commands):
+        """
+        Sends every command in one write and returns their replies.
+        """
+        self.sock.sendall(b"".join(encode_command(*c) for c in commands))
+        replies = [self.read_reply() for _ in commands]
+        for reply in replies:
+            if isinstance(reply, RedisError):
+                raise reply
+        return replies
+
+    def read_reply(self):
+        line = self.reader.readline()
+        if not line.endswith(b"\r\n"):
+            raise ConnectionError("Connection closed by the cache server")
+        kind, body = line[:1], line[1:-2]
+        if kind == b"+":
+            return body.decode("utf-8")
+        if kind == b"-":
+            return RedisError(body.decode("utf-8"))
+        if kind == b":":
+            return int(body)
+        if kind == b"$":
+            length = int(body)
+            if length < 0:
+                return None
+            return self.reader.read(length + 2)[:-2]
+        if kind == b"*":
+            length = int(body)
+            if length < 0:
+                return None
+            return [self.read_reply() for _ in range(length)]
+        raise ConnectionError("Unexpected reply from the cache server")
+
+
+class RedisCache(object):
+    """
+    Cache backend storing entries in Redis.
+
+    Values larger than `compress_min` bytes are stored zlib compressed.
+    Entries expire after the `ttl` given to `set_many`, or the backend's
+    default `ttl`.
+
+    If the server cannot be reached, or answers with an error such as
+    `LOADING`, `OOM` or a failed `AUTH`, and `fail_open` is true, lookups
+    miss and writes are dropped, with a logged warning, rather than failing
+    the geocoding call. `execute` always raises errors.
+
+    Connections are pooled and the backend is thread safe.
+    """
+
+    def __init__(
+        self,
+        host="localhost",
+        port=6379,
+        db=0,
+        password=None,
+        ttl=None,
+        timeout=5.0,
+        pool_size=8,
+        compress_min=256,
+        fail_open=True,
+    ):
+        """
+        Args:
+            host: server host name
+            port: server port
+            db: database number
+            password: password sent with AUTH, if any
+            ttl: default seconds until entries expire, never if None
+            timeout: socket timeout in seconds
+            pool_size: number of idle connections kept open
+            compress_min: size in bytes above which values are compressed
+            fail_open: whether connection errors and error replies are
+                    logged and ignored by the cache methods
+        """
+        self.host = host
+        self.port = port
+        self.db = db
+        self.password = password
+        self.ttl = ttl
+        self.timeout = timeout
+        self.compress_min = compress_min
+        self.fail_open = fail_open
+        self._pool = queue.LifoQueue(maxsize=pool_size)
+
+    def _connect(self):
+        connection = _Connection(self.host, self.port, self.timeout)
+        setup = []
+        if self.password is not None:
+            setup.append(("AUTH", self.password))
+        if self.db:
+            setup.append(("SELECT", self.db))
+        try:
+            if setup:
+                connection.execute(*setup)
+        except Exception:
+            connection.close()
+            raise
+        return connection
+
+    def execute(self, *commands):
+        """
+        Sends the commands in a single pipelined round trip and returns
+        their replies.
+        """
+        try:
+            connection = self._pool.get_nowait()
+        except queue.Empty:
+            connection = self._connect()
+        try:
+            replies = connection.execute(*commands)
+        except (OSError, ConnectionError):
+            connection.close()
+            raise
+        except RedisError:
+            self._release(connection)
+            raise
+        self._release(connection)
+        return replies
+
+    def _release(self, connection):
+        try:
+            self._pool.put_nowait(connection)
+        except queue.Full:
+            connection.close()
+
+    def _execute_or_fail_open(self, commands):
+        try:
+            return self.execute(*commands)
+        except (OSError, RedisError) as e:
+            if not self.fail_open:
+                raise
+            logger.warning("Cache server unavailable: %s", e)
+            return None
+
+    def encode(self, value):
+        data = value.encode("utf-8")
+        if len(data) > self.compress_min:
+            compressed = zlib.compress(data)
+            if len(compressed) < len(data):
+                return _COMPRESSED + compressed
+        return _RAW + data
+
+    @staticmethod
+    def decode(data):
+        if data[:1] == _COMPRESSED:
+            return zlib.decompress(data[1:]).decode("utf-8")
+        return data[1:].decode("utf-8")
+
+    def get_many(self, keys):
+        """
+        Returns a dictionary of the cached values found for `keys`, with a
+        single MGET.
+        """
+        keys = list(keys)
+        if not keys:
+            return {}
+        replies = self._execute_or_fail_open([["MGET"] + keys])
+        if replies is None:
+            return {}
+        return {
+            key: self.decode(value)
+            for key, value in zip(keys, replies[0])
+            if value is not None
+        }
+
+    def set_many(self, mapping, ttl=None):
+        """
+        Stores every key and value in `mapping` in one round trip: an MSET,
+        or pipelined SET commands with an expiry when there is a TTL.
+        """
+        if not mapping:
+            return
+        ttl = self.ttl if ttl is None else ttl
+        if ttl is None:
+            command = ["MSET"]
+            for key, value in mapping.items():
+                command.extend((key, self.encode(value)))
+            commands = [command]
+        else:
+            milliseconds = max(1, int(ttl * 1000))
+            commands = [
+                ("SET", key, self.encode(value), "PX", milliseconds)
+                for key, value in mapping.items()
+            ]
+        self._execute_or_fail_open(commands)
+
+    def get(self, key, default=None):
+        return self.get_many([key]).get(key, default)
+
+    def set(self, key, value, ttl=None):
+        self.set_many({key: value}, ttl=ttl)
+
+    def _scan_keys(self, batch_size, match):
+        cursor = b"0"
+        while True:
+            cursor, keys = self.execute(
+                ("SCAN", cursor, "MATCH", match, "COUNT", batch_size)
+            )[0]
+            if keys:
+                yield [key.decode("utf-8") for key in keys]
+            if cursor == b"0":
+                return
+
+    def scan(self, batch_size=1000, match="*"):
+        """
+        Yields lists of up to about `batch_size` `(key, value)` pairs for
+        the keys matching `match`, using SCAN and MGET.
+        """
+        for keys in self._scan_keys(batch_size, match):
+            found = self.get_many(keys)
+            if found:
+                yield list(found.items())
+
+    def clear(self, match="*"):
+        """
+        Deletes the keys matching `match`, by default every key in the
+        database.
+        """
+        for keys in self._scan_keys(1000, match):
+            self.execute(["DEL"] + keys)
+
+    def close(self):
+        """
+        Closes the pooled connections.
+        """
+        while True:
+            try:
+                self._pool.get_nowait().close()
+            except queue.Empty:
+                return
@@ -0,0 +1,106 @@
+"""
+Compact binary serialization of result objects.
+
+`dumps` and `loads` convert `Address`, `Location`, `LocationCollection` and
+`LocationCollectionDict` objects (and their views) to and from MessagePack.
+The coordinate `order`, collection `lookups` and dictionary keys are stored
+alongside the results, so collections are restored directly rather than by
+re-running their constructors.
+
+This requires the optional `msgpack` package::
+
+    pip install pygeocodio[msgpack]
+
+Dictionary keys of a `LocationCollectionDict` must be strings, numbers,
+booleans or None.
+"""
+
+from geocodio.data import (
+    Address,
+    AddressView,
+    Location,
+    LocationCollection,
+    LocationCollectionDict,
+    LocationView,
+)
+
+FORMAT_VERSION = 1
+
+ADDRESS = "A"
+LOCATION = "L"
+COLLECTION = "C"
+COLLECTION_DICT = "D"
+
+
+def _msgpack():
+    try:
+        import msgpack
+    except ImportError as e:
+        raise ImportError(
+            "Binary serialization requires msgpack: pip install pygeocodio[msgpack]"
+        ) from e
+    return msgpack
+
+
+def _raw(location):
+    return location._data if isinstance(location, LocationView) else location
+
+
+def dumps(obj):
+    """
+    Returns the bytes for a result object.
+    """
+    if isinstance(obj, LocationCollectionDict):
+        keys = list(obj)
+        record = [
+            COLLECTION_DICT,
+            obj.order,
+            keys,
+            [_raw(dict.__getitem__(obj, k)) for k in keys],
+            obj.lookups,
+        ]
+    elif isinstance(obj, LocationCollection):
+        record = [COLLECTION, obj.order, [_raw(item) for item in obj], obj.lookups]
+    elif isinstance(obj, (Location, LocationView)):
+        record = [LOCATION, obj.order, _raw(obj)]
+    elif isinstance(obj, (Address, AddressView)):
+        record = [
+            ADDRESS,
+            obj.order,
+            obj._data if isinstance(obj, AddressView) else obj,
+        ]
+    else:
+        raise TypeError("Cannot serialize {0}".format(type(obj).__name__))
+    return _msgpack().packb([FORMAT_VERSION] + record, use_bin_type=True)
+
+
+def loads(data, view=False):
+    """
+    Returns the result object for bytes from `dumps`. With `view=True`
+    locations are restored as `LocationView` objects.
+    """
+    record = _msgpack().unpackb(data, raw=False, strict_map_key=False)
+    version, kind, order = record[:3]
+    if version != FORMAT_VERSION:
+        raise ValueError("Unsupported serialization version {0}".format(version))
+    location = LocationView if view else Location
+
+    if kind == ADDRESS:
+        return (AddressView if view else Address)(record[3], order=order)
+    if kind == LOCATION:
+        return location(record[3], order=order)
+    if kind == COLLECTION:
+        collection = LocationCollection.__new__(LocationCollection)
+        list.__init__(collection, [location(r, order=order) for r in record[3]])
+        collection.lookups = record[4]
+    elif kind == COLLECTION_DICT:
+        collection = LocationCollectionDict.__new__(LocationCollectionDict)
+        dict.__init__(
+            collection,
+            ((k, location(r, order=order)) for k, r in zip(record[3], record[4])),
+        )
+        collection.lookups = record[5]
+    else:
+        raise ValueError("Unknown serialized type {0!r}".format(kind))
+    collection.order = order
+    return collection
@@ -0,0 +1,123 @@
+"""
+Timeline tracing of a client's requests.
+
+A `Tracer` given to a client records a timed span for each phase of its
+work: waiting for the concurrency limiter and usage meter ("queue"), each
+HTTP request ("http"), serializing and decoding batch chunks ("serialize",
+"decode"), each chunk as a whole ("chunk") and building result collections
+("collection"). Spans are recorded per thread, so chunks sent in parallel
+appear side by side.
+
+`Tracer.export` writes the spans in the Chrome trace event format, which can
+be opened in a trace viewer such as Perfetto or chrome://tracing::
+
+    >>> tracer = Tracer()
+    >>> client = GeocodioClient(MY_KEY, tracer=tracer)
+    >>> client.geocode(addresses, chunk_size="adaptive")
+    >>> with open("geocodio-trace.json", "w") as f:
+    ...     tracer.export(f)
+"""
+
+import contextlib
+import json
+import os
+import threading
+import time
+
+
+class Tracer(object):
+    """
+    Thread safe recorder of timed spans.
+    """
+
+    def __init__(self, category="geocodio"):
+        """
+        Args:
+            category: the trace event category of the recorded spans
+        """
+        self.category = category
+        self._events = []
+        self._threads = {}
+        self._lock = threading.Lock()
+        self._origin = time.perf_counter()
+
+    def __len__(self):
+        return len(self._events)
+
+    def _now(self):
+        return (time.perf_counter() - self._origin) * 1e6
+
+    @contextlib.contextmanager
+    def span(self, name, **args):
+        """
+        Records a span for the duration of the `with` block. The block is
+        given the span's `args` dictionary, which it may add to.
+
+        >>> with tracer.span("http", verb="geocode") as span:
+        ...     span["status"] = 200
+        """
+        start = self._now()
+        try:
+            yield args
+        finally:
+            self.add(name, start, self._now() - start, args)
+
+    def add(self, name, start, duration, args=None):
+        """
+        Records a span on the current thread, with its `start` and
+        `duration` in microseconds since the tracer was created.
+        """
+        thread = threading.current_thread()
+        event = {
+            "name": name,
+            "cat": self.category,
+            "ph": "X",
+            "ts": start,
+            "dur": duration,
+            "pid": os.getpid(),
+            "tid": thread.ident,
+            "args": args or {},
+        }
+        with self._lock:
+            self._events.append(event)
+            self._threads[thread.ident] = thread.name
+
+    @property
+    def spans(self):
+        """
+        Returns a list of the recorded spans as trace event dictionaries.
+        """
+        with self._lock:
+            return list(self._events)
+
+    def trace_events(self):
+        """
+        Returns the recorded spans, preceded by metadata events naming
+        their threads.
+        """
+        with self._lock:
+            events, threads = list(self._events), dict(self._threads)
+        metadata = [
+            {
+                "name": "thread_name",
+                "ph": "M",
+                "pid": os.getpid(),
+                "tid": ident,
+                "args": {"name": name},
+            }
+            for ident, name in threads.items()
+        ]
+        return metadata + sorted(events, key=lambda event: event["ts"])
+
+    def export(self, fileobj):
+        """
+        Writes the trace to a text file object as Chrome trace event JSON.
+        """
+        json.dump(
+            {"traceEvents": self.trace_events(), "displayTimeUnit": "ms"}, fileobj
+        )
+
+    def clear(self):
+        with self._lock:
+            self._events.clear()
+            self._threads.clear()
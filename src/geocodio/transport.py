@@ -0,0 +1,219 @@
+"""
+Transports send the client's HTTP requests.
+
+`GeocodioClient` builds each request and hands it to its transport, which
+returns a response with `status_code`, `content` and `json()`. Timeouts
+take the same values as with `requests`, either seconds or a
+`(connect, read)` tuple, and transports raise the `requests` timeout and
+connection exceptions, so the client's error handling is the same whichever
+transport is used.
+
+Transports used for list uploads and downloads also accept a file-like
+request body and, with `stream=True`, return a response whose body is read
+incrementally with `iter_content`.
+"""
+
+import json
+from urllib.parse import urlencode
+
+from geocodio._lazy import LazyModule
+
+requests = LazyModule("requests")
+urllib3 = LazyModule("urllib3")
+
+# Connections kept open per host by a transport
+DEFAULT_POOL_SIZE = 16
+
+
+class Transport(object):
+    """
+    Interface for sending requests.
+    """
+
+    def request(
+        self,
+        method,
+        url,
+        params=None,
+        headers=None,
+        data=None,
+        timeout=None,
+        stream=False,
+    ):
+        """
+        Sends a request and returns its response.
+
+        Args:
+            method: "GET", "POST" or "DELETE"
+            url: the URL without a query string
+            params: query parameters
+            headers: request headers
+            data: the request body as a string or a file-like object with a
+                    `Content-Length` header, if any
+            timeout: seconds or a (connect, read) tuple, or None
+            stream: whether to leave the response body to be read with
+                    `iter_content` rather than reading it immediately
+        """
+        raise NotImplementedError
+
+    def close(self):
+        """
+        Closes pooled connections.
+        """
+        pass
+
+
+class RequestsTransport(Transport):
+    """
+    Sends requests with a `requests.Session`, keeping a pool of connections
+    open for reuse across requests and threads.
+    """
+
+    def __init__(self, pool_size=DEFAULT_POOL_SIZE):
+        self.session = requests.Session()
+        adapter = requests.adapters.HTTPAdapter(pool_maxsize=pool_size)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+
+    def request(
+        self,
+        method,
+        url,
+        params=None,
+        headers=None,
+        data=None,
+        timeout=None,
+        stream=False,
+    ):
+        return self.session.request(
+            method,
+            url,
+            params=params,
+            headers=headers,
+            data=data,
+            timeout=timeout,
+            stream=stream,
+        )
+
+    def close(self):
+        self.session.close()
+
+
+class Response(object):
+    """
+    The parts of a `requests.Response` used by the client.
+
+    A streamed response is given the `raw` urllib3 response instead of its
+    `content`, which is then read on first access.
+    """
+
+    __slots__ = ("status_code", "headers", "_content", "_raw")
+
+    def __init__(self, status_code, content=None, headers=None, raw=None):
+        self.status_code = status_code
+        self.headers = headers or {}
+        self._content = content
+        self._raw = raw
+
+    @property
+    def content(self):
+        if self._content is None:
+            self._content = b"".join(self.iter_content())
+        return self._content
+
+    def iter_content(self, chunk_size=65536):
+        """
+        Yields the body in chunks of up to `chunk_size` bytes, reading a
+        streamed body incrementally.
+        """
+        if self._content is not None or self._raw is None:
+            content = self._content or b""
+            for start in range(0, len(content), chunk_size):
+                yield content[start : start + chunk_size]
+            return
+        raw, self._raw = self._raw, None
+        exceptions = urllib3.exceptions
+        try:
+            yield from raw.stream(chunk_size)
+        except exceptions.ReadTimeoutError as e:
+            raise requests.exceptions.ReadTimeout(str(e)) from e
+        except exceptions.HTTPError as e:
+            raise requests.exceptions.ConnectionError(str(e)) from e
+        finally:
+            raw.release_conn()
+
+    def close(self):
+        if self._raw is not None:
+            self._raw.release_conn()
+            self._raw = None
+
+    @property
+    def text(self):
+        return self.content.decode("utf-8")
+
+    def json(self):
+        return json.loads(self.content)
+
+
+class PoolTransport(Transport):
+    """
+    Sends requests directly on a `urllib3` connection pool, skipping the
+    session machinery of `requests` (hooks, cookies, redirects, environment
+    proxy settings and response wrapping) for lower per-request overhead.
+
+    Redirects are not followed and proxies are not used.
+    """
+
+    def __init__(self, pool_size=DEFAULT_POOL_SIZE):
+        self.pool = urllib3.PoolManager(maxsize=pool_size, retries=False)
+
+    @staticmethod
+    def _timeout(timeout):
+        if isinstance(timeout, tuple):
+            connect, read = timeout
+        else:
+            connect = read = timeout
+        return urllib3.Timeout(connect=connect, read=read)
+
+    def request(
+        self,
+        method,
+        url,
+        params=None,
+        headers=None,
+        data=None,
+        timeout=None,
+        stream=False,
+    ):
+        if params:
+            url = "{0}?{1}".format(url, urlencode(params))
+        if isinstance(data, str):
+            body = data.encode("utf-8") if data else None
+        else:
+            body = data or None
+        exceptions = urllib3.exceptions
+        try:
+            response = self.pool.request(
+                method,
+                url,
+                body=body,
+                headers=headers,
+                timeout=self._timeout(timeout),
+                redirect=False,
+                retries=False,
+                preload_content=not stream,
+            )
+        except exceptions.NewConnectionError as e:
+            raise requests.exceptions.ConnectionError(str(e)) from e
+        except exceptions.ConnectTimeoutError as e:
+            raise requests.exceptions.ConnectTimeout(str(e)) from e
+        except exceptions.ReadTimeoutError as e:
+            raise requests.exceptions.ReadTimeout(str(e)) from e
+        except exceptions.HTTPError as e:
+            raise requests.exceptions.ConnectionError(str(e)) from e
+        if stream:
+            return Response(response.status, headers=response.headers, raw=response)
+        return Response(response.status, response.data, response.headers)
+
+    def close(self):
+        self.pool.clear()
@@ -0,0 +1,174 @@
+"""
+Accounting of billed lookups.
+"""
+
+import collections
+import contextlib
+import json
+import logging
+import threading
+import time
+
+from geocodio import exceptions
+
+logger = logging.getLogger(__name__)
+
+
+class Usage(object):
+    """
+    Lookup counts for a meter or a job.
+
+    `lookups` counts the queries sent per verb and `fields` the queries
+    sent per appended field. Each appended field is billed as a further
+    lookup, so `billed` is the total of both.
+    """
+
+    def __init__(self, name=None):
+        self.name = name
+        self.lookups = collections.Counter()
+        self.fields = collections.Counter()
+        self.requests = 0
+        self.started = time.time()
+        self.finished = None
+
+    @property
+    def billed(self):
+        return sum(self.lookups.values()) + sum(self.fields.values())
+
+    def add(self, verb, lookups, fields, sign=1):
+        self.lookups[verb] += sign * lookups
+        for field in fields:
+            self.fields[field] += sign * lookups
+        self.requests += sign
+
+    def report(self):
+        """
+        Returns the usage as a JSON serializable dictionary.
+        """
+        return {
+            "name": self.name,
+            "started": self.started,
+            "finished": self.finished,
+            "requests": self.requests,
+            "lookups": dict(+self.lookups),
+            "fields": dict(+self.fields),
+            "billed": self.billed,
+        }
+
+
+class UsageMeter(object):
+    """
+    Counts the lookups billed for the requests a client sends.
+
+    Lookups are counted from the requests actually sent, so queries
+    answered from a cache or merged by normalization are not counted, while
+    hedged duplicate requests are. Requests answered with an error, or
+    which fail without a response, are not counted. Timed out requests are,
+    since the API may have completed them.
+
+    With a hard `budget`, a request which would take the billed total past
+    it raises `GeocodioBudgetError` instead of being sent. Once the billed
+    total passes the `soft_budget` a warning is logged and, if
+    `throttle_rate` is set, requests are paced to that many billed lookups
+    per second.
+
+    The meter is thread safe and can be shared by several clients.
+    """
+
+    def __init__(self, budget=None, soft_budget=None, throttle_rate=None):
+        """
+        Args:
+            budget: billed lookups after which requests are refused
+            soft_budget: billed lookups after which requests are throttled
+            throttle_rate: billed lookups per second allowed past the soft
+                    budget, unthrottled if None
+        """
+        self.budget = budget
+        self.soft_budget = soft_budget
+        self.throttle_rate = throttle_rate
+        self.usage = Usage()
+        self.reports = []
+        self._jobs = []
+        self._warned = False
+        self._next_allowed = 0.0
+        self._lock = threading.Lock()
+
+    @property
+    def billed(self):
+        return self.usage.billed
+
+    def reserve(self, verb, lookups, fields):
+        """
+        Counts a request before it is sent, waiting if the soft budget is
+        exceeded and raising `GeocodioBudgetError` if it would exceed the
+        hard budget.
+        """
+        cost = lookups * (1 + len(fields))
+        wait = 0.0
+        with self._lock:
+            billed = self.usage.billed
+            if self.budget is not None and billed + cost > self.budget:
+                raise exceptions.GeocodioBudgetError(
+                    "Request for {0} lookups would exceed the budget of {1} "
+                    "({2} used)".format(cost, self.budget, billed)
+                )
+            if self.soft_budget is not None and billed + cost > self.soft_budget:
+                if not self._warned:
+                    self._warned = True
+                    logger.warning(
+                        "Soft budget of %d lookups exceeded", self.soft_budget
+                    )
+                if self.throttle_rate:
+                    now = time.monotonic()
+                    start = max(now, self._next_allowed)
+                    self._next_allowed = start + cost / self.throttle_rate
+                    wait = start - now
+            for usage in [self.usage] + self._jobs:
+                usage.add(verb, lookups, fields)
+        if wait > 0:
+            time.sleep(wait)
+
+    def refund(self, verb, lookups, fields):
+        """
+        Removes a reserved request which was not billed.
+        """
+        with self._lock:
+            for usage in [self.usage] + self._jobs:
+                usage.add(verb, lookups, fields, sign=-1)
+
+    @contextlib.contextmanager
+    def job(self, name):
+        """
+        Counts the usage of the requests sent within the block, by any
+        thread, and adds its report to `reports` when the block exits.
+
+        >>> with meter.job("nightly") as usage:
+        ...     client.batch_geocode(addresses)
+        >>> usage.billed
+        """
+        usage = Usage(name)
+        with self._lock:
+            self._jobs.append(usage)
+        try:
+            yield usage
+        finally:
+            with self._lock:
+                self._jobs.remove(usage)
+                usage.finished = time.time()
+                self.reports.append(usage.report())
+
+    def report(self):
+        """
+        Returns the meter's total usage as a dictionary.
+        """
+        with self._lock:
+            return self.usage.report()
+
+    def export(self, fileobj):
+        """
+        Writes the job reports to a file object as JSON lines.
+        """
+        with self._lock:
+            reports = list(self.reports)
+        for report in reports:
+            fileobj.write(json.dumps(report) + "\n")
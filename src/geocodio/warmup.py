@@ -0,0 +1,166 @@
+"""
+Bulk loading and exporting of result caches.
+
+A `LocationCache` can be warmed from saved batch responses or NDJSON files
+of lookup records with `LocationCache.load`, or from another cache, and its
+entries exported to a portable NDJSON file. Every function streams its
+input and writes to the cache in batches, so memory use is bounded by the
+batch size rather than the number of entries.
+
+A lookup record is a dictionary with the `verb`, `query`, `fields`, `limit`
+and `response` of a lookup, as written by `write_records`.
+"""
+
+import collections
+import json
+
+
+def _open(source):
+    """
+    Returns a file object and whether it should be closed.
+    """
+    if isinstance(source, str):
+        return open(source, "r"), True
+    return source, False
+
+
+def batch_records(responses, verb="geocode", fields=(), limit=0):
+    """
+    Yields lookup records from saved batch responses, given as file paths,
+    file objects or decoded dictionaries. Both list and dictionary batch
+    results are read.
+    """
+    for response in responses:
+        if not isinstance(response, dict):
+            f, close = _open(response)
+            try:
+                response = json.load(f)
+            finally:
+                if close:
+                    f.close()
+        results = response["results"]
+        if isinstance(results, dict):
+            results = results.values()
+        for result in results:
+            yield {
+                "verb": verb,
+                "query": result["query"],
+                "fields": list(fields),
+                "limit": limit,
+                "response": result["response"],
+            }
+
+
+def read_records(source, verb="geocode", fields=(), limit=0):
+    """
+    Yields lookup records from an NDJSON file path or file object. Lines
+    may omit `verb`, `fields` and `limit`, in which case the arguments are
+    used, so a file of `{"query": ..., "response": ...}` lines exported
+    from `Location` results can be read.
+    """
+    f, close = _open(source)
+    try:
+        for line in f:
+            if not line.strip():
+                continue
+            record = json.loads(line)
+            record.setdefault("verb", verb)
+            record.setdefault("fields", list(fields))
+            record.setdefault("limit", limit)
+            yield record
+    finally:
+        if close:
+            f.close()
+
+
+def write_records(fileobj, pairs, verb="geocode", fields=(), limit=0):
+    """
+    Writes `(query, Location)` pairs, e.g. from `GeocodioClient.geocode_iter`
+    or `zip(queries, collection)`, as NDJSON lookup records.
+
+    :return: the number of records written.
+    """
+    count = 0
+    for query, location in pairs:
+        record = {
+            "verb": verb,
+            "query": query,
+            "fields": list(fields),
+            "limit": limit,
+            "response": dict(location),
+        }
+        fileobj.write(json.dumps(record) + "\n")
+        count += 1
+    return count
+
+
+def _relative(cache, key):
+    prefix = cache.prefix + ":"
+    return key[len(prefix) :] if key.startswith(prefix) else None
+
+
+def export_cache(cache, fileobj, batch_size=1000):
+    """
+    Writes every entry of a `LocationCache` to an NDJSON file. Keys are
+    written without the cache's prefix, so the file can be imported into a
+    cache with a different prefix. The cache backend must support `scan`.
+
+    :return: the number of entries written.
+    """
+    count = 0
+    for entries in cache.backend.scan(batch_size):
+        for key, value in entries:
+            key = _relative(cache, key)
+            if key is None:
+                continue
+            fileobj.write(json.dumps({"key": key, "value": value}) + "\n")
+            count += 1
+    return count
+
+
+def import_cache(cache, source, batch_size=1000):
+    """
+    Loads the entries of an NDJSON file written by `export_cache` into a
+    `LocationCache`, which may have a different backend and prefix.
+
+    :return: the number of entries loaded.
+    """
+    f, close = _open(source)
+    try:
+        return _set_entries(
+            cache, (json.loads(line) for line in f if line.strip()), batch_size
+        )
+    finally:
+        if close:
+            f.close()
+
+
+def copy_cache(source, target, batch_size=1000):
+    """
+    Copies every entry of one `LocationCache` into another. The source
+    backend must support `scan`.
+
+    :return: the number of entries copied.
+    """
+    entries = (
+        {"key": _relative(source, key), "value": value}
+        for batch in source.backend.scan(batch_size)
+        for key, value in batch
+        if key.startswith(source.prefix + ":")
+    )
+    return _set_entries(target, entries, batch_size)
+
+
+def _set_entries(cache, entries, batch_size):
+    count = 0
+    batches = collections.defaultdict(dict)
+    for entry in entries:
+        ttl = cache.entry_ttl(entry["value"])
+        batch = batches[ttl]
+        batch["{0}:{1}".format(cache.prefix, entry["key"])] = entry["value"]
+        count += 1
+        if len(batch) >= batch_size:
+            cache.backend.set_many(batches.pop(ttl), ttl=ttl)
+    for ttl, batch in batches.items():
+        cache.backend.set_many(batch, ttl=ttl)
+    return count
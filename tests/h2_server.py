@@ -0,0 +1,125 @@
+"""
+A local HTTP/2 Geocodio stand-in, speaking cleartext HTTP/2 with prior
+knowledge, for tests and benchmarks of the HTTP/2 transport.
+
+It records requests and answers them with the same handlers as
+`FakeGeocodioServer`, running each stream on its own thread so that
+requests multiplexed on one connection are handled concurrently.
+"""
+
+import socketserver
+import threading
+
+import h2.config
+import h2.connection
+import h2.events
+
+from tests.server import default_handler, handle_request
+
+
+class FakeHttp2Handler(socketserver.BaseRequestHandler):
+    def handle(self):
+        server = self.server
+        with server.lock:
+            server.connections += 1
+        config = h2.config.H2Configuration(client_side=False)
+        self.conn = h2.connection.H2Connection(config=config)
+        self.lock = threading.Lock()
+        self.conn.initiate_connection()
+        self.request.sendall(self.conn.data_to_send())
+
+        streams = {}
+        while True:
+            data = self.request.recv(65535)
+            if not data:
+                return
+            with self.lock:
+                events = self.conn.receive_data(data)
+                self.request.sendall(self.conn.data_to_send())
+            for event in events:
+                if isinstance(event, h2.events.RequestReceived):
+                    headers = dict(
+                        (
+                            k.decode() if isinstance(k, bytes) else k,
+                            v.decode() if isinstance(v, bytes) else v,
+                        )
+                        for k, v in event.headers
+                    )
+                    streams[event.stream_id] = (headers, [])
+                elif isinstance(event, h2.events.DataReceived):
+                    streams[event.stream_id][1].append(event.data)
+                    with self.lock:
+                        self.conn.acknowledge_received_data(
+                            event.flow_controlled_length, event.stream_id
+                        )
+                        self.request.sendall(self.conn.data_to_send())
+                elif isinstance(event, h2.events.StreamEnded):
+                    headers, body = streams.pop(event.stream_id)
+                    threading.Thread(
+                        target=self.respond,
+                        args=(event.stream_id, headers, b"".join(body)),
+                        daemon=True,
+                    ).start()
+                elif isinstance(event, h2.events.ConnectionTerminated):
+                    return
+
+    def respond(self, stream_id, headers, body):
+        status, response = handle_request(
+            self.server, headers[":method"], headers[":path"], body
+        )
+        payload = response.encode("utf-8")
+        with self.lock:
+            self.conn.send_headers(
+                stream_id,
+                [
+                    (":status", str(status)),
+                    ("content-type", "application/json"),
+                    ("content-length", str(len(payload))),
+                ],
+            )
+            self.conn.send_data(stream_id, payload, end_stream=True)
+            self.request.sendall(self.conn.data_to_send())
+
+
+class FakeHttp2Server(object):
+    """
+    Runs a threaded HTTP/2 server on a free local port, with the same
+    `requests`, `max_in_flight` and `connections` records as
+    `FakeGeocodioServer`.
+    """
+
+    def __init__(self, handler=default_handler, delay=None):
+        self.tcp = socketserver.ThreadingTCPServer(("127.0.0.1", 0), FakeHttp2Handler)
+        self.tcp.daemon_threads = True
+        self.tcp.handler = handler
+        self.tcp.delay = delay
+        self.tcp.lock = threading.Lock()
+        self.tcp.requests = []
+        self.tcp.in_flight = 0
+        self.tcp.max_in_flight = 0
+        self.tcp.connections = 0
+        self.thread = threading.Thread(target=self.tcp.serve_forever, daemon=True)
+
+    @property
+    def url(self):
+        return "http://127.0.0.1:{0}".format(self.tcp.server_address[1])
+
+    @property
+    def requests(self):
+        return self.tcp.requests
+
+    @property
+    def max_in_flight(self):
+        return self.tcp.max_in_flight
+
+    @property
+    def connections(self):
+        return self.tcp.connections
+
+    def __enter__(self):
+        self.thread.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.tcp.shutdown()
+        self.tcp.server_close()
@@ -0,0 +1,136 @@
+"""
+An in-process stand-in for a Redis server, speaking enough of the protocol
+for `geocodio.redis_cache.RedisCache`.
+"""
+
+import fnmatch
+import socketserver
+import threading
+import time
+
+
+class FakeRedisHandler(socketserver.StreamRequestHandler):
+    def _read_command(self):
+        line = self.rfile.readline()
+        if not line:
+            return None
+        count = int(line[1:-2])
+        args = []
+        for _ in range(count):
+            length = int(self.rfile.readline()[1:-2])
+            args.append(self.rfile.read(length + 2)[:-2])
+        return args
+
+    def handle(self):
+        server = self.server
+        while True:
+            command = self._read_command()
+            if command is None:
+                return
+            with server.lock:
+                server.commands.append([command[0].decode().upper()] + command[1:])
+                reply = server.run(command)
+            self.wfile.write(reply)
+
+
+def _bulk(value):
+    if value is None:
+        return b"$-1\r\n"
+    return b"$%d\r\n%s\r\n" % (len(value), value)
+
+
+class FakeRedisServer(object):
+    """
+    Runs a threaded Redis protocol server on a free local port, storing
+    data in memory. `commands` records every command received, and
+    `errors` maps command names to error replies to send instead.
+
+    >>> with FakeRedisServer() as server:
+    ...     cache = RedisCache(port=server.port)
+    """
+
+    def __init__(self):
+        self.tcp = socketserver.ThreadingTCPServer(("127.0.0.1", 0), FakeRedisHandler)
+        self.tcp.daemon_threads = True
+        self.tcp.lock = threading.Lock()
+        self.tcp.data = {}
+        self.tcp.expires = {}
+        self.tcp.commands = []
+        self.tcp.errors = {}
+        self.tcp.run = self._run
+        self.thread = threading.Thread(target=self.tcp.serve_forever, daemon=True)
+
+    @property
+    def port(self):
+        return self.tcp.server_address[1]
+
+    @property
+    def commands(self):
+        return self.tcp.commands
+
+    @property
+    def data(self):
+        return self.tcp.data
+
+    @property
+    def errors(self):
+        return self.tcp.errors
+
+    def _get(self, key):
+        expires = self.tcp.expires.get(key)
+        if expires is not None and expires <= time.monotonic():
+            self.tcp.data.pop(key, None)
+            self.tcp.expires.pop(key, None)
+        return self.tcp.data.get(key)
+
+    def _run(self, command):
+        name = command[0].decode().upper()
+        if name in self.tcp.errors:
+            return b"-%s\r\n" % self.tcp.errors[name].encode()
+        return self._execute(name, command)
+
+    def _execute(self, name, command):
+        args = command[1:]
+        data, expires = self.tcp.data, self.tcp.expires
+        if name in ("PING", "SELECT", "AUTH"):
+            return b"+OK\r\n"
+        if name == "GET":
+            return _bulk(self._get(args[0]))
+        if name == "MGET":
+            return b"*%d\r\n" % len(args) + b"".join(_bulk(self._get(k)) for k in args)
+        if name == "SET":
+            data[args[0]] = args[1]
+            expires.pop(args[0], None)
+            if len(args) == 4 and args[2].upper() == b"PX":
+                expires[args[0]] = time.monotonic() + int(args[3]) / 1000.0
+            return b"+OK\r\n"
+        if name == "MSET":
+            for key, value in zip(args[::2], args[1::2]):
+                data[key] = value
+                expires.pop(key, None)
+            return b"+OK\r\n"
+        if name == "DEL":
+            removed = sum(data.pop(k, None) is not None for k in args)
+            return b":%d\r\n" % removed
+        if name == "SCAN":
+            # Returns every matching key at once
+            pattern = (
+                args[args.index(b"MATCH") + 1].decode() if b"MATCH" in args else "*"
+            )
+            keys = [
+                k
+                for k in list(data)
+                if self._get(k) is not None and fnmatch.fnmatchcase(k.decode(), pattern)
+            ]
+            return b"*2\r\n$1\r\n0\r\n*%d\r\n" % len(keys) + b"".join(
+                _bulk(k) for k in keys
+            )
+        return b"-ERR unknown command '%s'\r\n" % command[0]
+
+    def __enter__(self):
+        self.thread.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.tcp.shutdown()
+        self.tcp.server_close()
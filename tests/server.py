@@ -0,0 +1,154 @@
+"""
+A local Geocodio stand-in for tests which need real concurrent connections.
+
+httpretty patches sockets in a way which is not safe to use from several
+threads at once, so tests exercising parallel dispatch run against this
+threaded HTTP server instead.
+"""
+
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+
+def empty_result(query):
+    return {"query": query, "response": {"input": {}, "results": []}}
+
+
+class FakeGeocodioHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    # Headers and body are written separately; without TCP_NODELAY the body
+    # waits on a delayed ACK for every keep-alive request
+    disable_nagle_algorithm = True
+
+    def log_message(self, format, *args):
+        pass
+
+    def setup(self):
+        super().setup()
+        with self.server.lock:
+            self.server.connections += 1
+
+    def _respond(self, status, body):
+        payload = body.encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        try:
+            self.wfile.write(payload)
+        except (BrokenPipeError, ConnectionResetError):
+            # The client gave up waiting, e.g. after a read timeout
+            pass
+
+    def _handle(self, method):
+        length = int(self.headers.get("Content-Length") or 0)
+        body = self.rfile.read(length) if length else b""
+        self._respond(
+            *handle_request(self.server, method, self.path, body, self.headers)
+        )
+
+    def do_GET(self):
+        self._handle("GET")
+
+    def do_POST(self):
+        self._handle("POST")
+
+    def do_DELETE(self):
+        self._handle("DELETE")
+
+
+def handle_request(server, method, path, body, headers=None):
+    """
+    Records a request on the server and returns the status and encoded
+    body of the response from the server's handler. JSON request bodies
+    are decoded, and other bodies are recorded as bytes.
+    """
+    url = urlparse(path)
+    params = {k: v[0] for k, v in parse_qs(url.query).items()}
+    try:
+        decoded = json.loads(body) if body else None
+    except ValueError:
+        decoded = body
+    request = {
+        "method": method,
+        "path": url.path,
+        "verb": url.path.rsplit("/", 1)[-1],
+        "params": params,
+        "headers": dict(headers or {}),
+        "body": decoded,
+    }
+    with server.lock:
+        server.requests.append(request)
+        server.in_flight += 1
+        server.max_in_flight = max(server.max_in_flight, server.in_flight)
+    try:
+        if server.delay:
+            time.sleep(
+                server.delay(request) if callable(server.delay) else server.delay
+            )
+        status, response = server.handler(request)
+    finally:
+        with server.lock:
+            server.in_flight -= 1
+    return status, response if isinstance(response, str) else json.dumps(response)
+
+
+def default_handler(request):
+    """
+    Echoes each batch query back with an empty result list, and returns an
+    empty single result for GET requests.
+    """
+    queries = request["body"]
+    if isinstance(queries, dict):
+        return 200, {"results": {k: empty_result(q) for k, q in queries.items()}}
+    if isinstance(queries, list):
+        return 200, {"results": [empty_result(q) for q in queries]}
+    return 200, {"input": {}, "results": []}
+
+
+class FakeGeocodioServer(object):
+    """
+    Runs a threaded HTTP server on a free local port.
+
+    >>> with FakeGeocodioServer() as server:
+    ...     client = GeocodioClient("key", custom_base_domain=server.url)
+    """
+
+    def __init__(self, handler=default_handler, delay=None):
+        self.httpd = ThreadingHTTPServer(("127.0.0.1", 0), FakeGeocodioHandler)
+        self.httpd.daemon_threads = True
+        self.httpd.handler = handler
+        self.httpd.delay = delay
+        self.httpd.lock = threading.Lock()
+        self.httpd.requests = []
+        self.httpd.in_flight = 0
+        self.httpd.max_in_flight = 0
+        self.httpd.connections = 0
+        self.thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+
+    @property
+    def url(self):
+        return "http://127.0.0.1:{0}".format(self.httpd.server_address[1])
+
+    @property
+    def requests(self):
+        return self.httpd.requests
+
+    @property
+    def max_in_flight(self):
+        return self.httpd.max_in_flight
+
+    @property
+    def connections(self):
+        return self.httpd.connections
+
+    def __enter__(self):
+        self.thread.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.httpd.shutdown()
+        self.httpd.server_close()
@@ -0,0 +1,108 @@
+"""
+test_arrays
+----------------------------------
+
+Tests for `geocodio.arrays` module.
+"""
+
+import unittest
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+from geocodio.arrays import is_points_array, point_strs
+from geocodio.cache import LocationCache
+from geocodio.client import GeocodioClient, point_str
+from tests.server import FakeGeocodioServer
+
+
+@unittest.skipIf(numpy is None, "numpy is not installed")
+class TestPointStrs(unittest.TestCase):
+    def test_matches_point_str(self):
+        points = numpy.array([[40.7128, -74.006], [1.5, 2], [-33.8688, 151.2093]])
+        self.assertEqual(
+            point_strs(points), [point_str(tuple(p.tolist())) for p in points]
+        )
+
+    def test_integer_points(self):
+        self.assertEqual(
+            point_strs(numpy.array([[1, 2], [30, -140]])), ["1.0,2.0", "30.0,-140.0"]
+        )
+
+    def test_precision(self):
+        points = numpy.array([[40.7127753, -74.0059728], [1e-7, -1e-6], [0.1, 10.0]])
+        self.assertEqual(
+            point_strs(points), ["40.712775,-74.005973", "0.0,-0.000001", "0.1,10.0"]
+        )
+        self.assertEqual(point_strs(points[:1], precision=2), ["40.71,-74.01"])
+        self.assertEqual(point_strs(numpy.zeros((0, 2))), [])
+
+    def test_separate_arrays(self):
+        lat = numpy.array([1.0, 3.0])
+        lng = numpy.array([2.0, 4.0])
+        self.assertEqual(point_strs((lat, lng)), ["1.0,2.0", "3.0,4.0"])
+
+    def test_order(self):
+        points = numpy.array([[2.0, 1.0], [4.0, 3.0]])
+        self.assertEqual(point_strs(points, order="lng"), ["1.0,2.0", "3.0,4.0"])
+        self.assertEqual(
+            point_strs((points[:, 0], points[:, 1]), order="lng"),
+            ["1.0,2.0", "3.0,4.0"],
+        )
+
+    def test_invalid(self):
+        self.assertRaises(ValueError, point_strs, numpy.zeros((3, 3)))
+        self.assertRaises(ValueError, point_strs, (numpy.zeros(3), numpy.zeros(2)))
+        self.assertRaises(ValueError, point_strs, numpy.array([[1.0, numpy.nan]]))
+
+    def test_is_points_array(self):
+        self.assertTrue(is_points_array(numpy.zeros((2, 2))))
+        self.assertTrue(is_points_array((numpy.zeros(2), numpy.zeros(2))))
+        self.assertFalse(is_points_array([(1, 2), (3, 4)]))
+        self.assertFalse(is_points_array({"a": (1, 2)}))
+        self.assertFalse(is_points_array((1, 2)))
+        self.assertFalse(is_points_array((numpy.float64(1), numpy.float64(2))))
+        self.assertFalse(is_points_array(numpy.array([1.0, 2.0])))
+
+
+@unittest.skipIf(numpy is None, "numpy is not installed")
+class TestClientArrays(unittest.TestCase):
+    def test_batch_reverse_array(self):
+        points = numpy.array([[40.7128, -74.006], [1.5, 2.0], [3.0, 4.0]])
+        with FakeGeocodioServer() as server:
+            client = GeocodioClient("key", custom_base_domain=server.url)
+            locations = client.reverse(points, chunk_size=2)
+        self.assertEqual(
+            [r["body"] for r in server.requests],
+            [["40.7128,-74.006", "1.5,2.0"], ["3.0,4.0"]],
+        )
+        self.assertEqual(len(locations), 3)
+        self.assertIs(locations[numpy.int64(2)], locations[2])
+        self.assertIs(locations.get((1.5, 2.0)), locations[1])
+
+    def test_batch_reverse_respects_order(self):
+        with FakeGeocodioServer() as server:
+            client = GeocodioClient("key", custom_base_domain=server.url, order="lng")
+            client.batch_reverse((numpy.array([2.0, 4.0]), numpy.array([1.0, 3.0])))
+        self.assertEqual(server.requests[0]["body"], ["1.0,2.0", "3.0,4.0"])
+
+    def test_reverse_scalar_point(self):
+        """Ensure a point of NumPy scalars is a single lookup"""
+        with FakeGeocodioServer() as server:
+            client = GeocodioClient("key", custom_base_domain=server.url)
+            client.reverse((numpy.float64(40.1), numpy.float64(-19.2)))
+            client.reverse(numpy.array([40.1, -19.2]))
+        self.assertEqual([r["method"] for r in server.requests], ["GET", "GET"])
+        self.assertEqual(server.requests[0]["params"]["q"], "40.1,-19.2")
+        self.assertEqual(server.requests[1]["params"]["q"], "40.1,-19.2")
+
+    def test_shares_cache_with_lists(self):
+        with FakeGeocodioServer() as server:
+            client = GeocodioClient(
+                "key", custom_base_domain=server.url, cache=LocationCache()
+            )
+            client.batch_reverse([(1.5, 2.0), (3.0, 4.0)])
+            client.batch_reverse(numpy.array([[1.5, 2.0], [3.0, 4.0], [5.0, 6.0]]))
+        self.assertEqual(server.requests[-1]["body"], ["5.0,6.0"])
@@ -0,0 +1,117 @@
+"""
+test_batching
+----------------------------------
+
+Tests for `geocodio.batching` module.
+"""
+
+import unittest
+
+from geocodio.batching import (
+    MAX_BATCH_SIZE,
+    AdaptiveBatchSizer,
+    ChunkQueue,
+    FixedBatchSizer,
+    get_sizer,
+)
+
+
+class TestFixedBatchSizer(unittest.TestCase):
+    def test_fixed_size(self):
+        sizer = FixedBatchSizer(50)
+        sizer.record(50, 100.0, error=True)
+        self.assertEqual(sizer.next_size(), 50)
+        self.assertEqual(sizer.min_size, 50)
+
+    def test_invalid_size(self):
+        self.assertRaises(ValueError, FixedBatchSizer, 0)
+        self.assertRaises(ValueError, FixedBatchSizer, MAX_BATCH_SIZE + 1)
+
+
+class TestAdaptiveBatchSizer(unittest.TestCase):
+    def test_grows_when_fast(self):
+        sizer = AdaptiveBatchSizer(target_latency=1.0, initial_size=100)
+        sizer.record(100, 0.01)
+        # Growth is capped at doubling per request
+        self.assertEqual(sizer.next_size(), 200)
+        for _ in range(20):
+            sizer.record(sizer.next_size(), 0.01)
+        self.assertEqual(sizer.next_size(), MAX_BATCH_SIZE)
+
+    def test_shrinks_when_slow(self):
+        sizer = AdaptiveBatchSizer(target_latency=1.0, initial_size=100)
+        sizer.record(100, 4.0)
+        self.assertEqual(sizer.next_size(), 25)
+
+    def test_halves_on_error(self):
+        sizer = AdaptiveBatchSizer(initial_size=100, min_size=10)
+        sizer.record(100, 30.0, error=True)
+        self.assertEqual(sizer.next_size(), 50)
+        sizer.record(15, 30.0, error=True)
+        self.assertEqual(sizer.next_size(), 10)
+        self.assertEqual(sizer.error_rate, 1.0)
+
+    def test_max_bytes(self):
+        sizer = AdaptiveBatchSizer(
+            target_latency=10.0, initial_size=100, max_bytes=10000
+        )
+        sizer.record(100, 0.1, nbytes=100000)
+        self.assertEqual(sizer.next_size(), 10)
+
+    def test_invalid_sizes(self):
+        self.assertRaises(ValueError, AdaptiveBatchSizer, min_size=0)
+        self.assertRaises(ValueError, AdaptiveBatchSizer, min_size=10, max_size=5)
+        self.assertRaises(ValueError, AdaptiveBatchSizer, smoothing=0)
+
+
+class TestChunkQueue(unittest.TestCase):
+    def test_chunks_and_retries(self):
+        chunks = ChunkQueue(list("abcdefg"), FixedBatchSizer(3))
+        self.assertEqual(chunks.pop(), (0, list("abc")))
+        self.assertEqual(chunks.pop(), (3, list("def")))
+        chunks.sizer = FixedBatchSizer(2)
+        chunks.retry(0, list("abc"))
+        self.assertEqual(chunks.pop(), (0, list("ab")))
+        self.assertEqual(chunks.pop(), (2, list("c")))
+        self.assertEqual(chunks.pop(), (6, list("g")))
+        self.assertFalse(chunks)
+
+    def test_requeue(self):
+        chunks = ChunkQueue(list("abcde"), FixedBatchSizer(2))
+        chunks.pop()
+        chunks.sizer = FixedBatchSizer(1)
+        chunks.requeue(0, list("ab"))
+        self.assertEqual(chunks.pop(), (0, list("ab")))
+        self.assertEqual(chunks.rate_limited, {0: 1})
+
+    def test_keyed(self):
+        chunks = ChunkQueue({"a": 1, "b": 2}, FixedBatchSizer(5))
+        start, chunk = chunks.pop()
+        self.assertEqual(chunks.payload(chunk), {"a": 1, "b": 2})
+        self.assertFalse(chunks)
+
+    def test_results(self):
+        chunks = ChunkQueue(list("abcde"), FixedBatchSizer(2))
+        chunks.results[2] = ["C", "D"]
+        self.assertEqual(chunks.partial(), {2: "C", 3: "D"})
+        chunks.results[0] = ["A", "B"]
+        self.assertEqual(chunks.combined(), ["A", "B", "C", "D"])
+
+        chunks = ChunkQueue({"x": 1, "y": 2}, FixedBatchSizer(1))
+        chunks.results[1] = {"y": "Y"}
+        chunks.results[0] = {"x": "X"}
+        self.assertEqual(chunks.partial(), {"x": "X", "y": "Y"})
+        self.assertEqual(list(chunks.combined()), ["x", "y"])
+
+
+class TestGetSizer(unittest.TestCase):
+    def test_get_sizer(self):
+        self.assertIsInstance(get_sizer(10), FixedBatchSizer)
+        self.assertIsInstance(get_sizer("adaptive"), AdaptiveBatchSizer)
+        sizer = AdaptiveBatchSizer(initial_size=5)
+        self.assertIs(get_sizer(sizer), sizer)
+        self.assertIsNone(get_sizer(None))
+
+    def test_invalid_chunk_size(self):
+        for chunk_size in (True, False, 0, -5, "fixed", "100", 2.5, object()):
+            self.assertRaises(ValueError, get_sizer, chunk_size)
@@ -0,0 +1,82 @@
+"""
+test_breaker
+----------------------------------
+
+Tests for `geocodio.breaker` module.
+"""
+
+import time
+import unittest
+
+from geocodio import exceptions
+from geocodio.breaker import CLOSED, HALF_OPEN, OPEN, CircuitBreaker
+
+
+def fail(breaker, times=1):
+    for _ in range(times):
+        breaker.allow()
+        breaker.record(failure=True)
+
+
+def succeed(breaker, times=1):
+    for _ in range(times):
+        breaker.allow()
+        breaker.record()
+
+
+class TestCircuitBreaker(unittest.TestCase):
+    def test_opens_on_consecutive_failures(self):
+        breaker = CircuitBreaker(failure_threshold=3)
+        fail(breaker, 2)
+        succeed(breaker)
+        fail(breaker, 2)
+        self.assertEqual(breaker.state, CLOSED)
+        fail(breaker)
+        self.assertEqual(breaker.state, OPEN)
+        self.assertRaises(exceptions.GeocodioCircuitOpenError, breaker.allow)
+        self.assertEqual(breaker.metrics()["rejected"], 1)
+
+    def test_opens_on_failure_rate(self):
+        breaker = CircuitBreaker(
+            failure_threshold=100, failure_rate=0.5, min_requests=4
+        )
+        succeed(breaker)
+        fail(breaker)
+        succeed(breaker)
+        self.assertEqual(breaker.state, CLOSED)
+        fail(breaker)
+        self.assertEqual(breaker.state, OPEN)
+
+    def test_half_open_recovery(self):
+        breaker = CircuitBreaker(failure_threshold=1, reset_timeout=0.01)
+        fail(breaker)
+        time.sleep(0.02)
+        breaker.allow()
+        self.assertEqual(breaker.state, HALF_OPEN)
+        # Only one trial request at a time
+        self.assertRaises(exceptions.GeocodioCircuitOpenError, breaker.allow)
+        breaker.record()
+        self.assertEqual(breaker.state, CLOSED)
+        self.assertEqual(
+            [(old, new) for _, old, new in breaker.history],
+            [(CLOSED, OPEN), (OPEN, HALF_OPEN), (HALF_OPEN, CLOSED)],
+        )
+
+    def test_half_open_failure_reopens(self):
+        breaker = CircuitBreaker(failure_threshold=1, reset_timeout=0.01)
+        fail(breaker)
+        time.sleep(0.02)
+        fail(breaker)
+        self.assertEqual(breaker.state, OPEN)
+        self.assertRaises(exceptions.GeocodioCircuitOpenError, breaker.allow)
+
+    def test_neutral_outcomes(self):
+        breaker = CircuitBreaker(failure_threshold=1, reset_timeout=0.01)
+        fail(breaker)
+        time.sleep(0.02)
+        breaker.allow()
+        breaker.record(neutral=True)
+        self.assertEqual(breaker.state, HALF_OPEN)
+        breaker.allow()
+        breaker.record()
+        self.assertEqual(breaker.state, CLOSED)
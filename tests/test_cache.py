@@ -0,0 +1,179 @@
+"""
+test_cache
+----------------------------------
+
+Tests for `geocodio.cache` module.
+"""
+
+import time
+import unittest
+
+from geocodio.cache import (
+    LocationCache,
+    MemoryCache,
+    field_path,
+    merge_fields,
+    query_key,
+)
+
+
+def response_with_fields(fields):
+    return {
+        "input": {"formatted_address": "1109 N Highland St, Arlington VA"},
+        "results": [
+            {
+                "formatted_address": "1109 N Highland St, Arlington, VA 22201",
+                "location": {"lat": 38.886672, "lng": -77.094735},
+                "accuracy": 1,
+                "fields": fields,
+            }
+        ],
+    }
+
+
+CD = {"congressional_districts": [{"name": "Congressional District 8"}]}
+TIMEZONE = {"timezone": {"name": "America/New_York"}}
+CENSUS = {"census": {"2020": {"tract_code": "101801"}}}
+
+
+class TestHelpers(unittest.TestCase):
+    def test_field_path(self):
+        self.assertEqual(field_path("cd"), ("congressional_districts",))
+        self.assertEqual(field_path("cd119"), ("congressional_districts",))
+        self.assertEqual(field_path("census2010"), ("census", "2010"))
+        self.assertEqual(field_path("acs-families"), ("acs", "families"))
+        self.assertIsNone(field_path("provriding"))
+
+    def test_merge_fields(self):
+        target = {"census": {"2010": 1}, "timezone": 2}
+        merge_fields(target, {"census": {"2020": 3}, "cd": 4})
+        self.assertEqual(
+            target, {"census": {"2010": 1, "2020": 3}, "timezone": 2, "cd": 4}
+        )
+
+    def test_query_key(self):
+        self.assertEqual(
+            query_key({"city": "Arlington", "state": "VA"}),
+            query_key({"state": "VA", "city": "Arlington"}),
+        )
+        self.assertEqual(query_key("1,2"), "1,2")
+
+
+class TestMemoryCache(unittest.TestCase):
+    def test_get_set(self):
+        cache = MemoryCache()
+        cache.set_many({"a": "1", "b": "2"})
+        self.assertEqual(cache.get_many(["a", "b", "c"]), {"a": "1", "b": "2"})
+        self.assertEqual(cache.get("c", "default"), "default")
+
+    def test_maxsize(self):
+        cache = MemoryCache(maxsize=2)
+        cache.set("a", "1")
+        cache.set("b", "2")
+        cache.get("a")
+        cache.set("c", "3")
+        self.assertEqual(sorted(cache.get_many(["a", "b", "c"])), ["a", "c"])
+
+    def test_ttl(self):
+        cache = MemoryCache(ttl=0.01)
+        cache.set("a", "1")
+        cache.set("b", "2", ttl=10)
+        time.sleep(0.02)
+        self.assertEqual(cache.get_many(["a", "b"]), {"b": "2"})
+        self.assertEqual(len(cache), 1)
+
+
+class TestLocationCache(unittest.TestCase):
+    def setUp(self):
+        self.cache = LocationCache()
+
+    def test_miss(self):
+        self.assertEqual(self.cache.lookup("geocode", "a", ["cd"]), (None, ["cd"]))
+
+    def test_superset(self):
+        """A response cached with several fields answers a subset of them"""
+        fields = dict(CD, **TIMEZONE)
+        self.cache.store(
+            "geocode", "a", ["cd", "timezone"], response_with_fields(fields)
+        )
+        response, missing = self.cache.lookup("geocode", "a", ["cd"])
+        self.assertEqual(missing, [])
+        self.assertEqual(response, response_with_fields(CD))
+
+        response, missing = self.cache.lookup("geocode", "a", [])
+        self.assertNotIn("fields", response["results"][0])
+
+    def test_partial(self):
+        self.cache.store("geocode", "a", ["cd"], response_with_fields(CD))
+        response, missing = self.cache.lookup("geocode", "a", ["cd", "census2020"])
+        self.assertEqual(missing, ["census2020"])
+        self.assertEqual(response["results"][0]["fields"], CD)
+
+        self.cache.store("geocode", "a", ["census2020"], response_with_fields(CENSUS))
+        response, missing = self.cache.lookup("geocode", "a", ["census2020", "cd"])
+        self.assertEqual(missing, [])
+        self.assertEqual(response["results"][0]["fields"], dict(CD, **CENSUS))
+
+    def test_single_unknown_field(self):
+        riding = {"riding": {"code": "35075"}}
+        self.cache.store(
+            "geocode", "a", ["cd", "riding"], response_with_fields(dict(CD, **riding))
+        )
+        response, missing = self.cache.lookup("geocode", "a", ["riding"])
+        self.assertEqual(missing, [])
+        self.assertEqual(response["results"][0]["fields"], riding)
+
+    def test_several_unknown_fields(self):
+        self.cache.store("geocode", "a", ["x", "y"], response_with_fields({"x": 1}))
+        self.assertEqual(self.cache.lookup("geocode", "a", ["x"])[1], ["x"])
+
+    def test_limit_and_verb_keys(self):
+        self.cache.store("geocode", "a", [], response_with_fields({}), limit=1)
+        self.assertIsNone(self.cache.lookup("geocode", "a", [])[0])
+        self.assertIsNone(self.cache.lookup("reverse", "a", [], limit=1)[0])
+        self.assertIsNotNone(self.cache.lookup("geocode", "a", [], limit=1)[0])
+
+    def test_errors_not_cached(self):
+        self.cache.store("geocode", "a", [], {"error": "Could not parse address"})
+        self.assertEqual(len(self.cache.backend), 0)
+
+
+class TestNegativeCaching(unittest.TestCase):
+    def setUp(self):
+        self.cache = LocationCache(ttl=10, negative_ttl=0.05)
+
+    def test_error(self):
+        self.cache.store(
+            "geocode", "a", ["cd"], {"error": "Could not parse address", "x": 1}
+        )
+        self.assertEqual(
+            self.cache.lookup("geocode", "a", ["cd", "timezone"]),
+            ({"error": "Could not parse address"}, []),
+        )
+
+    def test_empty_results_expire_first(self):
+        self.cache.store_many(
+            "geocode",
+            ["a", "b"],
+            ["cd"],
+            [{"input": {}, "results": []}, response_with_fields(CD)],
+        )
+        self.assertEqual(
+            self.cache.lookup("geocode", "a", ["cd"]),
+            ({"input": {}, "results": []}, []),
+        )
+        time.sleep(0.06)
+        self.assertEqual(self.cache.lookup("geocode", "a", ["cd"]), (None, ["cd"]))
+        self.assertEqual(self.cache.lookup("geocode", "b", ["cd"])[1], [])
+
+    def test_store_error(self):
+        self.cache.store_error("reverse", "1.0,2.0", "Invalid coordinates")
+        response, _ = self.cache.lookup("reverse", "1.0,2.0", [])
+        self.assertEqual(response, {"error": "Invalid coordinates"})
+        LocationCache().store_error("reverse", "1.0,2.0", "Invalid coordinates")
+
+    def test_entry_ttl(self):
+        self.assertEqual(self.cache.entry_ttl('{"error": "x"}'), 0.05)
+        self.assertEqual(self.cache.entry_ttl('{"input": {}, "results": []}'), 0.05)
+        self.assertEqual(self.cache.entry_ttl('[{"cd": []}]'), 10)
+        self.assertEqual(LocationCache(ttl=10).entry_ttl('{"error": "x"}'), 10)
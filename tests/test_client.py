@@ -5,17 +5,35 @@ test_geocodio
 Tests for `geocodio.client` module.
 """
 
+import itertools
+import json
 import os
+import subprocess
+import sys
 from threading import Event
 import time
 import unittest
+from unittest import mock
 
 import httpretty
 import requests
 
 from geocodio import exceptions
+from geocodio.batching import AdaptiveBatchSizer
+from geocodio.breaker import CircuitBreaker
+from geocodio.cache import LocationCache
+from geocodio.concurrency import AIMDLimiter
+from geocodio import client as client_module
 from geocodio.client import GeocodioClient, DEFAULT_API_VERSION, json_points
-from geocodio.data import Location, LocationCollection, LocationCollectionDict
+from geocodio.hedging import Hedger
+from geocodio.usage import UsageMeter
+from geocodio.data import (
+    Location,
+    LocationCollection,
+    LocationCollectionDict,
+    LocationView,
+)
+from tests.server import FakeGeocodioServer, default_handler
 
 
 class ClientFixtures(object):
@@ -36,6 +54,16 @@ class ClientFixtures(object):
             self.TEST_API_KEY, auto_load_api_version=False, timeout=0.2
         )
         self.err = '{"error": "We are testing"}'
+        self.calls = []
+
+    def counted(self, callback):
+        """Wraps an httpretty callback to record each request in `calls`"""
+
+        def counting_callback(request, url, headers):
+            self.calls.append(request)
+            return callback(request, url, headers)
+
+        return counting_callback
 
 
 class TestClientInit(unittest.TestCase):
@@ -75,8 +103,21 @@ class TestClientInit(unittest.TestCase):
         self.assertEqual(client.version, DEFAULT_API_VERSION)
 
 
+class TestLazyImport(unittest.TestCase):
+    def test_import_does_not_load_requests(self):
+        """Ensure importing the package and creating a client stays cheap"""
+        code = (
+            "import sys, geocodio; "
+            "geocodio.GeocodioClient('key', auto_load_api_version=True); "
+            "print('requests' in sys.modules, 'geocodio.lists' in sys.modules)"
+        )
+        output = subprocess.check_output([sys.executable, "-c", code])
+        self.assertEqual(output.strip(), b"False False")
+
+
 class TestClientInitAutoLoadApiVersion(unittest.TestCase):
     def setUp(self):
+        client_module._api_versions.clear()
         self.TEST_API_KEY = "1010110101"
         self.base_domain = "https://api.geocod.io"
         self.base_hipaa_domain = "https://api-hipaa.geocod.io"
@@ -151,6 +192,22 @@ class TestClientInitAutoLoadApiVersion(unittest.TestCase):
         )
         self.assertEqual(len(httpretty.latest_requests()), 0)
 
+    @httpretty.activate
+    def test_auto_load_deferred_and_memoized(self):
+        """Ensure the version is loaded on first use, once per domain"""
+        httpretty.register_uri(
+            httpretty.GET, self.base_domain, body=self.api_description, status=200
+        )
+        client = GeocodioClient(self.TEST_API_KEY, auto_load_api_version=True)
+        self.assertEqual(len(httpretty.latest_requests()), 0)
+        self.assertEqual(client.version, "1.6")
+        requests_made = len(httpretty.latest_requests())
+        self.assertGreater(requests_made, 0)
+
+        other_client = GeocodioClient(self.TEST_API_KEY, auto_load_api_version=True)
+        self.assertTrue(other_client.BASE_URL.startswith(self.base_domain + "/v1.6"))
+        self.assertEqual(len(httpretty.latest_requests()), requests_made)
+
     @httpretty.activate
     def test_skip_auto_load_if_disabled(self):
         httpretty.register_uri(
@@ -503,3 +560,725 @@ class TestClientMethods(ClientFixtures, unittest.TestCase):
 
         # Sanity check it works only for lists and dicts
         self.assertEqual(json_points((35.9746000, -77.9658000)), None)
+
+    @httpretty.activate
+    def test_single_view(self):
+        """Ensure a client configured for views returns LocationView results"""
+        httpretty.register_uri(
+            httpretty.GET, self.geocode_url, body=self.single_address, status=200
+        )
+        client = GeocodioClient(self.TEST_API_KEY, views=True)
+        location = client.geocode("1109 N Highland St, Arlington VA")
+        self.assertIsInstance(location, LocationView)
+        self.assertEqual(location.coords, (37.554895702703, -77.457561054054))
+
+    @httpretty.activate
+    def test_batch_views(self):
+        httpretty.register_uri(
+            httpretty.POST, self.geocode_url, body=self.batch_addresses, status=200
+        )
+        client = GeocodioClient(self.TEST_API_KEY, views=True)
+        locations = client.geocode(["a", "b"])
+        self.assertIsInstance(locations[0], LocationView)
+
+
+def echo_batch_callback(request, url, headers):
+    """Returns a batch response with one empty result per query"""
+    queries = json.loads(request.body)
+    if isinstance(queries, dict):
+        results = {
+            k: {"query": v, "response": {"results": []}} for k, v in queries.items()
+        }
+    else:
+        results = [{"query": q, "response": {"results": []}} for q in queries]
+    return 200, headers, json.dumps({"results": results})
+
+
+class TestClientChunking(ClientFixtures, unittest.TestCase):
+    @httpretty.activate
+    def test_fixed_chunks(self):
+        """Ensure a batch is split into fixed size requests and recombined"""
+        httpretty.register_uri(
+            httpretty.POST, self.geocode_url, body=self.counted(echo_batch_callback)
+        )
+        addresses = ["address {0}".format(i) for i in range(7)]
+        locations = self.client.batch_geocode(addresses, chunk_size=3)
+        self.assertEqual([len(json.loads(c.body)) for c in self.calls], [3, 3, 1])
+        self.assertIsInstance(locations, LocationCollection)
+        self.assertEqual(len(locations), 7)
+        self.assertIsNotNone(locations.get("address 6"))
+
+    @httpretty.activate
+    def test_keyed_chunks(self):
+        """Ensure keyed batches keep their keys across chunks"""
+        httpretty.register_uri(
+            httpretty.POST, self.reverse_url, body=self.counted(echo_batch_callback)
+        )
+        points = {"a": (1, 2), "b": (3, 4), "c": (5, 6)}
+        locations = self.client.batch_reverse(points, chunk_size=2)
+        self.assertEqual(len(self.calls), 2)
+        self.assertIsInstance(locations, LocationCollectionDict)
+        self.assertEqual(sorted(locations.keys()), ["a", "b", "c"])
+
+    @httpretty.activate
+    def test_adaptive_chunks_retry_server_errors(self):
+        """Ensure adaptive chunks shrink and retry after a server error"""
+        calls = []
+
+        def callback(request, url, headers):
+            calls.append(len(json.loads(request.body)))
+            if len(calls) == 1:
+                return 500, headers, "Server error"
+            return echo_batch_callback(request, url, headers)
+
+        httpretty.register_uri(httpretty.POST, self.geocode_url, body=callback)
+        sizer = AdaptiveBatchSizer(initial_size=8, min_size=2)
+        locations = self.client.batch_geocode(
+            ["address {0}".format(i) for i in range(8)], chunk_size=sizer
+        )
+        self.assertEqual(len(locations), 8)
+        self.assertEqual(calls[:2], [8, 4])
+        self.assertEqual(sizer.errors, 1)
+
+    @httpretty.activate
+    def test_failing_minimum_chunk_raises(self):
+        """Ensure a chunk at the minimum size is not retried"""
+        httpretty.register_uri(
+            httpretty.POST,
+            self.geocode_url,
+            body=self.counted(lambda r, u, h: (500, h, "Server error")),
+        )
+        self.assertRaises(
+            exceptions.GeocodioServerError,
+            self.client.batch_geocode,
+            ["a", "b"],
+            chunk_size=2,
+        )
+        self.assertEqual(len(self.calls), 1)
+
+
+class TestClientConcurrency(ClientFixtures, unittest.TestCase):
+    @httpretty.activate
+    def test_limiter_tracks_responses(self):
+        """Ensure rate limited responses cut the concurrency limit"""
+        limiter = AIMDLimiter(initial_limit=4)
+        client = GeocodioClient(self.TEST_API_KEY, concurrency=limiter)
+        httpretty.register_uri(
+            httpretty.GET, self.parse_url, body="Slow down", status=429
+        )
+        self.assertRaises(exceptions.GeocodioRateLimitError, client.parse, "")
+        self.assertEqual(limiter.limit, 2)
+        self.assertEqual(limiter.in_flight, 0)
+
+    def test_parallel_chunks(self):
+        """Ensure chunks sent in parallel are recombined in input order"""
+        limiter = AIMDLimiter(initial_limit=3, max_limit=3)
+        addresses = ["address {0}".format(i) for i in range(20)]
+        with FakeGeocodioServer(delay=0.02) as server:
+            client = GeocodioClient(
+                self.TEST_API_KEY, custom_base_domain=server.url, concurrency=limiter
+            )
+            locations = client.batch_geocode(addresses, chunk_size=2)
+        self.assertEqual(len(server.requests), 10)
+        self.assertEqual(server.max_in_flight, 3)
+        self.assertEqual(list(locations.lookups), addresses)
+        self.assertEqual(limiter.in_flight, 0)
+
+    def test_rate_limited_chunk(self):
+        """Ensure a rate limited chunk is retried whole and the batch completes"""
+        limiter = AIMDLimiter(initial_limit=2, max_limit=2)
+        addresses = ["address {0}".format(i) for i in range(20)]
+
+        def handler(request):
+            if request["body"] == addresses[4:6] and not handler.limited:
+                handler.limited = True
+                return 429, "Slow down"
+            return default_handler(request)
+
+        handler.limited = False
+        with FakeGeocodioServer(handler=handler) as server:
+            client = GeocodioClient(
+                self.TEST_API_KEY, custom_base_domain=server.url, concurrency=limiter
+            )
+            locations = client.batch_geocode(addresses, chunk_size=2)
+        self.assertEqual(len(server.requests), 11)
+        self.assertEqual(list(locations.lookups), addresses)
+        self.assertIn("decrease", [reason for _, _, reason in limiter.history])
+
+    def test_rate_limited_chunk_gives_up(self):
+        """Ensure a chunk which stays rate limited fails the batch"""
+        with FakeGeocodioServer(handler=lambda request: (429, "")) as server:
+            client = GeocodioClient(self.TEST_API_KEY, custom_base_domain=server.url)
+            with mock.patch.object(client_module, "RATE_LIMIT_BACKOFF", 0):
+                self.assertRaises(
+                    exceptions.GeocodioRateLimitError,
+                    client.batch_geocode,
+                    ["a", "b", "c"],
+                    chunk_size=2,
+                )
+        self.assertEqual(len(server.requests), client_module.RATE_LIMIT_RETRIES + 1)
+
+
+class TestClientHedging(ClientFixtures, unittest.TestCase):
+    def test_slow_lookup_is_hedged(self):
+        """Ensure a slow single lookup is answered by the hedged request"""
+        calls = []
+
+        def delay(request):
+            calls.append(request)
+            return 1.0 if len(calls) == 1 else 0
+
+        hedger = Hedger(delay=0.05, max_ratio=1)
+        with FakeGeocodioServer(delay=delay) as server:
+            client = GeocodioClient(
+                self.TEST_API_KEY, custom_base_domain=server.url, hedging=hedger
+            )
+            started = time.time()
+            location = client.geocode_address("1600 Pennsylvania Ave")
+            elapsed = time.time() - started
+        self.assertIsInstance(location, Location)
+        self.assertLess(elapsed, 0.9)
+        self.assertEqual(len(server.requests), 2)
+        self.assertEqual(hedger.hedge_wins, 1)
+
+    @httpretty.activate
+    def test_hedged_errors(self):
+        """Ensure error responses are mapped as for unhedged lookups"""
+        client = GeocodioClient(self.TEST_API_KEY, hedging=Hedger(delay=1))
+        httpretty.register_uri(httpretty.GET, self.parse_url, body=self.err, status=422)
+        self.assertRaises(exceptions.GeocodioDataError, client.parse, "")
+
+
+def fields_callback(request, url, headers):
+    """Returns a single result with one value per requested field"""
+    fields = [f for f in request.querystring.get("fields", [""])[0].split(",") if f]
+    result = {
+        "location": {"lat": 1.0, "lng": 2.0},
+        "accuracy": 1,
+        "fields": {"field_{0}".format(f): f for f in fields},
+    }
+    return 200, headers, json.dumps({"input": {}, "results": [result]})
+
+
+class TestClientCache(ClientFixtures, unittest.TestCase):
+    def setUp(self):
+        super(TestClientCache, self).setUp()
+        self.client = GeocodioClient(
+            self.TEST_API_KEY, auto_load_api_version=False, cache=LocationCache()
+        )
+
+    def requested_fields(self):
+        return [r.querystring.get("fields", [""])[0] for r in self.calls]
+
+    @httpretty.activate
+    def test_single_fields_reuse(self):
+        """Ensure cached fields are reused and only missing fields fetched"""
+        httpretty.register_uri(
+            httpretty.GET, self.geocode_url, body=self.counted(fields_callback)
+        )
+        self.client.geocode_address("a", fields=["x"])
+        location = self.client.geocode_address("a", fields=["x"])
+        self.assertEqual(len(self.calls), 1)
+        self.assertEqual(location.coords, (1.0, 2.0))
+
+        location = self.client.geocode_address("a", fields=["y", "x"])
+        self.assertEqual(self.requested_fields(), ["x", "y"])
+        self.assertEqual(
+            location["results"][0]["fields"], {"field_x": "x", "field_y": "y"}
+        )
+
+    @httpretty.activate
+    def test_reverse_point_cache(self):
+        httpretty.register_uri(
+            httpretty.GET, self.reverse_url, body=self.counted(fields_callback)
+        )
+        self.client.reverse((1, 2))
+        self.assertIsInstance(self.client.reverse_point(1, 2), Location)
+        self.assertEqual(len(self.calls), 1)
+
+    @httpretty.activate
+    def test_batch_cache(self):
+        """Ensure a batch only requests the queries and fields not cached"""
+        httpretty.register_uri(
+            httpretty.GET, self.geocode_url, body=self.counted(fields_callback)
+        )
+        httpretty.register_uri(
+            httpretty.POST, self.geocode_url, body=self.counted(echo_batch_callback)
+        )
+        self.client.geocode_address("a", fields=["x"])
+        locations = self.client.batch_geocode({"1": "a", "2": "b"}, fields=["x"])
+        self.assertEqual(json.loads(self.calls[-1].body), ["b"])
+        self.assertIsInstance(locations, LocationCollectionDict)
+        self.assertEqual(locations["1"].coords, (1.0, 2.0))
+        self.assertEqual(locations.get("b"), locations["2"])
+
+        self.client.batch_geocode(["b", "a"], fields=["x"])
+        self.assertEqual(len(self.calls), 2)
+
+    @httpretty.activate
+    def test_single_negative_cache(self):
+        """Ensure failed and empty lookups are answered from the cache"""
+        client = GeocodioClient(
+            self.TEST_API_KEY,
+            auto_load_api_version=False,
+            cache=LocationCache(negative_ttl=60),
+        )
+
+        def callback(request, url, headers):
+            self.calls.append(request)
+            if request.querystring["q"] == ["bad"]:
+                return 422, headers, self.err
+            return 200, headers, json.dumps({"input": {}, "results": []})
+
+        httpretty.register_uri(httpretty.GET, self.geocode_url, body=callback)
+        for _ in range(2):
+            with self.assertRaises(exceptions.GeocodioDataError) as context:
+                client.geocode_address("bad", fields=["x"])
+            self.assertEqual(str(context.exception), "We are testing")
+            location = client.geocode_address("empty", fields=["x"])
+            self.assertEqual(location.best_match, {})
+            self.assertIsNone(location.coords)
+        self.assertEqual(len(self.calls), 2)
+
+        # Without a negative TTL failures are looked up again
+        for _ in range(2):
+            self.client.geocode_address("empty")
+            self.assertRaises(exceptions.GeocodioDataError, self.client.geocode, "bad")
+        self.assertEqual(len(self.calls), 5)
+
+    @httpretty.activate
+    def test_batch_negative_cache(self):
+        client = GeocodioClient(
+            self.TEST_API_KEY,
+            auto_load_api_version=False,
+            cache=LocationCache(negative_ttl=60),
+        )
+
+        def callback(request, url, headers):
+            self.calls.append(request)
+            results = [
+                {"query": q, "response": {"error": "Could not geocode " + q}}
+                for q in json.loads(request.body)
+            ]
+            return 200, headers, json.dumps({"results": results})
+
+        httpretty.register_uri(httpretty.POST, self.geocode_url, body=callback)
+        client.batch_geocode(["a", "b"])
+        locations = client.batch_geocode(["b", "a"], fields=["x"])
+        self.assertEqual(len(self.calls), 1)
+        self.assertEqual(locations[0]["error"], "Could not geocode b")
+        self.assertIsNone(locations[1].coords)
+        self.assertRaises(exceptions.GeocodioDataError, client.geocode_address, "a")
+        self.assertEqual(len(self.calls), 1)
+
+
+class TestClientNormalize(ClientFixtures, unittest.TestCase):
+    def setUp(self):
+        super(TestClientNormalize, self).setUp()
+        self.client = GeocodioClient(
+            self.TEST_API_KEY, auto_load_api_version=False, normalize=True
+        )
+
+    @httpretty.activate
+    def test_single_normalized(self):
+        httpretty.register_uri(
+            httpretty.GET, self.geocode_url, body=self.counted(fields_callback)
+        )
+        self.client.geocode_address("123 Main Street.")
+        self.assertEqual(self.calls[0].querystring["q"], ["123 MAIN ST"])
+
+    @httpretty.activate
+    def test_batch_dedupe(self):
+        """Ensure variants are geocoded once and found by their original input"""
+        httpretty.register_uri(
+            httpretty.POST, self.geocode_url, body=self.counted(echo_batch_callback)
+        )
+        addresses = ["123 Main St.", "123 MAIN STREET", "9 Oak Ln"]
+        locations = self.client.batch_geocode(addresses)
+        self.assertEqual(json.loads(self.calls[0].body), ["123 MAIN ST", "9 OAK LN"])
+        self.assertEqual(len(locations), 3)
+        self.assertIsNotNone(locations.get("123 MAIN STREET"))
+        self.assertIsNotNone(locations.get("9 Oak Ln"))
+
+        keyed = self.client.batch_geocode({"a": "1 Elm St", "b": "1 elm street"})
+        self.assertEqual(json.loads(self.calls[1].body), ["1 ELM ST"])
+        self.assertEqual(sorted(keyed), ["a", "b"])
+        self.assertIn("1 elm street", keyed)
+
+
+class TestClientLocalParse(ClientFixtures, unittest.TestCase):
+    @httpretty.activate
+    def test_local_parse(self):
+        """Ensure well formed addresses are parsed without a request"""
+        httpretty.register_uri(httpretty.GET, self.parse_url, body="{}", status=500)
+        address = self.client.parse("1600 Pennsylvania Ave, Washington, DC", local=True)
+        self.assertEqual(address.source, "local")
+        self.assertEqual(address["address_components"]["city"], "Washington")
+
+    @httpretty.activate
+    def test_low_confidence_falls_back(self):
+        httpretty.register_uri(
+            httpretty.GET,
+            self.parse_url,
+            body=json.dumps({"address_components": {}, "formatted_address": ""}),
+        )
+        address = self.client.parse("350 Broadway New York NY", local=True)
+        self.assertEqual(address.source, "api")
+        self.assertEqual(
+            httpretty.last_request().querystring["q"], ["350 Broadway New York NY"]
+        )
+
+
+def parse_handler(request):
+    query = request["params"]["q"]
+    if query == "bad":
+        return 422, {"error": "Could not parse address"}
+    if query == "garbled":
+        return 200, "<html>Not JSON</html>"
+    if query == "unexplained":
+        return 422, {"message": "No error key"}
+    return 200, {"address_components": {}, "formatted_address": query.upper()}
+
+
+class TestClientParseMany(ClientFixtures, unittest.TestCase):
+    def test_parse_many_list(self):
+        """Ensure results keep input order and errors are captured per item"""
+        addresses = ["address {0}".format(i) for i in range(12)] + ["bad"]
+        with FakeGeocodioServer(handler=parse_handler, delay=0.02) as server:
+            client = GeocodioClient(self.TEST_API_KEY, custom_base_domain=server.url)
+            parsed = client.parse_many(addresses, max_workers=4)
+        self.assertEqual(server.max_in_flight, 4)
+        self.assertEqual(parsed.formatted_addresses[:2], ["ADDRESS 0", "ADDRESS 1"])
+        self.assertEqual(parsed.get("address 11").formatted_address, "ADDRESS 11")
+        self.assertEqual(list(parsed.errors), [12])
+        self.assertIsInstance(parsed[12], exceptions.GeocodioDataError)
+
+    def test_parse_many_async_dict(self):
+        import asyncio
+
+        with FakeGeocodioServer(handler=parse_handler) as server:
+            client = GeocodioClient(self.TEST_API_KEY, custom_base_domain=server.url)
+            parsed = asyncio.run(
+                client.parse_many_async({"a": "first", "b": "bad"}, max_workers=2)
+            )
+        self.assertEqual(parsed["a"].formatted_address, "FIRST")
+        self.assertEqual(parsed.get("first"), parsed["a"])
+        self.assertEqual(list(parsed.errors), ["b"])
+        self.assertEqual(parsed.formatted_addresses, {"a": "FIRST", "b": None})
+
+    def test_malformed_responses_captured(self):
+        """Ensure undecodable responses are recorded for their item only"""
+        with FakeGeocodioServer(handler=parse_handler) as server:
+            client = GeocodioClient(self.TEST_API_KEY, custom_base_domain=server.url)
+            parsed = client.parse_many(["first", "garbled", "unexplained"])
+        self.assertEqual(parsed[0].formatted_address, "FIRST")
+        self.assertEqual(list(parsed.errors), [1, 2])
+        self.assertIsInstance(parsed[1], ValueError)
+        self.assertIsInstance(parsed[2], KeyError)
+
+
+class TestClientCircuitBreaker(ClientFixtures, unittest.TestCase):
+    @httpretty.activate
+    def test_fails_fast_when_open(self):
+        """Ensure server errors open the breaker and later calls fail fast"""
+        breaker = CircuitBreaker(failure_threshold=2, reset_timeout=60)
+        client = GeocodioClient(self.TEST_API_KEY, breaker=breaker)
+        httpretty.register_uri(
+            httpretty.GET, self.geocode_url, body="Server error", status=500
+        )
+        for _ in range(2):
+            self.assertRaises(exceptions.GeocodioServerError, client.geocode, "a")
+        self.assertRaises(exceptions.GeocodioCircuitOpenError, client.geocode, "a")
+        self.assertEqual(breaker.metrics()["state"], "open")
+
+    @httpretty.activate
+    def test_client_errors_do_not_open(self):
+        breaker = CircuitBreaker(failure_threshold=1)
+        client = GeocodioClient(self.TEST_API_KEY, breaker=breaker)
+        httpretty.register_uri(
+            httpretty.GET, self.geocode_url, body=self.err, status=422
+        )
+        self.assertRaises(exceptions.GeocodioDataError, client.geocode, "a")
+        self.assertEqual(breaker.state, "closed")
+
+    @httpretty.activate
+    def test_budget_error_releases_trial(self):
+        """Ensure a half open trial stopped by the budget is given back"""
+        breaker = CircuitBreaker(failure_threshold=1, reset_timeout=0.05)
+        meter = UsageMeter(budget=1)
+        client = GeocodioClient(self.TEST_API_KEY, breaker=breaker, usage=meter)
+        httpretty.register_uri(
+            httpretty.GET, self.geocode_url, body="Server error", status=500
+        )
+        self.assertRaises(exceptions.GeocodioServerError, client.geocode, "a")
+        self.assertEqual(breaker.state, "open")
+        time.sleep(0.06)
+
+        meter.budget = 0
+        self.assertRaises(exceptions.GeocodioBudgetError, client.geocode, "a")
+        self.assertEqual(breaker.state, "half_open")
+        meter.budget = None
+        httpretty.register_uri(
+            httpretty.GET, self.geocode_url, body='{"results": []}', status=200
+        )
+        self.assertIsInstance(client.geocode("a"), Location)
+        self.assertEqual(breaker.state, "closed")
+
+    @httpretty.activate
+    def test_queue_timeout_releases_trial(self):
+        """Ensure a half open trial timing out in the limiter is given back"""
+        breaker = CircuitBreaker(failure_threshold=1, reset_timeout=0.05)
+        limiter = AIMDLimiter(initial_limit=1, max_limit=1)
+        client = GeocodioClient(self.TEST_API_KEY, breaker=breaker, concurrency=limiter)
+        httpretty.register_uri(
+            httpretty.GET, self.geocode_url, body="Server error", status=500
+        )
+        self.assertRaises(exceptions.GeocodioServerError, client.geocode, "a")
+        time.sleep(0.06)
+
+        token = limiter.acquire()
+        self.assertRaises(
+            exceptions.GeocodioTimeoutError, client.geocode, "a", deadline=0.05
+        )
+        self.assertEqual(breaker.state, "half_open")
+        limiter.release(token)
+        httpretty.register_uri(
+            httpretty.GET, self.geocode_url, body='{"results": []}', status=200
+        )
+        self.assertIsInstance(client.geocode("a"), Location)
+        self.assertEqual(breaker.state, "closed")
+
+
+class TestClientDeadline(ClientFixtures, unittest.TestCase):
+    def test_connect_and_read_timeouts(self):
+        client = GeocodioClient(
+            self.TEST_API_KEY, timeout=5, connect_timeout=1, read_timeout=None
+        )
+        self.assertEqual(client.timeout, (1, 5))
+
+    def test_single_deadline(self):
+        """Ensure a slow lookup raises the timeout error at the deadline"""
+        with FakeGeocodioServer(delay=1) as server:
+            client = GeocodioClient(self.TEST_API_KEY, custom_base_domain=server.url)
+            started = time.monotonic()
+            with self.assertRaises(exceptions.GeocodioTimeoutError):
+                client.geocode("a", deadline=0.2)
+        self.assertLess(time.monotonic() - started, 0.9)
+
+    def test_expired_deadline_sends_nothing(self):
+        with FakeGeocodioServer() as server:
+            client = GeocodioClient(self.TEST_API_KEY, custom_base_domain=server.url)
+            self.assertRaises(
+                exceptions.GeocodioTimeoutError, client.geocode, "a", deadline=0
+            )
+        self.assertEqual(server.requests, [])
+
+    def test_batch_partial_results(self):
+        """Ensure chunks completed before the deadline are returned"""
+
+        def delay(request):
+            return 1 if "address 2" in request["body"] else 0
+
+        addresses = ["address {0}".format(i) for i in range(6)]
+        with FakeGeocodioServer(delay=delay) as server:
+            client = GeocodioClient(
+                self.TEST_API_KEY, custom_base_domain=server.url, deadline=0.3
+            )
+            with self.assertRaises(exceptions.GeocodioTimeoutError) as raised:
+                client.batch_geocode(addresses, chunk_size=2)
+        partial = raised.exception.partial
+        self.assertIsInstance(partial, LocationCollectionDict)
+        self.assertEqual(list(partial), [0, 1])
+        self.assertEqual(len(server.requests), 2)
+
+    def test_cached_batch_partial_results(self):
+        def delay(request):
+            return 1 if "address 2" in request["body"] else 0
+
+        cache = LocationCache()
+        cache.store("geocode", "address 5", [], {"input": {}, "results": []})
+        addresses = {"k{0}".format(i): "address {0}".format(i) for i in range(6)}
+        with FakeGeocodioServer(delay=delay) as server:
+            client = GeocodioClient(
+                self.TEST_API_KEY, custom_base_domain=server.url, cache=cache
+            )
+            with self.assertRaises(exceptions.GeocodioTimeoutError) as raised:
+                client.batch_geocode(addresses, chunk_size=2, deadline=0.3)
+        self.assertEqual(sorted(raised.exception.partial), ["k0", "k1", "k5"])
+
+    def test_version_discovery_within_deadline(self):
+        client_module._api_versions.clear()
+        client = GeocodioClient(self.TEST_API_KEY, auto_load_api_version=True)
+        deadline = client._deadline(0.5)
+        with mock.patch.object(
+            GeocodioClient, "_parse_curr_api_version", return_value="1.6"
+        ) as parse_version:
+            self.assertEqual(client._resolve_version(deadline), "1.6")
+        self.assertLessEqual(parse_version.call_args[1]["timeout"], 0.5)
+        client_module._api_versions.clear()
+
+
+class TestClientStreaming(ClientFixtures, unittest.TestCase):
+    def test_ordered(self):
+        """Ensure pairs are yielded in input order despite slower batches"""
+
+        def delay(request):
+            return 0.2 if "address 0" in request["body"] else 0
+
+        addresses = ["address {0}".format(i) for i in range(10)]
+        with FakeGeocodioServer(delay=delay) as server:
+            client = GeocodioClient(self.TEST_API_KEY, custom_base_domain=server.url)
+            pairs = list(client.geocode_iter(iter(addresses), batch_size=3))
+        self.assertEqual([address for address, _ in pairs], addresses)
+        self.assertIsInstance(pairs[0][1], Location)
+        self.assertEqual(len(server.requests), 4)
+
+    def test_completion_order(self):
+        def delay(request):
+            return 0.2 if "address 0" in request["body"] else 0
+
+        addresses = ["address {0}".format(i) for i in range(4)]
+        with FakeGeocodioServer(delay=delay) as server:
+            client = GeocodioClient(self.TEST_API_KEY, custom_base_domain=server.url)
+            pairs = client.geocode_iter(addresses, batch_size=2, ordered=False)
+            self.assertEqual(
+                [address for address, _ in pairs],
+                ["address 2", "address 3", "address 0", "address 1"],
+            )
+
+    def test_backpressure(self):
+        """Ensure an unbounded input is only read ahead by the batches in flight"""
+        read = []
+
+        def points():
+            for i in itertools.count():
+                read.append(i)
+                yield (i, i)
+
+        with FakeGeocodioServer() as server:
+            client = GeocodioClient(self.TEST_API_KEY, custom_base_domain=server.url)
+            stream = client.reverse_iter(points(), batch_size=5, max_in_flight=2)
+            first = [next(stream) for _ in range(7)]
+            stream.close()
+        self.assertEqual([point for point, _ in first], [(i, i) for i in range(7)])
+        self.assertLessEqual(len(read), 20)
+        self.assertLessEqual(server.max_in_flight, 2)
+
+
+class TestClientUsage(ClientFixtures, unittest.TestCase):
+    def test_counts_sent_lookups(self):
+        """Ensure only lookups actually sent are counted"""
+        meter = UsageMeter()
+        addresses = ["address {0}".format(i) for i in range(5)]
+        with FakeGeocodioServer() as server:
+            client = GeocodioClient(
+                self.TEST_API_KEY,
+                custom_base_domain=server.url,
+                usage=meter,
+                cache=LocationCache(),
+            )
+            client.batch_geocode(addresses, fields=["cd"], chunk_size=2)
+            client.batch_geocode(addresses[:3] + ["address 5"], fields=["cd"])
+            client.reverse((1, 2))
+        report = meter.report()
+        self.assertEqual(report["lookups"], {"geocode": 6, "reverse": 1})
+        self.assertEqual(report["fields"], {"cd": 6})
+        self.assertEqual(report["billed"], 13)
+
+    def test_budget_stops_requests(self):
+        meter = UsageMeter(budget=3)
+        addresses = ["address {0}".format(i) for i in range(5)]
+        with FakeGeocodioServer() as server:
+            client = GeocodioClient(
+                self.TEST_API_KEY, custom_base_domain=server.url, usage=meter
+            )
+            with self.assertRaises(exceptions.GeocodioBudgetError):
+                client.batch_geocode(addresses, chunk_size=2)
+        self.assertEqual(len(server.requests), 1)
+        self.assertEqual(meter.billed, 2)
+
+    @httpretty.activate
+    def test_errors_not_counted(self):
+        meter = UsageMeter()
+        client = GeocodioClient(self.TEST_API_KEY, usage=meter)
+        httpretty.register_uri(
+            httpretty.GET, self.geocode_url, body=self.err, status=422
+        )
+        self.assertRaises(exceptions.GeocodioDataError, client.geocode, "a")
+        self.assertEqual(meter.billed, 0)
+
+
+def enrich_handler(request):
+    """Returns reverse results with one value per requested field and point"""
+    fields = request["params"]["fields"].split(",")
+    return 200, {
+        "results": [
+            {
+                "query": point,
+                "response": {
+                    "results": [{"fields": {f: {"point": point} for f in fields}}]
+                },
+            }
+            for point in request["body"]
+        ]
+    }
+
+
+class TestClientEnrich(ClientFixtures, unittest.TestCase):
+    def setUp(self):
+        super(TestClientEnrich, self).setUp()
+        self.locations = LocationCollection(
+            self.fixture("batch.json")["results"], order="lng"
+        )
+
+    def fixture(self, name):
+        path = os.path.join(os.path.dirname(__file__), "response", name)
+        with open(path) as f:
+            return json.load(f)
+
+    def test_enrich_best_matches(self):
+        """Ensure only new fields for each best match are requested and merged"""
+        with FakeGeocodioServer(enrich_handler) as server:
+            client = GeocodioClient(self.TEST_API_KEY, custom_base_domain=server.url)
+            enriched = client.enrich(self.locations, ["cd", "school"])
+        self.assertIs(enriched, self.locations)
+        self.assertEqual(len(server.requests), 1)
+        self.assertEqual(server.requests[0]["verb"], "reverse")
+        self.assertEqual(server.requests[0]["params"]["fields"], "cd,school")
+        self.assertEqual(
+            server.requests[0]["body"],
+            ["37.560890255102,-77.477400571429", "37.554895702703,-77.457561054054"],
+        )
+        first = self.locations[0]
+        self.assertEqual(
+            first.best_match["fields"]["cd"],
+            {"point": "37.560890255102,-77.477400571429"},
+        )
+        self.assertEqual(first["results"][0]["fields"], first.best_match["fields"])
+        self.assertNotIn("fields", self.locations[1]["results"][1])
+        self.assertNotIn("results", self.locations[2])
+
+    def test_enrich_all_results_dict(self):
+        locations = LocationCollectionDict(
+            self.fixture("batch_dict.json")["results"], view=True
+        )
+        with FakeGeocodioServer(enrich_handler) as server:
+            client = GeocodioClient(self.TEST_API_KEY, custom_base_domain=server.url)
+            client.enrich(locations, ["timezone"], all_results=True, chunk_size=1)
+        points = [p for r in server.requests for p in r["body"]]
+        self.assertEqual(len(points), 3)
+        self.assertEqual(len(points), len(set(points)))
+        for location in locations.values():
+            for result in location.get("results", []):
+                self.assertIn("timezone", result["fields"])
+                self.assertIn("timezone", location.best_match["fields"])
+
+    def test_enrich_deduplicates_points(self):
+        results = self.fixture("batch.json")["results"][:1] * 3
+        locations = LocationCollection(results)
+        with FakeGeocodioServer(enrich_handler) as server:
+            client = GeocodioClient(self.TEST_API_KEY, custom_base_domain=server.url)
+            client.enrich(locations, ["cd"])
+        self.assertEqual(len(server.requests[0]["body"]), 1)
+        for location in locations:
+            self.assertIn("cd", location.best_match["fields"])
@@ -0,0 +1,59 @@
+"""
+test_concurrency
+----------------------------------
+
+Tests for `geocodio.concurrency` module.
+"""
+
+import threading
+import unittest
+
+from geocodio.concurrency import AIMDLimiter
+
+
+class TestAIMDLimiter(unittest.TestCase):
+    def test_additive_increase(self):
+        limiter = AIMDLimiter(initial_limit=2, max_limit=3)
+        for _ in range(2):
+            limiter.release(limiter.acquire())
+        self.assertEqual(limiter.limit, 3)
+        for _ in range(10):
+            limiter.release(limiter.acquire())
+        self.assertEqual(limiter.limit, 3)
+        self.assertEqual(
+            [reason for _, _, reason in limiter.history], ["initial", "increase"]
+        )
+
+    def test_multiplicative_decrease(self):
+        limiter = AIMDLimiter(initial_limit=8, min_limit=3)
+        limiter.release(limiter.acquire(), overloaded=True)
+        self.assertEqual(limiter.limit, 4)
+        limiter.release(limiter.acquire(), overloaded=True)
+        self.assertEqual(limiter.limit, 3)
+        self.assertEqual(limiter.history[-1][1:], (3, "decrease"))
+
+    def test_single_decrease_per_window(self):
+        """Requests in flight before a decrease do not cut the limit again"""
+        limiter = AIMDLimiter(initial_limit=8)
+        tokens = [limiter.acquire() for _ in range(4)]
+        for token in tokens:
+            limiter.release(token, overloaded=True)
+        self.assertEqual(limiter.limit, 4)
+
+    def test_failures_leave_limit(self):
+        limiter = AIMDLimiter(initial_limit=1)
+        limiter.release(limiter.acquire(), success=False)
+        self.assertEqual(limiter.limit, 1)
+        self.assertEqual(limiter.in_flight, 0)
+
+    def test_acquire_blocks_at_limit(self):
+        limiter = AIMDLimiter(initial_limit=1)
+        token = limiter.acquire()
+        self.assertRaises(TimeoutError, limiter.acquire, timeout=0.01)
+        threading.Timer(0.01, limiter.release, [token]).start()
+        limiter.release(limiter.acquire(timeout=1))
+
+    def test_invalid_limits(self):
+        self.assertRaises(ValueError, AIMDLimiter, initial_limit=0)
+        self.assertRaises(ValueError, AIMDLimiter, initial_limit=10, max_limit=5)
+        self.assertRaises(ValueError, AIMDLimiter, decrease=1)
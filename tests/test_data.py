@@ -11,10 +11,12 @@ import unittest
 
 from geocodio.data import (
     Address,
+    AddressView,
     LocationCollectionUtils,
     Location,
     LocationCollection,
     LocationCollectionDict,
+    LocationView,
 )
 
 
@@ -412,3 +414,36 @@ class TestDataTypes(unittest.TestCase):
         self.assertFalse(
             {"street": "1109 N Highland St", "city": "Arlington"} in locations
         )
+
+    def test_location_view(self):
+        """Ensure a LocationView wraps the response without copying it"""
+        view = LocationView(self.single_response)
+        self.assertEqual(view.coords, (37.554895702703, -77.457561054054))
+        self.assertEqual(view.accuracy, Location(self.single_response).accuracy)
+        self.assertEqual(
+            view.formatted_address, Location(self.single_response).formatted_address
+        )
+        self.assertIs(view["results"], self.single_response["results"])
+        self.assertEqual(view, Location(self.single_response))
+        with self.assertRaises(TypeError):
+            view["input"] = {}
+
+        view = LocationView(self.single_response, order="lng")
+        self.assertEqual(view.coords, (-77.457561054054, 37.554895702703))
+        self.assertIsInstance(view.best_match, AddressView)
+
+    def test_location_view_results_missing(self):
+        view = LocationView(self.missing_results)
+        self.assertEqual(view.coords, None)
+        self.assertEqual(view.formatted_address, "")
+
+    def test_collection_views(self):
+        locations = LocationCollection(self.batch_response["results"], view=True)
+        self.assertIsInstance(locations[0], LocationView)
+        self.assertEqual(
+            locations.coords, LocationCollection(self.batch_response["results"]).coords
+        )
+        locations = LocationCollectionDict(
+            self.batch_dict_response["results"], view=True
+        )
+        self.assertIsInstance(locations["1"], LocationView)
@@ -0,0 +1,40 @@
+"""
+test_deadline
+----------------------------------
+
+Tests for `geocodio.deadline` module.
+"""
+
+import time
+import unittest
+
+from geocodio import exceptions
+from geocodio.deadline import Deadline
+
+
+class TestDeadline(unittest.TestCase):
+    def test_unbounded(self):
+        deadline = Deadline()
+        self.assertIsNone(deadline.remaining())
+        self.assertFalse(deadline.expired)
+        self.assertEqual(deadline.timeout((1, 5)), (1, 5))
+        self.assertIsNone(deadline.timeout())
+        deadline.check()
+
+    def test_caps_timeouts(self):
+        deadline = Deadline(2)
+        self.assertEqual(deadline.timeout(1), 1)
+        self.assertLessEqual(deadline.timeout(10), 2)
+        self.assertLessEqual(deadline.timeout(), 2)
+        connect, read = deadline.timeout((1, None))
+        self.assertEqual(connect, 1)
+        self.assertLessEqual(read, 2)
+
+    def test_expiry(self):
+        deadline = Deadline(0.01)
+        time.sleep(0.02)
+        self.assertTrue(deadline.expired)
+        self.assertEqual(deadline.remaining(), 0)
+        with self.assertRaises(exceptions.GeocodioTimeoutError) as raised:
+            deadline.check(partial={0: "done"})
+        self.assertEqual(raised.exception.partial, {0: "done"})
@@ -0,0 +1,139 @@
+"""
+test_distance
+----------------------------------
+
+Tests for `geocodio.distance` module.
+"""
+
+import json
+import math
+import os
+import unittest
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+from geocodio.data import LocationCollection, LocationCollectionDict
+
+if numpy is not None:
+    from geocodio.distance import (
+        EARTH_RADIUS,
+        distance_blocks,
+        distance_matrix,
+        distances,
+        nearest,
+    )
+
+
+def haversine(origin, destination, radius=6371.0088):
+    """Reference distance between two (lat, lng) points"""
+    lat1, lng1, lat2, lng2 = map(math.radians, origin + destination)
+    a = (
+        math.sin((lat2 - lat1) / 2) ** 2
+        + math.cos(lat1) * math.cos(lat2) * math.sin((lng2 - lng1) / 2) ** 2
+    )
+    return 2 * radius * math.asin(math.sqrt(a))
+
+
+def load(name):
+    fixtures = os.path.join(os.path.dirname(os.path.abspath(__file__)), "response")
+    with open(os.path.join(fixtures, name), "r") as f:
+        return json.load(f)
+
+
+RICHMOND = (37.5407, -77.4360)
+WASHINGTON = (38.8951, -77.0364)
+LONDON = (51.5074, -0.1278)
+
+
+@unittest.skipIf(numpy is None, "numpy is not installed")
+class TestDistance(unittest.TestCase):
+    def setUp(self):
+        self.batch = load("batch.json")["results"]
+
+    def test_distances(self):
+        result = distances(RICHMOND, [WASHINGTON, LONDON, RICHMOND])
+        expected = [haversine(RICHMOND, p) for p in (WASHINGTON, LONDON, RICHMOND)]
+        numpy.testing.assert_allclose(result, expected, atol=1e-9)
+        self.assertAlmostEqual(result[0], 154.6, places=1)
+
+    def test_units(self):
+        km = distances(RICHMOND, [LONDON])[0]
+        self.assertAlmostEqual(distances(RICHMOND, [LONDON], unit="m")[0], km * 1000)
+        self.assertAlmostEqual(
+            distances(RICHMOND, [LONDON], unit="mi")[0],
+            km * EARTH_RADIUS["mi"] / EARTH_RADIUS["km"],
+        )
+        self.assertRaises(ValueError, distances, RICHMOND, [LONDON], unit="ft")
+
+    def test_order(self):
+        swapped = [p[::-1] for p in (WASHINGTON, LONDON)]
+        numpy.testing.assert_allclose(
+            distances(RICHMOND[::-1], swapped, order="lng"),
+            distances(RICHMOND, [WASHINGTON, LONDON]),
+        )
+
+    def test_coordinate_arrays(self):
+        lats, lngs = numpy.array([WASHINGTON, LONDON]).T
+        numpy.testing.assert_allclose(
+            distances(RICHMOND, (lats, lngs)),
+            distances(RICHMOND, numpy.array([WASHINGTON, LONDON])),
+        )
+        self.assertRaises(ValueError, distances, RICHMOND, (lats, lngs[:1]))
+        self.assertRaises(ValueError, distances, [RICHMOND, LONDON], [WASHINGTON])
+        self.assertRaises(ValueError, distances, RICHMOND, numpy.zeros((2, 3)))
+
+    def test_collection(self):
+        locations = LocationCollection(self.batch)
+        result = distances(RICHMOND, locations)
+        self.assertAlmostEqual(result[0], haversine(RICHMOND, locations.coords[0]))
+        self.assertTrue(numpy.isnan(result[2]))
+
+        # Collections are read in their own order
+        swapped = LocationCollection(self.batch, order="lng")
+        numpy.testing.assert_allclose(distances(RICHMOND, swapped), result)
+        numpy.testing.assert_allclose(
+            distances(swapped[0], [RICHMOND]), result[:1], atol=1e-9
+        )
+
+    def test_collection_dict(self):
+        locations = LocationCollectionDict(load("batch_dict.json")["results"])
+        result = distances(locations["1"].best_match, locations)
+        self.assertEqual(result.shape, (len(locations),))
+        self.assertEqual(result[0], 0)
+
+    def test_matrix(self):
+        origins = [RICHMOND, WASHINGTON, LONDON]
+        matrix = distance_matrix(origins, [LONDON, RICHMOND], unit="mi")
+        self.assertEqual(matrix.shape, (3, 2))
+        for i, origin in enumerate(origins):
+            numpy.testing.assert_allclose(
+                matrix[i], distances(origin, [LONDON, RICHMOND], unit="mi")
+            )
+        self.assertEqual(distance_matrix([], [RICHMOND]).shape, (0, 1))
+
+    def test_blocked_matrix(self):
+        rng = numpy.random.default_rng(0)
+        origins = numpy.column_stack(
+            [rng.uniform(-90, 90, 50), rng.uniform(-180, 180, 50)]
+        )
+        destinations = origins[:7][:, ::-1]
+        full = distance_matrix(origins, destinations, order="lng")
+        numpy.testing.assert_array_equal(
+            distance_matrix(origins, destinations, order="lng", block_size=8), full
+        )
+        blocks = list(distance_blocks(origins, destinations, order="lng", block_size=8))
+        self.assertEqual([start for start, _ in blocks], list(range(0, 50, 8)))
+        self.assertEqual(blocks[-1][1].shape, (2, 7))
+        self.assertRaises(ValueError, distance_blocks, origins, origins, block_size=0)
+
+    def test_nearest(self):
+        locations = LocationCollection(self.batch)
+        indexes, found = nearest(
+            locations, [LONDON, RICHMOND, WASHINGTON], block_size=2
+        )
+        self.assertEqual(indexes.tolist(), [1, 1, -1])
+        self.assertAlmostEqual(found[0], haversine(locations.coords[0], RICHMOND))
+        self.assertTrue(numpy.isnan(found[2]))
@@ -0,0 +1,85 @@
+"""
+test_hedging
+----------------------------------
+
+Tests for `geocodio.hedging` module.
+"""
+
+import threading
+import time
+import unittest
+
+from geocodio.hedging import Hedger
+
+
+class TestHedger(unittest.TestCase):
+    def test_fast_call_not_hedged(self):
+        hedger = Hedger(delay=1.0, max_ratio=1)
+        self.assertEqual(hedger.call(lambda x: x * 2, 21), 42)
+        self.assertEqual((hedger.requests, hedger.hedged), (1, 0))
+
+    def test_slow_call_hedged(self):
+        """The duplicate request answers first when the original stalls"""
+        calls = []
+        release = threading.Event()
+
+        def lookup():
+            calls.append(None)
+            if len(calls) == 1:
+                release.wait(2)
+                return "primary"
+            return "hedge"
+
+        hedger = Hedger(delay=0.01, max_ratio=1)
+        self.assertEqual(hedger.call(lookup), "hedge")
+        release.set()
+        self.assertEqual((hedger.hedged, hedger.hedge_wins), (1, 1))
+
+    def test_stalled_primary_latency(self):
+        """A stalled original raises the delay even when its hedge wins"""
+        calls = []
+
+        def lookup():
+            calls.append(None)
+            if len(calls) == 1:
+                time.sleep(0.2)
+                return "primary"
+            return "hedge"
+
+        hedger = Hedger(min_samples=1, initial_delay=0.01, max_ratio=1)
+        self.assertEqual(hedger.call(lookup), "hedge")
+        hedger._executor.shutdown(wait=True)
+        self.assertGreaterEqual(hedger.delay, 0.2)
+
+    def test_ratio_cap(self):
+        hedger = Hedger(delay=0, max_ratio=0.5)
+        for _ in range(10):
+            hedger.call(time.sleep, 0.005)
+        self.assertLessEqual(hedger.hedged, 5)
+        self.assertGreater(hedger.hedged, 0)
+
+    def test_errors_fall_through_to_hedge(self):
+        calls = []
+
+        def lookup():
+            calls.append(None)
+            if len(calls) == 1:
+                time.sleep(0.05)
+                raise ValueError("primary failed")
+            time.sleep(0.1)
+            return "hedge"
+
+        hedger = Hedger(delay=0.01, max_ratio=1)
+        self.assertEqual(hedger.call(lookup), "hedge")
+
+    def test_all_errors_raise(self):
+        def lookup():
+            raise ValueError("failed")
+
+        self.assertRaises(ValueError, Hedger(delay=0, max_ratio=1).call, lookup)
+
+    def test_percentile_delay(self):
+        hedger = Hedger(min_samples=10, initial_delay=3.0)
+        self.assertEqual(hedger.delay, 3.0)
+        hedger.latencies.extend(i / 100 for i in range(100))
+        self.assertEqual(hedger.delay, 0.95)
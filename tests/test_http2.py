@@ -0,0 +1,90 @@
+"""
+test_http2
+----------------------------------
+
+Tests for `geocodio.http2` module, against a local HTTP/2 server.
+"""
+
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+
+from geocodio import exceptions
+from geocodio.client import GeocodioClient
+
+try:
+    import h2
+    import httpx
+except ImportError:
+    h2 = httpx = None
+else:
+    from tests.h2_server import FakeHttp2Server
+from tests.server import FakeGeocodioServer, empty_result
+
+
+def single_handler(request):
+    if request["body"] is not None:
+        return 200, {"results": [empty_result(q) for q in request["body"]]}
+    query = request["params"].get("q")
+    if query == "invalid":
+        return 422, {"error": "Could not geocode address"}
+    if query == "broken":
+        return 500, "Server error"
+    return 200, {
+        "input": {"formatted_address": query},
+        "results": [{"formatted_address": query, "location": {"lat": 1, "lng": 2}}],
+    }
+
+
+@unittest.skipIf(httpx is None, "httpx[http2] is not installed")
+class TestHttp2(unittest.TestCase):
+    def test_multiplexed_lookups(self):
+        """Ensure concurrent lookups share a single connection"""
+        addresses = ["address {0}".format(i) for i in range(40)]
+        with FakeHttp2Server(single_handler, delay=0.05) as server:
+            client = GeocodioClient("key", custom_base_domain=server.url, http2=True)
+            with ThreadPoolExecutor(max_workers=20) as executor:
+                locations = list(executor.map(client.geocode_address, addresses))
+            client.close()
+        self.assertEqual([loc.formatted_address for loc in locations], addresses)
+        self.assertEqual(server.connections, 1)
+        self.assertGreater(server.max_in_flight, 1)
+
+    def test_same_results_as_http1(self):
+        results = []
+        for server_class, http2 in (
+            (FakeGeocodioServer, False),
+            (FakeHttp2Server, True),
+        ):
+            with server_class(single_handler) as server:
+                client = GeocodioClient(
+                    "key", custom_base_domain=server.url, http2=http2
+                )
+                results.append(
+                    (
+                        client.geocode("1 Main St"),
+                        client.reverse((1, 2)),
+                        list(client.geocode(["a", "b"])),
+                    )
+                )
+        self.assertEqual(results[0], results[1])
+
+    def test_errors(self):
+        with FakeHttp2Server(single_handler) as server:
+            client = GeocodioClient("key", custom_base_domain=server.url, http2=True)
+            self.assertRaises(exceptions.GeocodioDataError, client.geocode, "invalid")
+            self.assertRaises(exceptions.GeocodioServerError, client.geocode, "broken")
+
+    def test_timeout(self):
+        with FakeHttp2Server(single_handler, delay=0.5) as server:
+            client = GeocodioClient(
+                "key", custom_base_domain=server.url, http2=True, timeout=0.1
+            )
+            self.assertRaises(requests.exceptions.ReadTimeout, client.geocode, "a")
+
+    def test_connection_error(self):
+        with FakeHttp2Server() as server:
+            url = server.url
+        client = GeocodioClient("key", custom_base_domain=url, http2=True)
+        self.assertRaises(requests.exceptions.ConnectionError, client.geocode, "a")
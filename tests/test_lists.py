@@ -0,0 +1,211 @@
+"""
+test_lists
+----------------------------------
+
+Tests for `geocodio.lists` module.
+"""
+
+import csv
+import io
+import os
+import tempfile
+import unittest
+from email.parser import BytesParser
+from email.policy import HTTP
+
+from geocodio import exceptions
+from geocodio.client import GeocodioClient
+from geocodio.lists import MultipartBody, _lines
+from geocodio.transport import PoolTransport
+from geocodio.usage import UsageMeter
+from tests.server import FakeGeocodioServer
+
+
+class FakeLists(object):
+    """
+    Handler for the list endpoints, processing each list after a number of
+    status polls.
+    """
+
+    def __init__(self, polls=2, fail=False):
+        self.polls = polls
+        self.fail = fail
+        self.lists = {}
+
+    def __call__(self, request):
+        parts = request["path"].split("/lists", 1)[1].strip("/").split("/")
+        if request["method"] == "POST":
+            return self.create(request)
+        if parts == [""]:
+            return 200, {"current_page": 1, "data": [{"id": i} for i in self.lists]}
+        job = self.lists.get(int(parts[0]))
+        if job is None:
+            return 404, {"error": "Not found"}
+        if request["method"] == "DELETE":
+            del self.lists[job["id"]]
+            return 200, {"success": True}
+        if parts[1:] == ["download"]:
+            return 200, self.results(job)
+        job["polls"] += 1
+        state = "PROCESSING"
+        if job["polls"] >= self.polls:
+            state = "FAILED" if self.fail else "COMPLETED"
+        return 200, {
+            "id": job["id"],
+            "status": {"state": state, "progress": 100, "message": state.title()},
+        }
+
+    def create(self, request):
+        headers = {k.lower(): v for k, v in request["headers"].items()}
+        message = BytesParser(policy=HTTP).parsebytes(
+            b"Content-Type: "
+            + headers["content-type"].encode()
+            + b"\r\n\r\n"
+            + request["body"]
+        )
+        form = {}
+        for part in message.iter_parts():
+            name = part.get_param("name", header="content-disposition")
+            form[name] = part.get_payload(decode=True)
+            if name == "file":
+                form["filename"] = part.get_filename()
+        job = {
+            "id": len(self.lists) + 1,
+            "polls": 0,
+            "form": form,
+        }
+        self.lists[job["id"]] = job
+        return 200, {"id": job["id"], "file": {"filename": form["filename"]}}
+
+    def results(self, job):
+        rows = list(csv.reader(io.StringIO(job["form"]["file"].decode("utf-8"))))
+        out = io.StringIO()
+        writer = csv.writer(out)
+        writer.writerow(rows[0] + ["Latitude", "Longitude"])
+        for index, row in enumerate(rows[1:]):
+            writer.writerow(row + [index, -index])
+        return out.getvalue()
+
+
+def csv_file(rows):
+    out = io.StringIO()
+    writer = csv.writer(out)
+    writer.writerow(["name", "address"])
+    for i in range(rows):
+        writer.writerow(
+            ["Customer {0}".format(i), "{0} Main St, Richmond VA".format(i)]
+        )
+    return out.getvalue().encode("utf-8")
+
+
+class TestMultipartBody(unittest.TestCase):
+    def test_body(self):
+        fileobj = io.BytesIO(b"a,b\n1,2\n")
+        body = MultipartBody({"format": "{{A}}"}, "file", "in.csv", fileobj)
+        data = body.read(5) + body.read()
+        self.assertEqual(len(data), len(body))
+        self.assertIn(b'name="format"\r\n\r\n{{A}}\r\n', data)
+        self.assertIn(
+            b'filename="in.csv"\r\nContent-Type: text/csv\r\n\r\na,b\n1,2\n', data
+        )
+        self.assertTrue(data.endswith("--{0}--\r\n".format(body.boundary).encode()))
+        self.assertEqual(body.read(), b"")
+
+    def test_iter(self):
+        fileobj = io.BytesIO(b"x" * 200000)
+        body = MultipartBody({}, "file", "in.csv", fileobj)
+        chunks = list(body)
+        self.assertGreater(len(chunks), 1)
+        self.assertEqual(sum(len(c) for c in chunks), len(body))
+
+
+class TestLines(unittest.TestCase):
+    def test_split_chunks(self):
+        data = 'a,b\r\n"x\ny",é\n1,2'.encode("utf-8")
+        chunks = [data[i : i + 3] for i in range(0, len(data), 3)]
+        self.assertEqual(list(_lines(chunks)), ["a,b\r\n", '"x\n', 'y",é\n', "1,2"])
+
+
+class TestLists(unittest.TestCase):
+    def setUp(self):
+        self.data = csv_file(2000)
+
+    def client(self, server, **kwargs):
+        return GeocodioClient("key", custom_base_domain=server.url, **kwargs)
+
+    def test_upload_wait_download(self):
+        handler = FakeLists()
+        with FakeGeocodioServer(handler) as server:
+            client = self.client(server)
+            job = client.lists.upload(
+                io.BytesIO(self.data), "{{B}}", fields=["cd"], filename="in.csv"
+            )
+            details = client.lists.wait(job["id"], interval=0.01)
+            with tempfile.TemporaryDirectory() as directory:
+                path = os.path.join(directory, "out.csv")
+                written = client.lists.download(job["id"], path, chunk_size=1024)
+                with open(path, "rb") as f:
+                    downloaded = f.read()
+            rows = list(client.lists.rows(job["id"], chunk_size=100))
+
+        form = handler.lists[job["id"]]["form"]
+        self.assertEqual(form["file"], self.data)
+        self.assertEqual(form["filename"], "in.csv")
+        self.assertEqual(form["format"], b"{{B}}")
+        self.assertEqual(form["direction"], b"forward")
+        self.assertEqual(form["fields"], b"cd")
+        self.assertEqual(details["status"]["state"], "COMPLETED")
+        self.assertEqual(written, len(downloaded))
+        self.assertEqual(len(rows), 2000)
+        self.assertEqual(
+            rows[1],
+            {
+                "name": "Customer 1",
+                "address": "1 Main St, Richmond VA",
+                "Latitude": "1",
+                "Longitude": "-1",
+            },
+        )
+
+    def test_upload_path_pool_transport(self):
+        with tempfile.NamedTemporaryFile(suffix=".csv", delete=False) as f:
+            f.write(self.data)
+        self.addCleanup(os.remove, f.name)
+        handler = FakeLists(polls=1)
+        with FakeGeocodioServer(handler) as server:
+            client = self.client(server, transport=PoolTransport())
+            job = client.lists.upload(f.name, "{{B}}", direction="reverse")
+            client.lists.wait(job["id"], interval=0.01)
+            rows = list(client.lists.rows(job["id"], chunk_size=512))
+            self.assertEqual(len(client.lists.all()["data"]), 1)
+            client.lists.delete(job["id"])
+            self.assertRaises(exceptions.GeocodioError, client.lists.status, job["id"])
+        self.assertEqual(handler.lists, {})
+        self.assertEqual(len(rows), 2000)
+        self.assertEqual(server.requests[0]["params"], {"api_key": "key"})
+
+    def test_failed_list(self):
+        with FakeGeocodioServer(FakeLists(fail=True)) as server:
+            client = self.client(server)
+            job = client.lists.upload(io.BytesIO(self.data), "{{B}}")
+            with self.assertRaises(exceptions.GeocodioListError) as context:
+                client.lists.wait(job["id"], interval=0.01)
+        self.assertEqual(context.exception.status["status"]["state"], "FAILED")
+
+    def test_wait_timeout(self):
+        with FakeGeocodioServer(FakeLists(polls=100)) as server:
+            client = self.client(server)
+            job = client.lists.upload(io.BytesIO(self.data), "{{B}}")
+            with self.assertRaises(exceptions.GeocodioTimeoutError) as context:
+                client.lists.wait(job["id"], timeout=0.2, interval=0.02, backoff=1.5)
+        polls = [r for r in server.requests if r["method"] == "GET"]
+        self.assertLess(len(polls), 10)
+        self.assertEqual(context.exception.partial["status"]["state"], "PROCESSING")
+
+    def test_not_billed(self):
+        meter = UsageMeter(budget=0)
+        with FakeGeocodioServer(FakeLists(polls=1)) as server:
+            client = self.client(server, usage=meter)
+            job = client.lists.upload(io.BytesIO(self.data), "{{B}}")
+            client.lists.wait(job["id"], interval=0.01)
+        self.assertEqual(meter.billed, 0)
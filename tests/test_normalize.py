@@ -0,0 +1,86 @@
+"""
+test_normalize
+----------------------------------
+
+Tests for `geocodio.normalize` module.
+"""
+
+import unittest
+
+from geocodio.normalize import (
+    normalize_address,
+    normalize_components,
+    normalize_query,
+)
+
+
+class TestNormalizeAddress(unittest.TestCase):
+    def test_variants_match(self):
+        variants = [
+            "123 Main St.",
+            "123 MAIN STREET",
+            "  123   main  street ",
+            "123 Main Str",
+        ]
+        self.assertEqual({normalize_address(v) for v in variants}, {"123 MAIN ST"})
+
+    def test_directionals(self):
+        self.assertEqual(
+            normalize_address("1600 Pennsylvania Avenue Northwest, Washington DC"),
+            "1600 PENNSYLVANIA AVE NW, WASHINGTON DC",
+        )
+        self.assertEqual(
+            normalize_address("42 south Oak Lane"), normalize_address("42 S. Oak Ln")
+        )
+        # A directional which is the street name is left alone
+        self.assertEqual(normalize_address("123 North Street"), "123 NORTH ST")
+
+    def test_suffix_only_abbreviated_once(self):
+        self.assertEqual(normalize_address("10 Court Street"), "10 COURT ST")
+        self.assertEqual(normalize_address("10 Park Avenue"), "10 PARK AVE")
+
+    def test_units(self):
+        self.assertEqual(
+            normalize_address("123 N. Main St. Apartment #5"), "123 N MAIN ST APT 5"
+        )
+        self.assertEqual(
+            normalize_address("1 Main St, Suite 100, Springfield"),
+            "1 MAIN ST, STE 100, SPRINGFIELD",
+        )
+        # Designator words which are not followed by a unit are left alone
+        self.assertEqual(
+            normalize_address("1 Main St, Front Royal, VA"),
+            "1 MAIN ST, FRONT ROYAL, VA",
+        )
+
+    def test_punctuation(self):
+        self.assertEqual(
+            normalize_address("123 Main St.,, Springfield ,IL!"),
+            "123 MAIN ST, SPRINGFIELD, IL",
+        )
+        self.assertEqual(normalize_address(" , "), "")
+
+    def test_apostrophes(self):
+        self.assertEqual(
+            normalize_address("12 O'Neil Road, Coeur d’Alene"),
+            "12 O'NEIL RD, COEUR D'ALENE",
+        )
+
+
+class TestNormalizeComponents(unittest.TestCase):
+    def test_components(self):
+        self.assertEqual(
+            normalize_components(
+                {
+                    "street": "1109 North Highland Street",
+                    "city": "Arlington,",
+                    "zip": 22201,
+                }
+            ),
+            {"street": "1109 N HIGHLAND ST", "city": "ARLINGTON", "zip": 22201},
+        )
+
+    def test_normalize_query(self):
+        self.assertEqual(normalize_query("1 main street"), "1 MAIN ST")
+        self.assertEqual(normalize_query({"city": "x"}), {"city": "X"})
+        self.assertIsNone(normalize_query(None))
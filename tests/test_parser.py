@@ -0,0 +1,81 @@
+"""
+test_parser
+----------------------------------
+
+Tests for `geocodio.parser` module.
+"""
+
+import unittest
+
+from geocodio.data import Address
+from geocodio.parser import DEFAULT_MIN_CONFIDENCE, format_address, parse_address
+
+
+class TestParseAddress(unittest.TestCase):
+    def test_full_address(self):
+        address, confidence = parse_address(
+            "1600 Pennsylvania Avenue Northwest, Washington, DC 20500"
+        )
+        self.assertIsInstance(address, Address)
+        self.assertEqual(confidence, 1.0)
+        self.assertEqual(
+            address["address_components"],
+            {
+                "number": "1600",
+                "street": "Pennsylvania",
+                "suffix": "Ave",
+                "postdirectional": "NW",
+                "city": "Washington",
+                "state": "DC",
+                "zip": "20500",
+                "country": "US",
+            },
+        )
+        self.assertEqual(
+            address.formatted_address, "1600 Pennsylvania Ave NW, Washington, DC 20500"
+        )
+
+    def test_without_commas(self):
+        address, confidence = parse_address("42370 bob hope drive rancho mirage ca")
+        self.assertGreaterEqual(confidence, DEFAULT_MIN_CONFIDENCE)
+        components = address["address_components"]
+        self.assertEqual(components["street"], "Bob Hope")
+        self.assertEqual(components["city"], "Rancho Mirage")
+        self.assertEqual(components["state"], "CA")
+
+    def test_units_and_state_names(self):
+        address, confidence = parse_address(
+            "100 N Main St, Suite 5, Los Angeles, California 90012"
+        )
+        self.assertGreaterEqual(confidence, DEFAULT_MIN_CONFIDENCE)
+        components = address["address_components"]
+        self.assertEqual(components["predirectional"], "N")
+        self.assertEqual(components["secondaryunit"], "Ste")
+        self.assertEqual(components["secondarynumber"], "5")
+        self.assertEqual(components["state"], "CA")
+
+    def test_ordinal_streets(self):
+        address, confidence = parse_address("200 W 42nd Street, New York, NY 10036")
+        self.assertEqual(confidence, 1.0)
+        self.assertEqual(address["address_components"]["street"], "42nd")
+        self.assertEqual(address.formatted_address, "200 W 42nd St, New York, NY 10036")
+        components = parse_address("5 5TH AVE, NEW YORK NY")[0]["address_components"]
+        self.assertEqual(components["street"], "5th")
+
+    def test_apostrophes(self):
+        address, confidence = parse_address("12 O'Neil Road, Coeur d'Alene, ID 83814")
+        self.assertEqual(confidence, 1.0)
+        components = address["address_components"]
+        self.assertEqual(components["street"], "O'Neil")
+        self.assertEqual(components["city"], "Coeur D'Alene")
+
+    def test_low_confidence(self):
+        self.assertLess(parse_address("350 Broadway New York NY")[1], 0.5)
+        self.assertLess(parse_address("somewhere")[1], 0.5)
+        self.assertEqual(parse_address("")[1], 0.0)
+
+    def test_format_address(self):
+        self.assertEqual(
+            format_address({"street": "Broadway", "number": "350", "state": "NY"}),
+            "350 Broadway, NY",
+        )
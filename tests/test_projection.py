@@ -0,0 +1,145 @@
+"""
+test_projection
+----------------------------------
+
+Tests for `geocodio.projection` module.
+"""
+
+import unittest
+
+from geocodio.cache import LocationCache
+from geocodio.client import GeocodioClient
+from geocodio.data import Location
+from geocodio.projection import Projection, project_results
+from tests.server import FakeGeocodioServer
+
+
+def result(index):
+    return {
+        "address_components": {"number": str(index), "street": "Main"},
+        "formatted_address": "{0} Main St".format(index),
+        "location": {"lat": float(index), "lng": -float(index)},
+        "accuracy": 1,
+        "fields": {
+            "congressional_districts": [{"name": "District {0}".format(index)}],
+            "census": {"2010": {"block": 1}, "2020": {"block": 2}},
+            "timezone": {"name": "EST"},
+        },
+    }
+
+
+def response(query="a"):
+    return {
+        "input": {"formatted_address": query},
+        "results": [result(1), result(2)],
+    }
+
+
+def fields_handler(request):
+    """Returns two results with fields for each query"""
+    queries = request["body"]
+    if queries is None:
+        return 200, response(request["params"]["q"])
+    return 200, {"results": [{"query": q, "response": response(q)} for q in queries]}
+
+
+class TestProjection(unittest.TestCase):
+    def test_best_match_keys(self):
+        projected = Projection(best_match=True, keys=["location", "accuracy"])(
+            response()
+        )
+        self.assertEqual(
+            projected,
+            {
+                "input": {"formatted_address": "a"},
+                "results": [{"location": {"lat": 1.0, "lng": -1.0}, "accuracy": 1}],
+            },
+        )
+
+    def test_fields(self):
+        projected = Projection(fields=["cd", "census2020"], input=False)(response())
+        self.assertNotIn("input", projected)
+        self.assertEqual(len(projected["results"]), 2)
+        self.assertEqual(
+            projected["results"][0]["fields"],
+            {
+                "congressional_districts": [{"name": "District 1"}],
+                "census": {"2020": {"block": 2}},
+            },
+        )
+        self.assertIn("address_components", projected["results"][0])
+
+    def test_keys_with_fields(self):
+        projected = Projection(keys=["location"], fields=["timezone"])(response())
+        self.assertEqual(
+            projected["results"][1],
+            {
+                "location": {"lat": 2.0, "lng": -2.0},
+                "fields": {"timezone": {"name": "EST"}},
+            },
+        )
+
+    def test_keys_drop_fields(self):
+        projected = Projection(keys=["accuracy"])(response())
+        self.assertEqual(projected["results"], [{"accuracy": 1}, {"accuracy": 1}])
+
+    def test_errors_kept(self):
+        error = {"error": "Could not parse address"}
+        self.assertIs(Projection(best_match=True)(error), error)
+
+    def test_project_results(self):
+        projection = Projection(best_match=True)
+        results = project_results(
+            projection, {"a": {"query": "a", "response": response()}}
+        )
+        self.assertEqual(len(results["a"]["response"]["results"]), 1)
+
+
+class TestClientProjection(unittest.TestCase):
+    def setUp(self):
+        self.projection = Projection(best_match=True, keys=["location"], fields=["cd"])
+
+    def test_single(self):
+        with FakeGeocodioServer(fields_handler) as server:
+            client = GeocodioClient("key", custom_base_domain=server.url)
+            location = client.geocode("a", fields=["cd"], projection=self.projection)
+        self.assertIsInstance(location, Location)
+        self.assertEqual(
+            location["results"],
+            [
+                {
+                    "location": {"lat": 1.0, "lng": -1.0},
+                    "fields": {"congressional_districts": [{"name": "District 1"}]},
+                }
+            ],
+        )
+        self.assertEqual(location.coords, (1.0, -1.0))
+
+    def test_chunked_batch(self):
+        with FakeGeocodioServer(fields_handler) as server:
+            client = GeocodioClient("key", custom_base_domain=server.url)
+            locations = client.reverse(
+                [(1.0, 2.0), (3.0, 4.0), (5.0, 6.0)],
+                chunk_size=2,
+                projection=self.projection,
+            )
+        self.assertEqual(len(server.requests), 2)
+        for location in locations:
+            self.assertEqual(len(location["results"]), 1)
+            self.assertEqual(set(location.best_match), {"location", "fields"})
+        self.assertIs(locations.get((3.0, 4.0)), locations[1])
+
+    def test_cache_keeps_full_responses(self):
+        with FakeGeocodioServer(fields_handler) as server:
+            client = GeocodioClient(
+                "key", custom_base_domain=server.url, cache=LocationCache()
+            )
+            client.batch_geocode(["a", "b"], fields=["cd"], projection=self.projection)
+            projected = client.batch_geocode(
+                ["a"], fields=["cd"], projection=self.projection
+            )
+            full = client.batch_geocode(["a", "b"], fields=["cd"])
+        self.assertEqual(len(server.requests), 1)
+        self.assertEqual(len(projected[0]["results"]), 1)
+        self.assertEqual(len(full[1]["results"]), 2)
+        self.assertIn("address_components", full[1].best_match)
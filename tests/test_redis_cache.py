@@ -0,0 +1,118 @@
+"""
+test_redis_cache
+----------------------------------
+
+Tests for `geocodio.redis_cache` module, against an in-process stand-in
+server.
+"""
+
+import socket
+import time
+import unittest
+from unittest import mock
+
+from geocodio.cache import LocationCache
+from geocodio.redis_cache import RedisCache, RedisError, _Connection, encode_command
+from tests.redis_server import FakeRedisServer
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+class TestRedisCache(unittest.TestCase):
+    def setUp(self):
+        self.server = FakeRedisServer().__enter__()
+        self.cache = RedisCache(port=self.server.port, compress_min=64)
+
+    def tearDown(self):
+        self.cache.close()
+        self.server.__exit__(None, None, None)
+
+    def test_encode_command(self):
+        self.assertEqual(
+            encode_command("SET", "k", b"v", "PX", 10),
+            b"*5\r\n$3\r\nSET\r\n$1\r\nk\r\n$1\r\nv\r\n$2\r\nPX\r\n$2\r\n10\r\n",
+        )
+
+    def test_get_many_is_one_mget(self):
+        self.cache.set_many({"a": "1", "b": "2"})
+        self.assertEqual(self.cache.get_many(["a", "b", "c"]), {"a": "1", "b": "2"})
+        self.assertEqual([c[0] for c in self.server.commands], ["MSET", "MGET"])
+
+    def test_set_many_with_ttl_is_pipelined(self):
+        with mock.patch.object(
+            _Connection, "execute", autospec=True, side_effect=_Connection.execute
+        ) as execute:
+            self.cache.set_many({"a": "1", "b": "2"}, ttl=0.05)
+        self.assertEqual(execute.call_count, 1)
+        self.assertEqual([c[0] for c in self.server.commands], ["SET", "SET"])
+        self.assertEqual(self.cache.get("a"), "1")
+        time.sleep(0.06)
+        self.assertIsNone(self.cache.get("a"))
+
+    def test_compression(self):
+        value = "x" * 1000
+        self.cache.set("big", value)
+        self.cache.set("small", "y")
+        self.assertLess(len(self.server.data[b"big"]), 100)
+        self.assertEqual(self.server.data[b"small"], b"\x00y")
+        self.assertEqual(
+            self.cache.get_many(["big", "small"]), {"big": value, "small": "y"}
+        )
+
+    def test_scan_and_clear(self):
+        self.cache.set_many({"geocodio:a": "1", "geocodio:b": "2", "other": "3"})
+        entries = sum(self.cache.scan(match="geocodio:*"), [])
+        self.assertEqual(sorted(entries), [("geocodio:a", "1"), ("geocodio:b", "2")])
+        self.cache.clear(match="geocodio:*")
+        self.assertEqual(list(self.server.data), [b"other"])
+
+    def test_error_reply(self):
+        self.assertRaises(RedisError, self.cache.execute, ("NOSUCH",))
+
+    def test_error_reply_fails_open(self):
+        self.server.errors["MGET"] = "LOADING Redis is loading the dataset"
+        self.server.errors["MSET"] = "OOM command not allowed"
+        with self.assertLogs("geocodio.redis_cache", "WARNING"):
+            self.assertEqual(self.cache.get_many(["a"]), {})
+            self.cache.set_many({"a": "1"})
+        cache = RedisCache(port=self.server.port, fail_open=False)
+        self.assertRaises(RedisError, cache.get_many, ["a"])
+        cache.close()
+
+    def test_failed_setup_closes_connection(self):
+        self.server.errors["AUTH"] = "WRONGPASS invalid password"
+        cache = RedisCache(port=self.server.port, password="x", fail_open=False)
+        with mock.patch.object(
+            _Connection, "close", autospec=True, side_effect=_Connection.close
+        ) as close:
+            self.assertRaises(RedisError, cache.get_many, ["a"])
+        self.assertEqual(close.call_count, 1)
+        self.assertTrue(cache._pool.empty())
+
+    def test_location_cache_batch_round_trip(self):
+        """Ensure a batch of lookups costs one MGET"""
+        cache = LocationCache(self.cache, ttl=60)
+        queries = ["address {0}".format(i) for i in range(100)]
+        responses = [
+            {"input": {}, "results": [{"fields": {"timezone": i}}]} for i in range(100)
+        ]
+        cache.store_many("geocode", queries, ["timezone"], responses)
+        del self.server.commands[:]
+        entries = cache.lookup_many("geocode", queries, ["timezone"])
+        self.assertEqual([c[0] for c in self.server.commands], ["MGET"])
+        self.assertEqual(entries[5], (responses[5], []))
+
+
+class TestRedisCacheUnavailable(unittest.TestCase):
+    def test_fail_open(self):
+        cache = RedisCache(port=free_port(), timeout=0.5)
+        self.assertEqual(cache.get_many(["a"]), {})
+        cache.set_many({"a": "1"})
+
+    def test_fail_closed(self):
+        cache = RedisCache(port=free_port(), timeout=0.5, fail_open=False)
+        self.assertRaises(OSError, cache.get_many, ["a"])
@@ -0,0 +1,85 @@
+"""
+test_serialization
+----------------------------------
+
+Tests for `geocodio.serialization` module.
+"""
+
+import json
+import os
+import unittest
+
+from geocodio.data import (
+    Address,
+    Location,
+    LocationCollection,
+    LocationCollectionDict,
+    LocationView,
+)
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+from geocodio.serialization import dumps, loads
+
+FIXTURES = os.path.join(os.path.dirname(os.path.abspath(__file__)), "response")
+
+
+def fixture(name):
+    with open(os.path.join(FIXTURES, name)) as f:
+        return json.load(f)
+
+
+@unittest.skipIf(msgpack is None, "msgpack is not installed")
+class TestSerialization(unittest.TestCase):
+    def test_location(self):
+        location = Location(fixture("single.json"), order="lng")
+        restored = loads(dumps(location))
+        self.assertIsInstance(restored, Location)
+        self.assertEqual(restored, location)
+        self.assertEqual(restored.order, "lng")
+        self.assertEqual(restored.coords, location.coords)
+
+    def test_address(self):
+        address = Address(fixture("address.json"))
+        restored = loads(dumps(address))
+        self.assertIsInstance(restored, Address)
+        self.assertEqual(restored, address)
+
+    def test_collection(self):
+        locations = LocationCollection(fixture("batch_components.json")["results"])
+        restored = loads(dumps(locations))
+        self.assertIsInstance(restored, LocationCollection)
+        self.assertEqual(list(restored), list(locations))
+        self.assertEqual(restored.lookups, locations.lookups)
+        self.assertEqual(
+            restored.get(
+                {"street": "1109 N Highland St", "city": "Arlington", "state": "VA"}
+            ),
+            locations[0],
+        )
+
+    def test_collection_dict(self):
+        locations = LocationCollectionDict(fixture("batch_dict.json")["results"])
+        restored = loads(dumps(locations))
+        self.assertIsInstance(restored, LocationCollectionDict)
+        self.assertEqual(list(restored), list(locations))
+        self.assertEqual(restored.lookups, locations.lookups)
+        self.assertEqual(restored.coords, locations.coords)
+
+    def test_views(self):
+        locations = LocationCollection(fixture("batch.json")["results"], view=True)
+        restored = loads(dumps(locations), view=True)
+        self.assertIsInstance(restored[0], LocationView)
+        self.assertEqual(restored.coords, locations.coords)
+
+    def test_smaller_than_json(self):
+        results = fixture("batch.json")["results"]
+        self.assertLess(
+            len(dumps(LocationCollection(results))), len(json.dumps(results))
+        )
+
+    def test_unknown_type(self):
+        self.assertRaises(TypeError, dumps, {"results": []})
@@ -0,0 +1,110 @@
+"""
+test_tracing
+----------------------------------
+
+Tests for `geocodio.tracing` module.
+"""
+
+import io
+import json
+import threading
+import unittest
+
+from geocodio.client import GeocodioClient
+from geocodio.concurrency import AIMDLimiter
+from geocodio.tracing import Tracer
+from tests.server import FakeGeocodioServer
+
+
+class TestTracer(unittest.TestCase):
+    def test_span(self):
+        tracer = Tracer()
+        with tracer.span("http", verb="geocode") as span:
+            span["status"] = 200
+        (event,) = tracer.spans
+        self.assertEqual(event["name"], "http")
+        self.assertEqual(event["ph"], "X")
+        self.assertEqual(event["args"], {"verb": "geocode", "status": 200})
+        self.assertGreaterEqual(event["dur"], 0)
+        self.assertEqual(event["tid"], threading.get_ident())
+
+    def test_span_recorded_on_error(self):
+        tracer = Tracer()
+        with self.assertRaises(ValueError):
+            with tracer.span("decode"):
+                raise ValueError
+        self.assertEqual(len(tracer), 1)
+
+    def test_export(self):
+        tracer = Tracer()
+        thread = threading.Thread(
+            target=lambda: tracer.add("chunk", 5, 10), name="worker"
+        )
+        thread.start()
+        thread.join()
+        tracer.add("http", 1, 2)
+        f = io.StringIO()
+        tracer.export(f)
+        trace = json.loads(f.getvalue())
+        events = trace["traceEvents"]
+        names = {e["args"]["name"] for e in events if e["ph"] == "M"}
+        self.assertIn("worker", names)
+        self.assertEqual(
+            [e["name"] for e in events if e["ph"] == "X"], ["http", "chunk"]
+        )
+
+        tracer.clear()
+        self.assertEqual(tracer.trace_events(), [])
+
+
+class TestClientTracing(unittest.TestCase):
+    def test_chunked_batch(self):
+        tracer = Tracer()
+        with FakeGeocodioServer(delay=0.01) as server:
+            client = GeocodioClient(
+                "key",
+                custom_base_domain=server.url,
+                tracer=tracer,
+                concurrency=AIMDLimiter(initial_limit=2, max_limit=2),
+            )
+            client.batch_geocode(["a", "b", "c", "d", "e"], chunk_size=2)
+        spans = tracer.spans
+        counts = {}
+        for span in spans:
+            counts[span["name"]] = counts.get(span["name"], 0) + 1
+        self.assertEqual(
+            counts,
+            {
+                "chunk": 3,
+                "serialize": 3,
+                "queue": 3,
+                "http": 3,
+                "decode": 3,
+                "collection": 1,
+            },
+        )
+        chunks = [s for s in spans if s["name"] == "chunk"]
+        self.assertEqual(sorted(s["args"]["size"] for s in chunks), [1, 2, 2])
+        for http in (s for s in spans if s["name"] == "http"):
+            self.assertEqual(http["args"]["status"], 200)
+            self.assertTrue(
+                any(
+                    c["tid"] == http["tid"]
+                    and c["ts"] <= http["ts"]
+                    and http["ts"] + http["dur"] <= c["ts"] + c["dur"]
+                    for c in chunks
+                )
+            )
+
+    def test_single(self):
+        tracer = Tracer()
+        with FakeGeocodioServer() as server:
+            client = GeocodioClient("key", custom_base_domain=server.url, tracer=tracer)
+            client.geocode("a")
+        self.assertEqual([s["name"] for s in tracer.spans], ["queue", "http", "decode"])
+
+    def test_untraced(self):
+        with FakeGeocodioServer() as server:
+            client = GeocodioClient("key", custom_base_domain=server.url)
+            client.batch_geocode(["a", "b"], chunk_size=1)
+        self.assertIsNone(client.tracer)
@@ -0,0 +1,100 @@
+"""
+test_transport
+----------------------------------
+
+Tests for `geocodio.transport` module.
+"""
+
+import json
+import unittest
+
+import requests
+
+from geocodio import exceptions
+from geocodio.client import GeocodioClient
+from geocodio.transport import PoolTransport, RequestsTransport, Response, Transport
+from tests.server import FakeGeocodioServer
+from tests.test_http2 import single_handler
+
+
+class RecordingTransport(Transport):
+    """
+    In-process transport answering every request with an empty result.
+    """
+
+    def __init__(self):
+        self.requests = []
+
+    def request(self, method, url, params=None, headers=None, data=None, timeout=None):
+        self.requests.append((method, url, params, data, timeout))
+        return Response(200, json.dumps({"input": {}, "results": []}).encode())
+
+
+class TestTransports(unittest.TestCase):
+    def test_custom_transport(self):
+        transport = RecordingTransport()
+        client = GeocodioClient("key", transport=transport, timeout=(1, 5))
+        client.geocode("1 Main St", fields=["cd"])
+        method, url, params, data, timeout = transport.requests[0]
+        self.assertEqual(method, "GET")
+        self.assertTrue(url.endswith("/geocode"))
+        self.assertEqual(
+            params, {"api_key": "key", "limit": 0, "q": "1 Main St", "fields": "cd"}
+        )
+        self.assertEqual(timeout, (1, 5))
+
+    def test_client_owned_transport(self):
+        client = GeocodioClient("key")
+        transport = client.transport
+        self.assertIsInstance(transport, RequestsTransport)
+        client.close()
+        self.assertIsNot(client.transport, transport)
+
+        transport = RecordingTransport()
+        client = GeocodioClient("key", transport=transport)
+        client.close()
+        self.assertIs(client.transport, transport)
+
+    def test_pool_transport_results(self):
+        results = []
+        with FakeGeocodioServer(single_handler) as server:
+            for transport in (RequestsTransport(), PoolTransport()):
+                client = GeocodioClient(
+                    "key", custom_base_domain=server.url, transport=transport
+                )
+                results.append(
+                    (
+                        client.geocode("1 Main St"),
+                        client.geocode(components_data={"street": "1 Main St"}),
+                        list(client.geocode(["a", "b"])),
+                        list(client.reverse([(1, 2)])),
+                    )
+                )
+        self.assertEqual(results[0], results[1])
+
+    def test_pool_transport_errors(self):
+        with FakeGeocodioServer(single_handler) as server:
+            client = GeocodioClient(
+                "key", custom_base_domain=server.url, transport=PoolTransport()
+            )
+            self.assertRaises(exceptions.GeocodioDataError, client.geocode, "invalid")
+            self.assertRaises(exceptions.GeocodioServerError, client.geocode, "broken")
+
+    def test_pool_transport_timeout(self):
+        with FakeGeocodioServer(single_handler, delay=0.5) as server:
+            client = GeocodioClient(
+                "key",
+                custom_base_domain=server.url,
+                transport=PoolTransport(),
+                connect_timeout=1,
+                read_timeout=0.1,
+            )
+            self.assertRaises(requests.exceptions.ReadTimeout, client.geocode, "a")
+
+    def test_pool_transport_connection_error(self):
+        with FakeGeocodioServer() as server:
+            url = server.url
+        client = GeocodioClient(
+            "key", custom_base_domain=url, transport=PoolTransport()
+        )
+        self.assertRaises(requests.exceptions.ConnectionError, client.geocode, "a")
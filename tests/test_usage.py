@@ -0,0 +1,64 @@
+"""
+test_usage
+----------------------------------
+
+Tests for `geocodio.usage` module.
+"""
+
+import io
+import json
+import time
+import unittest
+
+from geocodio import exceptions
+from geocodio.usage import UsageMeter
+
+
+class TestUsageMeter(unittest.TestCase):
+    def test_counts_lookups_and_fields(self):
+        meter = UsageMeter()
+        meter.reserve("geocode", 10, ["cd", "timezone"])
+        meter.reserve("reverse", 1, [])
+        report = meter.report()
+        self.assertEqual(report["lookups"], {"geocode": 10, "reverse": 1})
+        self.assertEqual(report["fields"], {"cd": 10, "timezone": 10})
+        self.assertEqual(report["billed"], 31)
+        self.assertEqual(report["requests"], 2)
+
+    def test_refund(self):
+        meter = UsageMeter()
+        meter.reserve("geocode", 3, ["cd"])
+        meter.refund("geocode", 3, ["cd"])
+        self.assertEqual(meter.billed, 0)
+        self.assertEqual(meter.report()["lookups"], {})
+
+    def test_hard_budget(self):
+        meter = UsageMeter(budget=10)
+        meter.reserve("geocode", 5, ["cd"])
+        self.assertRaises(
+            exceptions.GeocodioBudgetError, meter.reserve, "geocode", 1, []
+        )
+        self.assertEqual(meter.billed, 10)
+
+    def test_soft_budget_throttles(self):
+        meter = UsageMeter(soft_budget=1, throttle_rate=100)
+        started = time.monotonic()
+        for _ in range(4):
+            meter.reserve("geocode", 5, [])
+        # Three requests past the soft budget at 5 lookups each, 100 per second
+        self.assertGreaterEqual(time.monotonic() - started, 0.09)
+
+    def test_job_reports(self):
+        meter = UsageMeter()
+        meter.reserve("geocode", 1, [])
+        with meter.job("nightly") as usage:
+            meter.reserve("geocode", 2, ["cd"])
+        meter.reserve("geocode", 4, [])
+        self.assertEqual(usage.billed, 4)
+        self.assertEqual(meter.billed, 9)
+        output = io.StringIO()
+        meter.export(output)
+        report = json.loads(output.getvalue())
+        self.assertEqual(report["name"], "nightly")
+        self.assertEqual(report["fields"], {"cd": 2})
+        self.assertIsNotNone(report["finished"])
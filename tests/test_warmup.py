@@ -0,0 +1,104 @@
+"""
+test_warmup
+----------------------------------
+
+Tests for `geocodio.warmup` module.
+"""
+
+import io
+import json
+import os
+import unittest
+
+from geocodio import warmup
+from geocodio.cache import LocationCache, MemoryCache
+from geocodio.data import LocationCollection
+
+FIXTURES = os.path.join(os.path.dirname(os.path.abspath(__file__)), "response")
+
+
+class TestWarmup(unittest.TestCase):
+    def setUp(self):
+        self.batch_path = os.path.join(FIXTURES, "batch.json")
+        with open(self.batch_path) as f:
+            self.batch = json.load(f)
+
+    def test_load_batch_responses(self):
+        cache = LocationCache()
+        count = cache.load(warmup.batch_records([self.batch_path]), batch_size=1)
+        self.assertEqual(count, len(self.batch["results"]))
+        first = self.batch["results"][0]
+        response, missing = cache.lookup("geocode", first["query"], [])
+        self.assertEqual(response, first["response"])
+        self.assertEqual(missing, [])
+
+    def test_load_dict_batch_with_fields(self):
+        with open(os.path.join(FIXTURES, "batch_dict.json")) as f:
+            batch = json.load(f)
+        cache = LocationCache()
+        cache.load(warmup.batch_records([batch], fields=["cd"]))
+        query = next(iter(batch["results"].values()))["query"]
+        self.assertEqual(cache.lookup("geocode", query, ["cd"])[1], [])
+
+    def test_location_records_round_trip(self):
+        locations = LocationCollection(self.batch["results"])
+        output = io.StringIO()
+        count = warmup.write_records(
+            output, ((q, locations[i]) for q, i in locations.lookups.items())
+        )
+        self.assertEqual(count, len(locations))
+
+        cache = LocationCache()
+        cache.load(warmup.read_records(io.StringIO(output.getvalue())))
+        query = self.batch["results"][1]["query"]
+        self.assertEqual(
+            cache.lookup("geocode", query, [])[0], self.batch["results"][1]["response"]
+        )
+
+    def test_read_records_defaults(self):
+        lines = io.StringIO('{"query": "1,2", "response": {"results": []}}\n\n')
+        records = list(warmup.read_records(lines, verb="reverse"))
+        self.assertEqual(
+            records,
+            [
+                {
+                    "query": "1,2",
+                    "response": {"results": []},
+                    "verb": "reverse",
+                    "fields": [],
+                    "limit": 0,
+                }
+            ],
+        )
+
+    def test_export_and_import(self):
+        source = LocationCache(prefix="old")
+        source.load(warmup.batch_records([self.batch]))
+        source.backend.set("other:key", "ignored")
+        output = io.StringIO()
+        count = warmup.export_cache(source, output, batch_size=2)
+        self.assertEqual(count, len(source.backend) - 1)
+
+        target = LocationCache(MemoryCache(), prefix="new")
+        warmup.import_cache(target, io.StringIO(output.getvalue()), batch_size=2)
+        query = self.batch["results"][0]["query"]
+        self.assertEqual(
+            target.lookup("geocode", query, [])[0], self.batch["results"][0]["response"]
+        )
+
+    def test_copy_cache(self):
+        source = LocationCache()
+        source.load(warmup.batch_records([self.batch]))
+        target = LocationCache(prefix="copy")
+        self.assertEqual(warmup.copy_cache(source, target), len(source.backend))
+        self.assertEqual(len(target.backend), len(source.backend))
+
+
+class TestMemoryCacheScan(unittest.TestCase):
+    def test_scan_batches(self):
+        backend = MemoryCache()
+        backend.set_many({str(i): str(i) for i in range(5)})
+        backend.set("expired", "x", ttl=-1)
+        batches = list(backend.scan(batch_size=2))
+        self.assertEqual([len(b) for b in batches], [2, 2, 1])
+        self.assertEqual(dict(sum(batches, [])), {str(i): str(i) for i in range(5)})